@@ -0,0 +1,83 @@
+import numpy as np
+
+
+def aristas_unicas(csr):
+    """Arreglos (u, v, peso) con cada arista no dirigida una sola vez (u < v, sin lazos)"""
+    u = np.repeat(np.arange(len(csr.codigos), dtype=np.int64), np.diff(csr.indptr))
+    v = np.asarray(csr.indices, dtype=np.int64)
+    una_vez = u < v
+    return u[una_vez], v[una_vez], np.asarray(csr.pesos)[una_vez]
+
+
+def _encontrar(padre, x):
+    raiz = x
+    while padre[raiz] != raiz:
+        raiz = padre[raiz]
+    while padre[x] != raiz:
+        padre[x], x = raiz, padre[x]
+    return raiz
+
+
+def kruskal(n, u, v, pesos):
+    """Kruskal sobre las aristas ordenadas por peso; devuelve los índices de las aristas del bosque"""
+    orden = np.argsort(pesos, kind='stable')
+    padre = list(range(n))
+    rango = [0] * n
+    elegidas = []
+    restantes = n - 1
+
+    for i, a, b in zip(orden.tolist(), u[orden].tolist(), v[orden].tolist()):
+        raiz_a, raiz_b = _encontrar(padre, a), _encontrar(padre, b)
+        if raiz_a == raiz_b:
+            continue
+        if rango[raiz_a] < rango[raiz_b]:
+            raiz_a, raiz_b = raiz_b, raiz_a
+        padre[raiz_b] = raiz_a
+        if rango[raiz_a] == rango[raiz_b]:
+            rango[raiz_a] += 1
+        elegidas.append(i)
+        restantes -= 1
+        if not restantes:
+            break
+
+    return np.array(elegidas, dtype=np.int64)
+
+
+def boruvka(n, u, v, pesos):
+    """Borůvka vectorizado: en cada ronda todas las componentes eligen a la vez su arista más barata.
+
+    La búsqueda de la arista mínima por componente es independiente entre componentes, así que
+    se hace con operaciones de NumPy sobre todas las aristas (y se podría repartir en bloques).
+    Los empates se rompen por índice de arista para que las elegidas nunca formen ciclos.
+    """
+    componente = np.arange(n, dtype=np.int64)
+    padre = list(range(n))
+    vivas = np.arange(len(pesos), dtype=np.int64)
+    elegidas = []
+
+    while len(vivas):
+        cu, cv = componente[u[vivas]], componente[v[vivas]]
+        cruzan = cu != cv
+        vivas, cu, cv = vivas[cruzan], cu[cruzan], cv[cruzan]
+        if not len(vivas):
+            break
+
+        # Para cada componente, la arista más barata que sale de ella (mirando ambos extremos)
+        extremos = np.concatenate([cu, cv])
+        candidatas = np.concatenate([vivas, vivas])
+        orden = np.lexsort((candidatas, pesos[candidatas], extremos))
+        _, primeras = np.unique(extremos[orden], return_index=True)
+        mejores = np.unique(candidatas[orden][primeras])
+
+        for i, a, b in zip(mejores.tolist(), componente[u[mejores]].tolist(), componente[v[mejores]].tolist()):
+            raiz_a, raiz_b = _encontrar(padre, a), _encontrar(padre, b)
+            if raiz_a != raiz_b:
+                padre[raiz_b] = raiz_a
+                elegidas.append(i)
+
+        # Reetiquetar cada vértice con la raíz de su nueva componente
+        etiquetas = np.unique(componente)
+        raices = np.array([_encontrar(padre, c) for c in etiquetas.tolist()], dtype=np.int64)
+        componente = raices[np.searchsorted(etiquetas, componente)]
+
+    return np.array(elegidas, dtype=np.int64)
@@ -0,0 +1,107 @@
+import tkinter as tk
+
+# Sugerencias bajo una entrada de texto: al tipear se consulta buscar(texto) (código, nombre,
+# ciudad o país) y se muestra una lista; ↑/↓ recorren la lista, Enter o clic eligen y Esc la cierra.
+# Lo elegido reemplaza el texto por el código del aeropuerto.
+
+TECLAS_IGNORADAS = {'Up', 'Down', 'Return', 'KP_Enter', 'Escape', 'Tab', 'Shift_L', 'Shift_R',
+                    'Control_L', 'Control_R', 'Alt_L', 'Alt_R', 'Left', 'Right', 'Home', 'End'}
+
+
+class EntradaAutocompletada:
+    """Lista de sugerencias para un tk.Entry; buscar devuelve [(codigo, puntaje)] y describir el texto de cada una"""
+
+    def __init__(self, entrada, buscar, describir, maximo=8, ancho=48, al_elegir=None):
+        self.entrada = entrada
+        self.buscar = buscar
+        self.describir = describir
+        self.maximo = maximo
+        self.al_elegir = al_elegir
+        self._codigos = []
+        self._consultado = None  # último texto buscado, para no repetir con teclas que no lo cambian
+
+        raiz = entrada.winfo_toplevel()
+        self.lista = tk.Listbox(raiz, height=maximo, width=ancho, activestyle="dotbox",
+                                exportselection=False, bg="#ffffff", relief=tk.SOLID, borderwidth=1)
+        entrada.bind("<KeyRelease>", self._al_tipear, add="+")
+        entrada.bind("<Down>", lambda e: self._mover(1))
+        entrada.bind("<Up>", lambda e: self._mover(-1))
+        entrada.bind("<Return>", self._al_confirmar)
+        entrada.bind("<KP_Enter>", self._al_confirmar)
+        entrada.bind("<Escape>", self._al_escapar)
+        # Con un retraso: el clic en la lista saca el foco de la entrada antes de registrarse
+        entrada.bind("<FocusOut>", lambda e: entrada.after(150, self.ocultar), add="+")
+        self.lista.bind("<ButtonRelease-1>", lambda e: self._elegir())
+
+    def visible(self):
+        return bool(self.lista.winfo_ismapped())
+
+    def _al_tipear(self, evento):
+        if evento.keysym in TECLAS_IGNORADAS:
+            return
+        texto = self.entrada.get().strip()
+        if texto == self._consultado:
+            return
+        self._consultado = texto
+        if not texto:
+            self.ocultar()
+            return
+        self._codigos = [codigo for codigo, _ in self.buscar(texto, self.maximo)]
+        if not self._codigos:
+            self.ocultar()
+            return
+        self.lista.delete(0, tk.END)
+        for codigo in self._codigos:
+            self.lista.insert(tk.END, self.describir(codigo))
+        self.lista.configure(height=len(self._codigos))
+        self.lista.selection_clear(0, tk.END)
+        self.lista.selection_set(0)
+        self.lista.activate(0)
+        self._mostrar()
+
+    def _mostrar(self):
+        """Ubica la lista justo debajo de la entrada, por encima del resto de la ventana"""
+        raiz = self.entrada.winfo_toplevel()
+        x = self.entrada.winfo_rootx() - raiz.winfo_rootx()
+        y = self.entrada.winfo_rooty() - raiz.winfo_rooty() + self.entrada.winfo_height()
+        self.lista.place(x=x, y=y)
+        self.lista.lift()
+
+    def ocultar(self):
+        self.lista.place_forget()
+
+    def _mover(self, paso):
+        if not self.visible():
+            return None  # sin lista, las flechas siguen su camino normal
+        actual = self.lista.curselection()
+        i = min(max((actual[0] if actual else -1) + paso, 0), len(self._codigos) - 1)
+        self.lista.selection_clear(0, tk.END)
+        self.lista.selection_set(i)
+        self.lista.activate(i)
+        self.lista.see(i)
+        return "break"
+
+    def _al_confirmar(self, evento):
+        if self.visible():
+            self._elegir()
+            return "break"
+        return None
+
+    def _al_escapar(self, evento):
+        if self.visible():
+            self.ocultar()
+            return "break"  # el Esc de la ventana (salir de pantalla completa) solo si no había lista
+        return None
+
+    def _elegir(self):
+        seleccion = self.lista.curselection()
+        if not seleccion or seleccion[0] >= len(self._codigos):
+            return
+        codigo = self._codigos[seleccion[0]]
+        self.entrada.delete(0, tk.END)
+        self.entrada.insert(0, codigo)
+        self._consultado = codigo
+        self.ocultar()
+        self.entrada.focus_set()
+        if self.al_elegir is not None:
+            self.al_elegir(codigo)
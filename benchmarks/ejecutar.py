@@ -0,0 +1,228 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(CARPETA))
+from grafo_aereopuertos import GrafoAeropuertos
+import instrumentacion
+from generar_red import generar_red
+
+# Mide las operaciones principales sobre redes sintéticas de varios tamaños y guarda el
+# resultado en JSON para comparar corridas (por ejemplo antes y después de un cambio).
+#
+#   python benchmarks/ejecutar.py --aeropuertos 1000 5000 20000
+#   python benchmarks/ejecutar.py --aeropuertos 5000 --comparar benchmarks/resultados/anterior.json
+#   python benchmarks/ejecutar.py --solo carga dijkstra --contadores
+#
+# Cada operación se repite y se guarda la mediana y el mínimo. Antes de cada repetición se
+# descartan las cachés que la harían trivial (componentes, árboles de Dijkstra), así se mide
+# el cálculo y no la caché. Las redes generadas quedan en benchmarks/datos/ para las próximas corridas.
+
+TAMANOS = [1000, 5000]
+CONSULTAS = 50  # orígenes o pares por repetición en dijkstra, camino_minimo y lejanos
+
+
+def _cronometrar(funcion, repeticiones, preparar=None):
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return {'mediana_s': statistics.median(tiempos), 'minimo_s': min(tiempos), 'repeticiones': repeticiones}
+
+
+def _cargar(ruta_csv):
+    grafo = GrafoAeropuertos()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not grafo.cargar_datos(ruta_csv):
+            raise RuntimeError(f"No se pudo cargar {ruta_csv}")
+    return grafo
+
+
+def _sin_cache(grafo):
+    grafo.cache_dijkstra.limpiar()
+    grafo._componentes = None
+
+
+def _renderizar(grafo, repeticiones):
+    """Dibujo sin pantalla (Agg) de la vista completa (raster de densidad) y de un acercamiento (líneas)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from capa_aristas import CapaAristas
+    from vista_mapa import VistaMapa
+
+    figura = Figure(figsize=(12, 6), dpi=100)
+    canvas = FigureCanvasAgg(figura)
+    vista = VistaMapa(figura.add_axes([0, 0, 1, 1]), canvas)
+    tabla = grafo.aeropuertos
+    pos = dict(zip(tabla.codigos, zip(tabla.longitudes.tolist(), tabla.latitudes.tolist())))
+    textos = [f"{codigo}\n{nombre[:15]}" for codigo, nombre in zip(tabla.codigos, tabla.nombres)]
+
+    capa = []
+
+    def preparar():
+        capa[:] = [CapaAristas(grafo.grafo, pos)]
+
+    def mostrar():
+        vista.mostrar(capa[0], list(pos.values()), list(pos), textos)
+
+    # actualizar ya dibuja (draw_idle en Agg dibuja en el momento): no se llama a canvas.draw() aparte.
+    # Con los mismos límites que el cuadro anterior actualizar no redibuja, así que cada llamada
+    # alterna un corrimiento de un grado para medir siempre un cuadro completo.
+    corrimiento = [0]
+
+    def completo():
+        corrimiento[0] = 1 - corrimiento[0]
+        d = corrimiento[0]
+        vista.actualizar(-180 + d, 180 + d, -90, 90, False)
+
+    # Acercamiento alrededor del aeropuerto con más rutas, con etiquetas
+    hub = max(grafo.grafo, key=lambda c: len(grafo.grafo[c]))
+    x, y = pos[hub]
+
+    def zoom():
+        corrimiento[0] = 1 - corrimiento[0]
+        d = corrimiento[0]
+        vista.actualizar(x - 15 + d, x + 15 + d, y - 7.5, y + 7.5, True)
+
+    # Una pasada sin medir: el primer dibujo arma el raster de densidad y los artistas de las etiquetas
+    preparar()
+    mostrar()
+    completo()
+    zoom()
+    resultados = {'capa_aristas': _cronometrar(preparar, repeticiones)}
+    resultados['render_mostrar'] = _cronometrar(mostrar, repeticiones)
+    resultados['render_completo'] = _cronometrar(completo, repeticiones)
+    resultados['render_zoom'] = _cronometrar(zoom, repeticiones)
+    return resultados
+
+
+def medir_red(ruta_csv, repeticiones=3, solo=None, semilla=0):
+    """{operación: tiempos} para una red; solo limita las operaciones por nombre de grupo"""
+    azar = random.Random(semilla)
+    incluir = (lambda grupo: solo is None or grupo in solo)
+    resultados = {}
+
+    if incluir('carga'):
+        resultados['carga'] = _cronometrar(lambda: _cargar(ruta_csv), repeticiones)
+    grafo = _cargar(ruta_csv)
+    codigos = list(grafo.grafo)
+    origenes = azar.sample(codigos, min(CONSULTAS, len(codigos)))
+    pares = [tuple(azar.sample(codigos, 2)) for _ in range(CONSULTAS)]
+    resultados['tamano'] = {'aeropuertos': len(grafo.aeropuertos),
+                            'aristas': sum(len(v) for v in grafo.grafo.values()) // 2}
+
+    limpiar = lambda: _sin_cache(grafo)
+    operaciones = {
+        'es_conexo': lambda: grafo.es_conexo(),
+        'prim_mst': lambda: grafo.prim_mst(),
+        'bosque_expansion_minima': lambda: grafo.bosque_expansion_minima('kruskal'),
+        'dijkstra': lambda: [grafo.dijkstra(o, usar_cache=False) for o in origenes],
+        'camino_minimo': lambda: [grafo.camino_minimo(o, d) for o, d in pares],
+        'aeropuertos_mas_lejanos': lambda: [grafo.aeropuertos_mas_lejanos(o) for o in origenes],
+    }
+    for nombre, funcion in operaciones.items():
+        if incluir(nombre):
+            resultados[nombre] = _cronometrar(funcion, repeticiones, limpiar)
+    if incluir('render'):
+        resultados.update(_renderizar(grafo, repeticiones))
+    return resultados
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=CARPETA, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def comparar(actual, anterior):
+    """Líneas 'tamaño operación anterior → actual (cociente)' para las operaciones en común"""
+    lineas = []
+    for tamano, operaciones in actual['resultados'].items():
+        previas = anterior.get('resultados', {}).get(tamano, {})
+        for nombre, datos in operaciones.items():
+            if 'mediana_s' not in datos or 'mediana_s' not in previas.get(nombre, {}):
+                continue
+            antes, ahora = previas[nombre]['mediana_s'], datos['mediana_s']
+            cociente = ahora / antes if antes else float('inf')
+            marca = '  más lento' if cociente > 1.1 else ('  más rápido' if cociente < 0.9 else '')
+            lineas.append(f"{tamano:>7} {nombre:<26} {antes * 1000:10.1f} ms → {ahora * 1000:10.1f} ms  ×{cociente:.2f}{marca}")
+    return lineas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks del grafo de aeropuertos sobre redes sintéticas')
+    parser.add_argument('--aeropuertos', type=int, nargs='+', default=TAMANOS, help='tamaños de red a medir')
+    parser.add_argument('--hubs', type=int, help='hubs de cada red (por defecto ~raíz cuadrada del tamaño)')
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--solo', nargs='+', metavar='OPERACION',
+                        help='carga, es_conexo, prim_mst, bosque_expansion_minima, dijkstra, camino_minimo, '
+                             'aeropuertos_mas_lejanos, render')
+    parser.add_argument('--contadores', action='store_true',
+                        help='agregar el resumen de instrumentacion (asentados, empujes, segmentos...) de una corrida extra')
+    parser.add_argument('--datos', default=os.path.join(CARPETA, 'datos'), help='carpeta para las redes generadas')
+    parser.add_argument('-o', '--salida', help='JSON de resultados (por defecto benchmarks/resultados/<fecha>.json)')
+    parser.add_argument('--comparar', metavar='JSON', help='resultados anteriores para comparar')
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.datos, exist_ok=True)
+    salida = {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+        'parametros': {'repeticiones': args.repeticiones, 'semilla': args.semilla, 'hubs': args.hubs,
+                       'consultas': CONSULTAS},
+        'resultados': {},
+    }
+    for n in args.aeropuertos:
+        ruta_csv = os.path.join(args.datos, f"red_{n}_h{args.hubs or 'auto'}_s{args.semilla}.csv")
+        if not os.path.exists(ruta_csv):
+            generar_red(ruta_csv, n, hubs=args.hubs, semilla=args.semilla)
+        print(f"Red de {n} aeropuertos ({ruta_csv})", file=sys.stderr)
+        resultados = medir_red(ruta_csv, args.repeticiones, args.solo, args.semilla)
+        if args.contadores:
+            instrumentacion.REGISTRO.limpiar()
+            instrumentacion.activar()
+            try:
+                medir_red(ruta_csv, 1, args.solo, args.semilla)
+            finally:
+                instrumentacion.desactivar()
+            resultados['contadores'] = instrumentacion.resumen()
+        salida['resultados'][str(n)] = resultados
+        for nombre, datos in resultados.items():
+            if 'mediana_s' in datos:
+                print(f"  {nombre:<26} {datos['mediana_s'] * 1000:10.1f} ms", file=sys.stderr)
+
+    ruta_salida = args.salida or os.path.join(CARPETA, 'resultados', time.strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(ruta_salida)), exist_ok=True)
+    with open(ruta_salida, 'w', encoding='utf-8') as f:
+        json.dump(salida, f, ensure_ascii=False, indent=1)
+    print(f"Resultados en {ruta_salida}", file=sys.stderr)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            for linea in comparar(salida, json.load(f)):
+                print(linea)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
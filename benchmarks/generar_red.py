@@ -0,0 +1,140 @@
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+from itertools import product
+from string import ascii_uppercase
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grafo_aereopuertos import COLUMNAS_ORIGEN, COLUMNAS_DESTINO
+
+# Red sintética tipo hub-and-spoke con el mismo formato de columnas que flights_final.csv:
+# - Los hubs se reparten por el mapa y se conectan entre sí (los más cercanos seguro, el resto
+#   con probabilidad hubs_destino / hubs).
+# - Cada aeropuerto regional queda cerca de su hub (mismo país) y vuela a él y a veces a otro
+#   hub cercano; algunos tienen además rutas regionales con vecinos del mismo hub.
+# - Como en el CSV real, una ruta puede aparecer varias veces (otra aerolínea o el sentido
+#   contrario) y algunos aeropuertos quedan aislados en islas de la red.
+#
+#   python benchmarks/generar_red.py red_5k.csv --aeropuertos 5000 --hubs 60
+
+SILABAS = ['ka', 'lo', 'mi', 'ra', 'to', 'ne', 'su', 'va', 'de', 'po', 'li', 'an', 'or', 'es', 'ba', 'gu',
+           'ti', 'ma', 'che', 'san', 'ri', 'vel', 'mon', 'tar']
+
+
+def _codigos(n, azar):
+    """n códigos únicos de 3 letras (de 4 si no alcanzan), en orden aleatorio"""
+    largo = 3 if n <= 26 ** 3 else 4
+    codigos = [''.join(letras) for letras in product(ascii_uppercase, repeat=largo)]
+    return azar.sample(codigos, n)
+
+
+def _nombre(azar, silabas=(2, 3)):
+    return ''.join(azar.choice(SILABAS) for _ in range(azar.randint(*silabas))).capitalize()
+
+
+def _punto_cerca(lat, lon, radio, azar):
+    """Coordenadas a ~radio grados de (lat, lon), dentro del mapa"""
+    lat = min(max(lat + azar.gauss(0, radio), -85.0), 85.0)
+    lon = (lon + azar.gauss(0, radio) / max(math.cos(math.radians(lat)), 0.2) + 180) % 360 - 180
+    return round(lat, 6), round(lon, 6)
+
+
+def generar_rutas(aeropuertos=1000, hubs=None, hubs_destino=6, regionales=1.0, repetidas=0.3,
+                  aislados=0.002, semilla=0):
+    """(lista de aeropuertos, lista de rutas (i, j)) de una red hub-and-spoke reproducible.
+
+    hubs: cantidad de hubs (por defecto ~√aeropuertos); hubs_destino: hubs a los que vuela cada hub
+    en promedio; regionales: rutas regionales promedio por aeropuerto; repetidas: fracción de rutas
+    que vuelven a aparecer; aislados: fracción de aeropuertos en pares sueltos fuera de la red.
+    """
+    azar = random.Random(semilla)
+    hubs = hubs or max(2, int(math.sqrt(aeropuertos)))
+    hubs = min(hubs, aeropuertos)
+    codigos = _codigos(aeropuertos, azar)
+
+    lista = []  # (codigo, nombre, ciudad, pais, lat, lon)
+    for i in range(hubs):
+        lat, lon = _punto_cerca(azar.uniform(-45, 60), azar.uniform(-180, 180), 0, azar)
+        ciudad, pais = _nombre(azar), _nombre(azar, (2, 2))
+        lista.append((codigos[i], f"{ciudad} International Airport", ciudad, pais, lat, lon))
+    hub_de = list(range(hubs))
+    for i in range(hubs, aeropuertos):
+        hub = azar.randrange(hubs)
+        lat, lon = _punto_cerca(lista[hub][4], lista[hub][5], 6, azar)
+        ciudad = _nombre(azar)
+        lista.append((codigos[i], f"{ciudad} Airport", ciudad, lista[hub][3], lat, lon))
+        hub_de.append(hub)
+
+    def distancia(a, b):
+        return math.hypot(lista[a][4] - lista[b][4], (lista[a][5] - lista[b][5]) * math.cos(math.radians(lista[a][4])))
+
+    rutas = []
+    # Troncales entre hubs: los 2 más cercanos siempre (la red de hubs queda conexa casi siempre)
+    for a in range(hubs):
+        cercanos = sorted((b for b in range(hubs) if b != a), key=lambda b: distancia(a, b))
+        rutas.extend((a, b) for b in cercanos[:2])
+        p = max(hubs_destino - 2, 0) / max(hubs - 3, 1)
+        rutas.extend((a, b) for b in cercanos[2:] if azar.random() < p)
+
+    # Regionales: a su hub, a veces a un segundo hub, y a otros aeropuertos del mismo hub
+    por_hub = [[] for _ in range(hubs)]
+    for i in range(hubs, aeropuertos):
+        por_hub[hub_de[i]].append(i)
+    n_aislados = int(aislados * (aeropuertos - hubs)) // 2 * 2
+    sueltos = set(azar.sample(range(hubs, aeropuertos), n_aislados)) if n_aislados else set()
+    for i in range(hubs, aeropuertos):
+        if i in sueltos:
+            continue
+        rutas.append((i, hub_de[i]))
+        if azar.random() < 0.2:
+            rutas.append((i, azar.randrange(hubs)))
+        vecinos = por_hub[hub_de[i]]
+        for _ in range(int(regionales) + (azar.random() < regionales % 1)):
+            j = azar.choice(vecinos)
+            if j != i and j not in sueltos:
+                rutas.append((i, j))
+    sueltos = sorted(sueltos)
+    rutas.extend(zip(sueltos[::2], sueltos[1::2]))
+
+    # Rutas repetidas (a veces en el sentido contrario) y orden como si vinieran de varias aerolíneas
+    rutas.extend((b, a) if azar.random() < 0.5 else (a, b) for a, b in azar.sample(rutas, int(repetidas * len(rutas))))
+    azar.shuffle(rutas)
+    return lista, rutas
+
+
+def escribir_csv(ruta, aeropuertos, rutas):
+    """Escribe las rutas con exactamente las columnas que lee cargar_datos"""
+    with open(ruta, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(COLUMNAS_ORIGEN + COLUMNAS_DESTINO)
+        for a, b in rutas:
+            escritor.writerow(aeropuertos[a] + aeropuertos[b])
+
+
+def generar_red(ruta, aeropuertos=1000, **opciones):
+    """Genera la red y la guarda en ruta; devuelve (cantidad de aeropuertos, filas escritas)"""
+    lista, rutas = generar_rutas(aeropuertos, **opciones)
+    escribir_csv(ruta, lista, rutas)
+    return len(lista), len(rutas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Genera un CSV de rutas hub-and-spoke sintético')
+    parser.add_argument('salida', help='CSV a escribir')
+    parser.add_argument('--aeropuertos', type=int, default=1000)
+    parser.add_argument('--hubs', type=int, help='por defecto ~raíz cuadrada de los aeropuertos')
+    parser.add_argument('--hubs-destino', type=int, default=6, help='troncales promedio por hub')
+    parser.add_argument('--regionales', type=float, default=1.0, help='rutas regionales promedio por aeropuerto')
+    parser.add_argument('--repetidas', type=float, default=0.3, help='fracción de rutas repetidas')
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args(argv)
+    n, filas = generar_red(args.salida, args.aeropuertos, hubs=args.hubs, hubs_destino=args.hubs_destino,
+                           regionales=args.regionales, repetidas=args.repetidas, semilla=args.semilla)
+    print(f"{args.salida}: {n} aeropuertos, {filas} filas")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+from collections import deque
+
+
+def lado_menor(adyacencia, a, b):
+    """BFS alternada desde a y desde b sobre {vertice: {vecino: ...}}.
+
+    Si se encuentran devuelve None (siguen conectados); si no, el conjunto de vértices del lado
+    que se agotó primero, que es el más chico. El costo es proporcional a ese lado, no al grafo.
+    """
+    if a == b:
+        return None
+    vistos = ({a}, {b})
+    colas = (deque([a]), deque([b]))
+    while True:
+        for lado in (0, 1):
+            if not colas[lado]:
+                return vistos[lado]
+            x = colas[lado].popleft()
+            for y in adyacencia[x]:
+                if y in vistos[1 - lado]:
+                    return None
+                if y not in vistos[lado]:
+                    vistos[lado].add(y)
+                    colas[lado].append(y)
+
+
+class BosqueDinamico:
+    """Bosque de expansión mínima que se mantiene al agregar, quitar o cambiar aristas del grafo.
+
+    - Arista nueva o más barata entre vértices del mismo árbol: si es más liviana que la arista
+      más pesada del camino del árbol entre sus extremos, la reemplaza (propiedad del ciclo).
+    - Arista del árbol que se quita o se encarece: se corta el árbol y se busca la arista más
+      barata del grafo que cruza el corte, recorriendo solo el lado más chico (propiedad del corte).
+    Los métodos se llaman con el grafo {codigo: {vecino: distancia}} ya actualizado.
+    """
+
+    def __init__(self, aristas=()):
+        self.adyacencia = {}  # {codigo: {vecino en el árbol: distancia}}
+        for u, v, peso in aristas:
+            self._unir(u, v, peso)
+
+    def __contains__(self, arista):
+        u, v = arista
+        return v in self.adyacencia.get(u, ())
+
+    def _unir(self, u, v, peso):
+        self.adyacencia.setdefault(u, {})[v] = peso
+        self.adyacencia.setdefault(v, {})[u] = peso
+
+    def _cortar(self, u, v):
+        del self.adyacencia[u][v]
+        del self.adyacencia[v][u]
+
+    def _camino(self, u, v):
+        """Aristas (a, b, peso) del camino del árbol entre u y v, o None si están en árboles distintos"""
+        if u not in self.adyacencia or v not in self.adyacencia:
+            return None
+        previo = {u: None}
+        cola = deque([u])
+        while cola and v not in previo:
+            x = cola.popleft()
+            for y in self.adyacencia[x]:
+                if y not in previo:
+                    previo[y] = x
+                    cola.append(y)
+        if v not in previo:
+            return None
+        camino = []
+        while previo[v] is not None:
+            camino.append((previo[v], v, self.adyacencia[v][previo[v]]))
+            v = previo[v]
+        return camino
+
+    def _reconectar(self, lado, grafo):
+        """Une el lado cortado con la arista más barata del grafo que sale de él; devuelve si la encontró"""
+        mejor = None
+        for a in lado:
+            for b, peso in grafo[a].items():
+                if b not in lado and (mejor is None or peso < mejor[0]):
+                    mejor = (peso, a, b)
+        if mejor is None:
+            return False
+        self._unir(mejor[1], mejor[2], mejor[0])
+        return True
+
+    def arista_actualizada(self, u, v, grafo):
+        """La arista u–v se agregó o cambió de peso en el grafo"""
+        if u == v:
+            return
+        peso = grafo[u][v]
+        if (u, v) in self:
+            if peso <= self.adyacencia[u][v]:
+                self.adyacencia[u][v] = self.adyacencia[v][u] = peso
+            else:
+                self.arista_quitada(u, v, grafo)
+            return
+        camino = self._camino(u, v)
+        if camino is None:
+            self._unir(u, v, peso)
+            return
+        a, b, maximo = max(camino, key=lambda arista: arista[2])
+        if peso < maximo:
+            self._cortar(a, b)
+            self._unir(u, v, peso)
+
+    def arista_quitada(self, u, v, grafo):
+        """La arista u–v se quitó (o se encareció) en el grafo; devuelve el lado que quedó separado, o None.
+
+        Si es del árbol se corta y se reconecta por la arista más barata que cruce; si no hay
+        ninguna, el grafo se partió en dos componentes y se devuelve el lado más chico.
+        """
+        if (u, v) not in self:
+            return None
+        self._cortar(u, v)
+        lado = lado_menor(self.adyacencia, u, v)
+        return None if self._reconectar(lado, grafo) else lado
+
+    def por_componentes(self, componentes):
+        """Lista de (peso_total, aristas) alineada con componentes, como bosque_expansion_minima"""
+        resultado = []
+        for comp in componentes:
+            aristas, total = [], 0
+            inicio = comp[0]
+            vistos = {inicio}
+            pila = [inicio]
+            while pila:
+                x = pila.pop()
+                for y, peso in self.adyacencia.get(x, {}).items():
+                    if y not in vistos:
+                        vistos.add(y)
+                        pila.append(y)
+                        aristas.append((x, y, peso))
+                        total += peso
+            resultado.append((total, aristas))
+        return resultado
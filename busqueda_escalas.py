@@ -0,0 +1,129 @@
+import numpy as np
+
+# Bellman-Ford acotado por saltos sobre un GrafoCSR: después de la ronda k, distancias[v] es el
+# camino más corto desde el origen que usa a lo sumo k vuelos. Cada ronda es una sola pasada de
+# NumPy sobre todas las aristas, así que con k vuelos como máximo alcanzan k pasadas.
+#
+# Una ruta con k vuelos tiene k - 1 escalas. La ronda k mejora a v solo si la mejor ruta con a lo
+# sumo k vuelos usa exactamente k: esas mejoras son el frente de Pareto (distancia, escalas).
+
+ELEMENTOS_POR_BLOQUE = 4_000_000  # orígenes × aristas que se evalúan a la vez en el modo por lotes
+
+
+def _segmentos(csr):
+    """Inicio de las adyacencias no vacías (para reduceat) y la máscara de vértices con vecinos"""
+    con_vecinos = np.diff(csr.indptr) > 0
+    return np.asarray(csr.indptr[:-1])[con_vecinos], con_vecinos
+
+
+def _ronda(distancias, indices, pesos, inicios, con_vecinos):
+    """Mejor distancia a cada vértice llegando con un vuelo más desde las distancias actuales.
+
+    distancias puede ser un vector (un origen) o una matriz orígenes × vértices. Como el grafo es
+    no dirigido, los vecinos de v en el CSR son justamente los que llegan a v.
+    """
+    llegadas = distancias[..., indices] + pesos
+    mejor = np.full(distancias.shape, np.inf)
+    if len(inicios):
+        mejor[..., con_vecinos] = np.minimum.reduceat(llegadas, inicios, axis=-1)
+    return mejor, llegadas
+
+
+def bellman_ford_acotado(csr, origen, max_vuelos=None):
+    """Distancias por ronda desde un id de origen.
+
+    Devuelve (rondas, previos): rondas[k] es el arreglo de distancias con a lo sumo k vuelos y
+    previos[k][v] el vértice anterior si la ronda k mejoró a v (si no, -1). Sin max_vuelos se
+    sigue hasta que ninguna distancia mejora (el resultado coincide con Dijkstra).
+    """
+    n = len(csr.codigos)
+    indices, pesos = np.asarray(csr.indices), np.asarray(csr.pesos)
+    inicios, con_vecinos = _segmentos(csr)
+    duenos = np.repeat(np.arange(n), np.diff(csr.indptr))  # vértice al que llega cada arista
+
+    distancias = np.full(n, np.inf)
+    distancias[origen] = 0
+    previo = np.full(n, -1, dtype=np.int64)
+    rondas, previos = [distancias], [previo]
+    limite = n - 1 if max_vuelos is None else max_vuelos
+    for _ in range(limite):
+        mejor, llegadas = _ronda(distancias, indices, pesos, inicios, con_vecinos)
+        mejora = mejor < distancias
+        if not mejora.any():
+            break
+        # La primera arista de cada vértice que logra el mínimo (desempate estable por orden del CSR)
+        candidatas = np.flatnonzero((llegadas == mejor[duenos]) & mejora[duenos])
+        vertices, primeras = np.unique(duenos[candidatas], return_index=True)
+        previo = np.full(n, -1, dtype=np.int64)
+        previo[vertices] = indices[candidatas[primeras]]
+        distancias = np.where(mejora, mejor, distancias)
+        rondas.append(distancias)
+        previos.append(previo)
+    return rondas, previos
+
+
+def frente_pareto(rondas, destino):
+    """[(distancia, vuelos)] de las rondas que mejoraron al destino: menos vuelos, más distancia"""
+    frente = []
+    anterior = np.inf
+    for k, distancias in enumerate(rondas):
+        d = distancias[destino]
+        if d < anterior:
+            frente.append((float(d), k))
+            anterior = d
+    return frente
+
+
+def reconstruir(rondas, previos, destino, vuelos):
+    """Ids del camino con a lo sumo `vuelos` vuelos hasta el destino (la ruta del frente de Pareto)"""
+    camino = [destino]
+    v, k = destino, vuelos
+    while k > 0:
+        # Si la ronda k no mejoró a v, su mejor ruta es la de la ronda anterior
+        while k > 0 and previos[k][v] < 0:
+            k -= 1
+        if k == 0:
+            break
+        v = int(previos[k][v])
+        camino.append(v)
+        k -= 1
+    return camino[::-1]
+
+
+def bellman_ford_lote(csr, origenes, destinos, max_vuelos=None):
+    """Rondas para muchos orígenes a la vez: arreglo (rondas, orígenes, destinos) de distancias.
+
+    Los orígenes se procesan en bloques para que la matriz orígenes × aristas no pase de
+    ELEMENTOS_POR_BLOQUE; todos los bloques se completan hasta la misma cantidad de rondas.
+    """
+    n = len(csr.codigos)
+    indices, pesos = np.asarray(csr.indices), np.asarray(csr.pesos)
+    inicios, con_vecinos = _segmentos(csr)
+    origenes = np.asarray(origenes, dtype=np.int64)
+    destinos = np.asarray(destinos, dtype=np.int64)
+    por_bloque = max(1, ELEMENTOS_POR_BLOQUE // max(len(indices), 1))
+    limite = n - 1 if max_vuelos is None else max_vuelos
+
+    bloques = []
+    for inicio in range(0, len(origenes), por_bloque):
+        ids = origenes[inicio:inicio + por_bloque]
+        distancias = np.full((len(ids), n), np.inf)
+        distancias[np.arange(len(ids)), ids] = 0
+        rondas = [distancias[:, destinos]]
+        for _ in range(limite):
+            mejor, _ = _ronda(distancias, indices, pesos, inicios, con_vecinos)
+            if not (mejor < distancias).any():
+                break
+            distancias = np.minimum(mejor, distancias)
+            rondas.append(distancias[:, destinos])
+        bloques.append(rondas)
+
+    total = max(len(rondas) for rondas in bloques) if bloques else 1
+    salida = np.empty((total, len(origenes), len(destinos)))
+    fila = 0
+    for rondas in bloques:
+        filas = len(rondas[0])
+        for k in range(total):
+            salida[k, fila:fila + filas] = rondas[min(k, len(rondas) - 1)]
+        fila += filas
+    return salida
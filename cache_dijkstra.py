@@ -0,0 +1,151 @@
+import heapq
+import sys
+from collections import OrderedDict
+
+INF = float('inf')
+
+
+class CacheDijkstra:
+    """Caché LRU de resultados de Dijkstra {origen: (distancias, predecesores)}.
+
+    Se limita por número de entradas y por bytes aproximados; al pasarse de cualquiera
+    de los dos límites se descartan los orígenes usados hace más tiempo.
+    """
+
+    def __init__(self, max_entradas=32, max_bytes=256 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()  # {origen: ((distancias, predecesores), bytes)}
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    @staticmethod
+    def tamano(distancias, predecesores):
+        """Bytes aproximados de una entrada (las claves son los códigos, compartidos con el grafo)"""
+        return (sys.getsizeof(distancias) + sys.getsizeof(predecesores)
+                + 24 * len(distancias))  # un float por distancia; los predecesores son referencias
+
+    def __contains__(self, origen):
+        return origen in self._entradas
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def obtener(self, origen):
+        """Devuelve (distancias, predecesores) si está en caché, si no None"""
+        entrada = self._entradas.get(origen)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(origen)
+        self.aciertos += 1
+        return entrada[0]
+
+    def guardar(self, origen, distancias, predecesores):
+        """Guarda un resultado y descarta los menos usados si se superan los límites"""
+        if origen in self._entradas:
+            self.bytes -= self._entradas.pop(origen)[1]
+        tamano = self.tamano(distancias, predecesores)
+        if tamano > self.max_bytes or self.max_entradas <= 0:
+            return
+        self._entradas[origen] = ((distancias, predecesores), tamano)
+        self.bytes += tamano
+
+        while len(self._entradas) > self.max_entradas or self.bytes > self.max_bytes:
+            _, (_, tamano_viejo) = self._entradas.popitem(last=False)
+            self.bytes -= tamano_viejo
+            self.desalojos += 1
+
+    def arista_actualizada(self, grafo, u, v, peso_anterior):
+        """Corrige en el lugar los árboles guardados después de que cambió la arista u–v.
+
+        grafo ya tiene el cambio; peso_anterior es None si la arista es nueva, y si se quitó
+        u–v ya no está en grafo. Las distancias quedan iguales a las de un Dijkstra nuevo.
+        """
+        peso = grafo[u].get(v)
+        for (distancias, predecesores), _ in self._entradas.values():
+            if peso is not None and (peso_anterior is None or peso < peso_anterior):
+                _bajar(distancias, predecesores, grafo, u, v, peso)
+            elif peso_anterior is not None and (peso is None or peso > peso_anterior):
+                _subir(distancias, predecesores, grafo, u, v)
+
+    def vertice_agregado(self, codigo):
+        """Un aeropuerto nuevo (todavía sin rutas) queda inalcanzable en los árboles guardados"""
+        for (distancias, predecesores), _ in self._entradas.values():
+            distancias[codigo] = INF
+            predecesores[codigo] = None
+
+    def limpiar(self):
+        """Vacía la caché (el grafo cambió); los contadores se conservan"""
+        self._entradas.clear()
+        self.bytes = 0
+
+    def estadisticas(self):
+        return {
+            'entradas': len(self._entradas),
+            'bytes': self.bytes,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+        }
+
+
+def _propagar(distancias, predecesores, grafo, heap):
+    """Dijkstra a partir de los vértices del heap, que ya tienen su distancia corregida"""
+    heapq.heapify(heap)
+    while heap:
+        dist, x = heapq.heappop(heap)
+        if dist > distancias[x]:
+            continue
+        for y, peso in grafo[x].items():
+            nueva = dist + peso
+            if nueva < distancias[y]:
+                distancias[y] = nueva
+                predecesores[y] = x
+                heapq.heappush(heap, (nueva, y))
+
+
+def _bajar(distancias, predecesores, grafo, u, v, peso):
+    """Arista nueva o más barata: solo mejoran los vértices a los que conviene llegar por ella"""
+    heap = []
+    for a, b in ((u, v), (v, u)):
+        nueva = distancias[a] + peso
+        if nueva < distancias[b]:
+            distancias[b] = nueva
+            predecesores[b] = a
+            heap.append((nueva, b))
+    _propagar(distancias, predecesores, grafo, heap)
+
+
+def _subir(distancias, predecesores, grafo, u, v):
+    """Arista quitada o más cara: si era del árbol, se rehace solo el subárbol que colgaba de ella"""
+    if predecesores.get(v) == u:
+        raiz = v
+    elif predecesores.get(u) == v:
+        raiz = u
+    else:
+        return
+    afectados = {raiz}
+    pila = [raiz]
+    while pila:
+        x = pila.pop()
+        for y in grafo[x]:
+            if predecesores[y] == x and y not in afectados:
+                afectados.add(y)
+                pila.append(y)
+
+    for x in afectados:
+        distancias[x] = INF
+        predecesores[x] = None
+    # Cada afectado arranca con el mejor camino que le ofrece un vecino que no cambió
+    heap = []
+    for x in afectados:
+        for y, peso in grafo[x].items():
+            if y not in afectados and distancias[y] + peso < distancias[x]:
+                distancias[x] = distancias[y] + peso
+                predecesores[x] = y
+        if distancias[x] < INF:
+            heap.append((distancias[x], x))
+    _propagar(distancias, predecesores, grafo, heap)
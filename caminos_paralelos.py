@@ -0,0 +1,89 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import shared_memory
+import numpy as np
+from grafo_csr import GrafoCSR
+
+# Estado de cada proceso trabajador: el CSR se arma una sola vez sobre la memoria compartida
+_csr_trabajador = None
+_memorias_trabajador = []
+
+
+def _iniciar_trabajador(bloques, codigos):
+    """Se conecta a los arreglos del CSR en memoria compartida (sin copiarlos ni picklearlos por tarea)"""
+    global _csr_trabajador, _memorias_trabajador
+    arreglos = []
+    for nombre, forma, tipo in bloques:
+        memoria = shared_memory.SharedMemory(name=nombre)
+        _memorias_trabajador.append(memoria)
+        arreglos.append(np.ndarray(forma, dtype=tipo, buffer=memoria.buf))
+    _csr_trabajador = GrafoCSR(codigos, *arreglos)
+
+
+def _resolver(csr, ids, resumen):
+    """Dijkstra desde cada id; devuelve las distancias o solo (excentricidad, suma, alcanzables)"""
+    resultados = []
+    for i in ids:
+        distancias, _ = csr.dijkstra(i)
+        distancias = np.array(distancias)
+        if resumen:
+            finitas = distancias[np.isfinite(distancias)]
+            resultados.append((i, (float(finitas.max()), float(finitas.sum()), len(finitas) - 1)))
+        else:
+            resultados.append((i, distancias))
+    return resultados
+
+
+def _tarea(ids, resumen):
+    return _resolver(_csr_trabajador, ids, resumen)
+
+
+def _compartir(arreglo):
+    """Copia un arreglo a un bloque de memoria compartida y devuelve (bloque, descripción)"""
+    memoria = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 1))
+    np.ndarray(arreglo.shape, dtype=arreglo.dtype, buffer=memoria.buf)[:] = arreglo
+    return memoria, (memoria.name, arreglo.shape, arreglo.dtype.str)
+
+
+def dijkstra_lote(csr, origenes, procesos=None, resumen=False, tamano_tarea=16):
+    """Generador de (id_origen, resultado) con un Dijkstra por origen repartido en procesos.
+
+    resultado es el arreglo de distancias alineado con csr.codigos, o con resumen=True la
+    tupla (excentricidad, suma de distancias, aeropuertos alcanzables). Los resultados salen
+    en orden de terminación y nunca hay más de unas pocas tareas en vuelo, así que la matriz
+    completa N×N no llega a existir en memoria.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    tareas = [origenes[i:i + tamano_tarea] for i in range(0, len(origenes), tamano_tarea)]
+
+    if procesos == 1:
+        for ids in tareas:
+            yield from _resolver(csr, ids, resumen)
+        return
+
+    memorias, bloques = [], []
+    try:
+        for arreglo in (csr.indptr, csr.indices, csr.pesos):
+            memoria, bloque = _compartir(np.ascontiguousarray(arreglo))
+            memorias.append(memoria)
+            bloques.append(bloque)
+
+        with ProcessPoolExecutor(procesos, initializer=_iniciar_trabajador,
+                                 initargs=(bloques, csr.codigos)) as pool:
+            pendientes = iter(tareas)
+            en_vuelo = set()
+            for ids in pendientes:
+                en_vuelo.add(pool.submit(_tarea, ids, resumen))
+                if len(en_vuelo) >= 2 * procesos:
+                    break
+            while en_vuelo:
+                listas, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                for futuro in listas:
+                    yield from futuro.result()
+                    siguiente = next(pendientes, None)
+                    if siguiente is not None:
+                        en_vuelo.add(pool.submit(_tarea, siguiente, resumen))
+    finally:
+        for memoria in memorias:
+            memoria.close()
+            memoria.unlink()
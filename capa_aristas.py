@@ -0,0 +1,136 @@
+import numpy as np
+from matplotlib.colors import to_rgb
+
+
+def recortar_segmentos(segmentos, x_min, x_max, y_min, y_max):
+    """Recorta segmentos (n, 2, 2) a la caja (Liang-Barsky) y descarta los que no la cruzan.
+
+    Agg rasteriza cada línea entera aunque caiga fuera del eje: con zoom, las rutas largas
+    que atraviesan la vista costaban miles de píxeles fuera de pantalla cada una.
+    """
+    inicio = segmentos[:, 0]
+    delta = segmentos[:, 1] - inicio
+    t0 = np.zeros(len(segmentos))
+    t1 = np.ones(len(segmentos))
+    fuera = np.zeros(len(segmentos), dtype=bool)
+    for p, q in ((-delta[:, 0], inicio[:, 0] - x_min), (delta[:, 0], x_max - inicio[:, 0]),
+                 (-delta[:, 1], inicio[:, 1] - y_min), (delta[:, 1], y_max - inicio[:, 1])):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = q / p
+        t0 = np.where(p < 0, np.maximum(t0, r), t0)
+        t1 = np.where(p > 0, np.minimum(t1, r), t1)
+        fuera |= (p == 0) & (q < 0)
+
+    quedan = ~fuera & (t0 <= t1)
+    inicio, delta = inicio[quedan], delta[quedan]
+    return np.stack([inicio + delta * t0[quedan, None], inicio + delta * t1[quedan, None]], axis=1)
+
+
+class CapaAristas:
+    """Segmentos de un (sub)grafo preparados una sola vez para redibujar rápido al hacer zoom/pan.
+
+    - Cada arista no dirigida se guarda una vez (el diccionario tiene u→v y v→u).
+    - Los segmentos quedan en un arreglo de NumPy (n, 2, 2) con su caja envolvente.
+    - Al pedir los visibles se descartan los que no tocan la vista; si aún quedan más de
+      max_segmentos, la vista se dibuja con un raster de densidad de rutas precalculado
+      (alejado no se distinguen miles de líneas y el raster cuesta lo mismo con 1k o 100k).
+    """
+
+    def __init__(self, subgrafo, posiciones, max_segmentos=3000, resolucion=(2048, 1024)):
+        self.max_segmentos = max_segmentos
+        self.resolucion = resolucion  # (ancho, alto) del raster sobre [-180, 180] x [-90, 90]
+        self._rasters = {}            # {color: imagen RGBA}
+        self._densidad = None
+
+        vistos = set()
+        puntos = []
+        for u in subgrafo:
+            if u not in posiciones:
+                continue
+            for v in subgrafo[u]:
+                if v == u or v not in posiciones or (v, u) in vistos:
+                    continue
+                vistos.add((u, v))
+                puntos.append(posiciones[u] + posiciones[v])
+
+        self.segmentos = np.array(puntos, dtype=float).reshape(-1, 2, 2)
+        xs, ys = self.segmentos[:, :, 0], self.segmentos[:, :, 1]
+        self.x_min, self.x_max = xs.min(axis=1), xs.max(axis=1)
+        self.y_min, self.y_max = ys.min(axis=1), ys.max(axis=1)
+
+    def __len__(self):
+        return len(self.segmentos)
+
+    def visibles(self, x_min, x_max, y_min, y_max):
+        """Segmentos que tocan la vista, o None si son demasiados y conviene usar raster()"""
+        dentro = ((self.x_max >= x_min) & (self.x_min <= x_max) &
+                  (self.y_max >= y_min) & (self.y_min <= y_max))
+        if np.count_nonzero(dentro) > self.max_segmentos:
+            return None
+        return recortar_segmentos(self.segmentos[dentro], x_min, x_max, y_min, y_max)
+
+    def densidad(self, bloque=1_000_000):
+        """Cuántas rutas pasan por cada píxel del raster (se calcula una vez)"""
+        if self._densidad is not None:
+            return self._densidad
+
+        ancho, alto = self.resolucion
+        escala = np.array([ancho / 360.0, alto / 180.0])
+        origen = np.array([-180.0, -90.0])
+        inicio = (self.segmentos[:, 0] - origen) * escala
+        fin = (self.segmentos[:, 1] - origen) * escala
+        # Un punto de muestra por píxel de largo en cada segmento
+        muestras = np.maximum(np.ceil(np.abs(fin - inicio).max(axis=1)), 1).astype(np.int64) + 1
+
+        conteo = np.zeros(ancho * alto, dtype=np.int64)
+        # Procesar por lotes de ~bloque muestras para no armar todos los puntos a la vez
+        limites = np.searchsorted(np.cumsum(muestras), np.arange(bloque, muestras.sum(), bloque))
+        cortes = np.unique(np.concatenate([[0], limites, [len(muestras)]]))
+        for desde, hasta in zip(cortes[:-1].tolist(), cortes[1:].tolist()):
+            n = muestras[desde:hasta]
+            cual = np.repeat(np.arange(desde, hasta), n)
+            t = (np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)) / np.repeat(n - 1, n)
+            puntos = inicio[cual] + (fin[cual] - inicio[cual]) * t[:, None]
+            px = np.clip(puntos[:, 0].astype(np.int64), 0, ancho - 1)
+            py = np.clip(puntos[:, 1].astype(np.int64), 0, alto - 1)
+            conteo += np.bincount(py * ancho + px, minlength=ancho * alto)
+
+        self._densidad = conteo.reshape(alto, ancho)
+        return self._densidad
+
+    def raster(self, color, nivel=0):
+        """Imagen RGBA (origen abajo) con la densidad de rutas en escala logarítmica como transparencia.
+
+        nivel reduce la resolución a la mitad por cada unidad (sumando bloques de 2x2).
+        """
+        if (color, nivel) not in self._rasters:
+            densidad = self.densidad()
+            for _ in range(nivel):
+                alto, ancho = densidad.shape
+                densidad = densidad[:alto // 2 * 2, :ancho // 2 * 2].reshape(alto // 2, 2, ancho // 2, 2).sum(axis=(1, 3))
+            imagen = np.zeros(densidad.shape + (4,), dtype=np.uint8)
+            imagen[..., :3] = np.round(np.array(to_rgb(color)) * 255)
+            if densidad.max() > 0:
+                imagen[..., 3] = np.round(217 * np.log1p(densidad) / np.log1p(densidad.max()))
+            self._rasters[(color, nivel)] = imagen
+        return self._rasters[(color, nivel)]
+
+    def raster_vista(self, color, x_min, x_max, y_min, y_max, max_ancho=1024):
+        """Recorte del raster que cubre la vista, con a lo sumo ~max_ancho píxeles de ancho.
+
+        Devuelve (imagen, extent) listo para imshow; así el costo de dibujarlo no depende del zoom.
+        """
+        ancho_total = self.resolucion[0]
+        nivel = 0
+        while ancho_total / 2 ** nivel * (x_max - x_min) / 360.0 > max_ancho:
+            nivel += 1
+        imagen = self.raster(color, nivel)
+        alto, ancho = imagen.shape[:2]
+
+        # Índices de píxel que cubren la vista (recortados a los bordes del mapa)
+        c0 = int(np.clip(np.floor((x_min + 180) / 360 * ancho), 0, ancho))
+        c1 = int(np.clip(np.ceil((x_max + 180) / 360 * ancho), 0, ancho))
+        f0 = int(np.clip(np.floor((y_min + 90) / 180 * alto), 0, alto))
+        f1 = int(np.clip(np.ceil((y_max + 90) / 180 * alto), 0, alto))
+        extent = [c0 / ancho * 360 - 180, c1 / ancho * 360 - 180, f0 / alto * 180 - 90, f1 / alto * 180 - 90]
+        return imagen[f0:f1, c0:c1], extent
@@ -0,0 +1,61 @@
+class ConjuntosDisjuntos:
+    """Union-find con compresión de caminos y unión por rango para seguir las componentes conexas"""
+
+    def __init__(self):
+        self.padre = {}   # {elemento: padre}
+        self.rango = {}   # {raiz: cota de la altura del árbol}
+        self.numero_componentes = 0
+
+    def __contains__(self, x):
+        return x in self.padre
+
+    def agregar(self, x):
+        """Agrega x como componente propia si todavía no existe"""
+        if x not in self.padre:
+            self.padre[x] = x
+            self.rango[x] = 0
+            self.numero_componentes += 1
+
+    def encontrar(self, x):
+        """Raíz del conjunto de x, comprimiendo el camino recorrido"""
+        padre = self.padre
+        raiz = x
+        while padre[raiz] != raiz:
+            raiz = padre[raiz]
+        while padre[x] != raiz:
+            padre[x], x = raiz, padre[x]
+        return raiz
+
+    def unir(self, a, b):
+        """Une los conjuntos de a y b; devuelve True si estaban separados"""
+        raiz_a, raiz_b = self.encontrar(a), self.encontrar(b)
+        if raiz_a == raiz_b:
+            return False
+        if self.rango[raiz_a] < self.rango[raiz_b]:
+            raiz_a, raiz_b = raiz_b, raiz_a
+        self.padre[raiz_b] = raiz_a
+        if self.rango[raiz_a] == self.rango[raiz_b]:
+            self.rango[raiz_a] += 1
+        del self.rango[raiz_b]
+        self.numero_componentes -= 1
+        return True
+
+    def separar(self, *grupos):
+        """Rehace una componente que se partió (al quitar una arista); los grupos deben cubrirla entera"""
+        for grupo in grupos:
+            raiz = next(iter(grupo))
+            for x in grupo:
+                self.padre[x] = raiz
+                self.rango.pop(x, None)
+            self.rango[raiz] = 1 if len(grupo) > 1 else 0
+        self.numero_componentes += len(grupos) - 1
+
+    def mismo_componente(self, a, b):
+        return self.encontrar(a) == self.encontrar(b)
+
+    def agrupar(self, elementos):
+        """Lista de componentes en el orden de elementos (cada una ordenada igual)"""
+        grupos = {}
+        for x in elementos:
+            grupos.setdefault(self.encontrar(x), []).append(x)
+        return list(grupos.values())
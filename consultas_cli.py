@@ -0,0 +1,224 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+from grafo_aereopuertos import GrafoAeropuertos
+import instrumentacion
+
+# Este módulo no importa tkinter ni matplotlib: sirve en servidores sin pantalla.
+#
+#   python main.py caminos pares.csv -o caminos.csv
+#   python main.py lejanos codigos.txt -k 10 -o lejanos.json
+#   python main.py conexidad
+#   python main.py mst --csv otra_red.csv
+#   python main.py conexidad --delta cambios_del_dia.csv
+#   python main.py escalas pares.csv --max-escalas 2 --penalizacion 300
+#   python main.py escalas codigos_region.txt --region --max-escalas 3 -o region.json
+#   python main.py caminos pares.csv --traza traza.json --perfil perfil.json --captura cprofile
+
+COLUMNAS = {
+    'caminos': ['origen', 'destino', 'distancia', 'escalas', 'camino', 'explorados'],
+    'lejanos': ['origen', 'posicion', 'destino', 'distancia'],
+    'conexidad': ['componente', 'aeropuertos', 'ejemplo'],
+    'mst': ['componente', 'aeropuertos', 'aristas', 'peso'],
+    'escalas': ['origen', 'destino', 'escalas', 'distancia', 'costo', 'camino'],
+}
+
+
+def leer_pares(ruta):
+    """Pares (origen, destino) de un CSV de dos columnas (con o sin encabezado); # comenta"""
+    pares = []
+    with open(ruta, newline='', encoding='utf-8') as f:
+        for fila in csv.reader(f):
+            fila = [campo.strip().upper() for campo in fila if campo.strip()]
+            if len(fila) < 2 or fila[0].startswith('#'):
+                continue
+            pares.append((fila[0], fila[1]))
+    if pares and pares[0][0] in ('ORIGEN', 'ORIGIN', 'SOURCE', 'FROM'):
+        pares = pares[1:]
+    return pares
+
+
+def leer_codigos(ruta):
+    """Códigos de aeropuerto separados por comas, espacios o saltos de línea"""
+    with open(ruta, encoding='utf-8') as f:
+        return [c.strip().upper() for c in f.read().replace(',', ' ').split() if not c.startswith('#')]
+
+
+def consultar_caminos(grafo, args):
+    pares = leer_pares(args.entrada)
+    for (origen, destino), (distancia, camino, asentados) in zip(pares, grafo.caminos_lote(pares, args.modo)):
+        encontrado = distancia != float('inf')
+        yield {
+            'origen': origen,
+            'destino': destino,
+            'distancia': round(distancia, 2) if encontrado else None,
+            'escalas': max(len(camino) - 2, 0) if encontrado else None,
+            'camino': camino,
+            'explorados': asentados,
+        }
+
+
+def consultar_lejanos(grafo, args):
+    codigos = leer_codigos(args.entrada)
+    desconocidos = [c for c in codigos if c not in grafo.aeropuertos]
+    if desconocidos:
+        print(f"Códigos desconocidos (se omiten): {', '.join(desconocidos[:20])}", file=sys.stderr)
+    lejanos = grafo.mas_lejanos_lote(codigos, args.k, procesos=args.procesos)
+    for codigo in codigos:
+        for posicion, (destino, distancia) in enumerate(lejanos.get(codigo, []), 1):
+            yield {'origen': codigo, 'posicion': posicion, 'destino': destino, 'distancia': round(distancia, 2)}
+
+
+def consultar_conexidad(grafo, args):
+    _, componentes = grafo.es_conexo()
+    for i, comp in enumerate(componentes, 1):
+        yield {'componente': i, 'aeropuertos': len(comp), 'ejemplo': comp[0]}
+
+
+def consultar_mst(grafo, args):
+    componentes = grafo.componentes_conexas()
+    for i, (comp, (peso, aristas)) in enumerate(zip(componentes, grafo.bosque_expansion_minima(args.motor)), 1):
+        yield {'componente': i, 'aeropuertos': len(comp), 'aristas': len(aristas), 'peso': round(peso, 2)}
+
+
+def consultar_escalas(grafo, args):
+    """Cada ruta del frente de Pareto (distancia, escalas); costo suma la penalización por escala"""
+    if args.region:
+        frentes = grafo.pareto_region(leer_codigos(args.entrada), args.max_escalas)
+        rutas = (((origen, destino), [(d, e, None) for d, e in frente]) for (origen, destino), frente in frentes.items())
+    else:
+        pares = leer_pares(args.entrada)
+        rutas = zip(pares, grafo.rutas_pareto_pares(pares, args.max_escalas))
+    for (origen, destino), frente in rutas:
+        for distancia, escalas, camino in frente:
+            yield {
+                'origen': origen,
+                'destino': destino,
+                'escalas': escalas,
+                'distancia': round(distancia, 2),
+                'costo': round(distancia + args.penalizacion * escalas, 2),
+                'camino': camino,
+            }
+
+
+CONSULTAS = {
+    'caminos': consultar_caminos,
+    'lejanos': consultar_lejanos,
+    'conexidad': consultar_conexidad,
+    'mst': consultar_mst,
+    'escalas': consultar_escalas,
+}
+
+
+def escribir(filas, columnas, salida, formato):
+    """Escribe las filas como CSV (el camino con '>' entre códigos) o como una lista JSON"""
+    if formato == 'json':
+        json.dump(filas, salida, ensure_ascii=False, indent=1)
+        salida.write('\n')
+        return
+    escritor = csv.DictWriter(salida, fieldnames=columnas, lineterminator='\n')
+    escritor.writeheader()
+    for fila in filas:
+        if isinstance(fila.get('camino'), list):
+            fila = dict(fila, camino='>'.join(fila['camino']))
+        escritor.writerow(fila)
+
+
+def _opciones_comunes(parser, por_defecto):
+    """--csv, --salida, etc.; por_defecto=False las deja sin valor para no pisar las dadas antes de la consulta"""
+    ruta_base = os.path.dirname(os.path.abspath(__file__))
+    valor = (lambda v: v) if por_defecto else (lambda v: argparse.SUPPRESS)
+    parser.add_argument('--csv', default=valor(os.path.join(ruta_base, 'flights_final.csv')), help='CSV de rutas')
+    parser.add_argument('--sin-snapshot', action='store_true', default=valor(False),
+                        help='no usar ni guardar el snapshot binario')
+    parser.add_argument('--delta', action='append', default=valor([]), metavar='CSV',
+                        help='CSV de cambios de rutas a aplicar después de cargar (se puede repetir)')
+    parser.add_argument('-o', '--salida', default=valor(None), help='archivo de salida (por defecto la salida estándar)')
+    parser.add_argument('-f', '--formato', choices=['csv', 'json'], default=valor(None),
+                        help='formato de salida (por defecto según la extensión de --salida, si no csv)')
+    parser.add_argument('--traza', default=valor(None), metavar='ARCHIVO',
+                        help='guardar los tiempos de cada operación como traza de Chrome (chrome://tracing)')
+    parser.add_argument('--perfil', default=valor(None), metavar='ARCHIVO',
+                        help='guardar los tiempos y contadores de cada operación en JSON')
+    parser.add_argument('--captura', action='append', choices=['cprofile', 'tracemalloc'], default=valor([]),
+                        help='con --traza o --perfil: cProfile o pico de memoria de cada operación (se puede repetir)')
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog='main.py', description='Consultas por lotes sobre la red de aeropuertos (sin interfaz)')
+    _opciones_comunes(parser, por_defecto=True)
+    comunes = argparse.ArgumentParser(add_help=False)
+    _opciones_comunes(comunes, por_defecto=False)
+    sub = parser.add_subparsers(dest='consulta', required=True)
+
+    p = sub.add_parser('caminos', parents=[comunes], help='camino mínimo para cada par origen,destino de un CSV')
+    p.add_argument('entrada', help='CSV con dos columnas: origen,destino')
+    p.add_argument('--modo', choices=['astar', 'bidireccional', 'dijkstra', 'ch'], default='astar',
+                   help="'ch' preprocesa una jerarquía de contracción (se guarda en el snapshot)")
+
+    p = sub.add_parser('lejanos', parents=[comunes], help='los k aeropuertos más lejanos para cada código de un archivo')
+    p.add_argument('entrada', help='archivo con códigos de aeropuerto')
+    p.add_argument('-k', type=int, default=10)
+    p.add_argument('--procesos', type=int, help='procesos para repartir los Dijkstra (por defecto todos los núcleos)')
+
+    sub.add_parser('conexidad', parents=[comunes], help='componentes conexas y su tamaño')
+
+    p = sub.add_parser('escalas', parents=[comunes],
+                       help='rutas Pareto-óptimas en distancia y escalas para cada par (o toda una región)')
+    p.add_argument('entrada', help='CSV con dos columnas origen,destino (con --region, archivo de códigos)')
+    p.add_argument('--max-escalas', type=int, help='escalas como máximo (por defecto sin límite)')
+    p.add_argument('--penalizacion', type=float, default=0.0, help='km que suma cada escala en la columna costo')
+    p.add_argument('--region', action='store_true',
+                   help='calcular todos los pares entre los códigos de la entrada (sin caminos)')
+
+    p = sub.add_parser('mst', parents=[comunes], help='árbol de expansión mínima de cada componente')
+    p.add_argument('--motor', choices=['kruskal', 'boruvka', 'prim'])
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.traza or args.perfil:
+        instrumentacion.activar(perfil='cprofile' in args.captura, memoria='tracemalloc' in args.captura)
+
+    grafo = GrafoAeropuertos()
+    inicio = time.perf_counter()
+    # Los mensajes de carga van a stderr para no mezclarse con los resultados
+    with contextlib.redirect_stdout(sys.stderr):
+        cargado = grafo.cargar_datos(args.csv, usar_snapshot=not args.sin_snapshot)
+    if not cargado:
+        return 1
+    for ruta in args.delta:
+        resumen = grafo.aplicar_delta(ruta)
+        omitidas = resumen.pop('omitidas')
+        print(f"Cambios de {ruta}: {resumen}, omitidas {len(omitidas)}", file=sys.stderr)
+        for linea, motivo in omitidas[:20]:
+            print(f"  línea {linea}: {motivo}", file=sys.stderr)
+    carga = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with instrumentacion.tramo('consulta', tipo=args.consulta):
+        filas = list(CONSULTAS[args.consulta](grafo, args))
+    consulta = time.perf_counter() - inicio
+
+    formato = args.formato or ('json' if args.salida and args.salida.lower().endswith('.json') else 'csv')
+    if args.salida:
+        with open(args.salida, 'w', newline='', encoding='utf-8') as salida:
+            escribir(filas, COLUMNAS[args.consulta], salida, formato)
+    else:
+        escribir(filas, COLUMNAS[args.consulta], sys.stdout, formato)
+
+    print(f"{len(filas)} filas — carga {carga:.2f} s, consultas {consulta:.2f} s", file=sys.stderr)
+    if args.traza:
+        instrumentacion.exportar_chrome(args.traza)
+    if args.perfil:
+        instrumentacion.exportar_json(args.perfil)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
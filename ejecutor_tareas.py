@@ -0,0 +1,131 @@
+import threading
+import queue
+import time
+import instrumentacion
+
+
+class Tarea:
+    """Un cálculo pedido por la interfaz: la función corre en el hilo trabajador y al_terminar en el de Tk"""
+
+    def __init__(self, nombre, funcion, al_terminar, al_fallar=None):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.pedida = time.perf_counter()
+        self.cancelada = threading.Event()
+
+    def cancelar(self):
+        self.cancelada.set()
+
+    def transcurrido(self):
+        return time.perf_counter() - self.pedida
+
+
+class EjecutorTareas:
+    """Corre los cálculos del grafo en un hilo aparte y entrega los resultados en el hilo de Tk.
+
+    - Hay un solo hilo trabajador: el grafo y sus cachés no se pueden usar desde varios hilos a la vez.
+      Lo único que el hilo de Tk consulta del grafo sin pasar por aquí son los índices espacial y de
+      búsqueda, que la interfaz construye antes de crear el ejecutor y que el trabajador no usa.
+    - Una tarea nueva cancela la anterior: si esperaba ya no corre, y si estaba corriendo termina
+      pero su resultado se descarta (los algoritmos no se pueden cortar a la mitad).
+    - El hilo trabajador nunca toca Tk: deja el resultado en una cola que el hilo principal
+      revisa con root.after mientras haya algo en curso.
+    """
+
+    def __init__(self, root, intervalo_ms=50, al_cambiar=None, al_revisar=None):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self.al_cambiar = al_cambiar  # callback(tarea activa o None) en el hilo de Tk, en cada revisión
+        self.al_revisar = al_revisar  # callback() en el hilo de Tk, p. ej. para volcar la salida de print
+        self._condicion = threading.Condition()
+        self._pendiente = None
+        self._actual = None
+        self._resultados = queue.Queue()
+        self._revisando = False
+        threading.Thread(target=self._trabajar, name="calculos-grafo", daemon=True).start()
+
+    def ejecutar(self, nombre, funcion, al_terminar, al_fallar=None):
+        """Encola funcion() cancelando lo que hubiera; al_terminar(resultado) se llama en el hilo de Tk"""
+        tarea = Tarea(nombre, funcion, al_terminar, al_fallar)
+        with self._condicion:
+            for anterior in (self._pendiente, self._actual):
+                if anterior is not None:
+                    anterior.cancelar()
+            self._pendiente = tarea
+            self._condicion.notify()
+        self._revisar_pronto()
+        return tarea
+
+    def cancelar(self):
+        """Cancela la tarea en espera y la que está corriendo"""
+        with self._condicion:
+            for tarea in (self._pendiente, self._actual):
+                if tarea is not None:
+                    tarea.cancelar()
+            self._pendiente = None
+        self._revisar_pronto()
+
+    def tarea_activa(self):
+        """La tarea que todavía va a entregar resultado (en espera o corriendo), o None"""
+        with self._condicion:
+            for tarea in (self._pendiente, self._actual):
+                if tarea is not None and not tarea.cancelada.is_set():
+                    return tarea
+        return None
+
+    # ====== HILO TRABAJADOR ======
+    def _trabajar(self):
+        while True:
+            with self._condicion:
+                while self._pendiente is None:
+                    self._condicion.wait()
+                tarea, self._pendiente = self._pendiente, None
+                self._actual = tarea
+
+            if not tarea.cancelada.is_set():
+                try:
+                    with instrumentacion.tramo('tarea', nombre=tarea.nombre, espera_ms=tarea.transcurrido() * 1000):
+                        resultado = tarea.funcion()
+                    self._resultados.put((tarea, resultado, None))
+                except Exception as e:
+                    self._resultados.put((tarea, None, e))
+
+            # Se deja de marcar como actual después de encolar el resultado, así la revisión
+            # nunca ve "nada en curso" con un resultado todavía por llegar
+            with self._condicion:
+                self._actual = None
+
+    # ====== HILO DE TK ======
+    def _revisar_pronto(self):
+        if not self._revisando:
+            self._revisando = True
+            self.root.after(self.intervalo_ms, self._revisar)
+
+    def _revisar(self):
+        while True:
+            try:
+                tarea, resultado, error = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            if self.al_revisar:
+                self.al_revisar()
+            if tarea.cancelada.is_set():
+                continue
+            if error is None:
+                tarea.al_terminar(resultado)
+            elif tarea.al_fallar:
+                tarea.al_fallar(error)
+            else:
+                print(f"❌ Error en {tarea.nombre}: {error}")
+
+        if self.al_revisar:
+            self.al_revisar()
+        activa = self.tarea_activa()
+        if self.al_cambiar:
+            self.al_cambiar(activa)
+        if activa is not None or not self._resultados.empty():
+            self.root.after(self.intervalo_ms, self._revisar)
+        else:
+            self._revisando = False
@@ -0,0 +1,77 @@
+# Texto para mostrar los resultados de GrafoAeropuertos: la clase solo devuelve datos, no imprime
+
+
+def formatear_conexidad(es_conexo, componentes, bosque=None):
+    """Resumen de conexidad; con bosque (de bosque_expansion_minima) agrega el peso de cada componente"""
+    lineas = ["\n--- CONEXIDAD DEL GRAFO ---",
+              f"¿Es conexo? {'SÍ' if es_conexo else 'NO'}",
+              f"Número de componentes conexas: {len(componentes)}"]
+
+    pesos = [peso for peso, _ in bosque] if bosque is not None else [None] * len(componentes)
+    for i, (comp, peso) in enumerate(zip(componentes, pesos), 1):
+        linea = f"Componente {i}: {len(comp)} aeropuertos"
+        if peso is not None:
+            linea += f" — Distancia total: {peso:.2f} km"
+        lineas.append(linea)
+        if len(comp) <= 10:  # Mostrar solo si son pocos
+            lineas.append(f"  Aeropuertos: {comp}")
+    return "\n".join(lineas)
+
+
+def formatear_mst(componentes, bosque):
+    """Peso y tamaño del árbol de expansión mínima de cada componente"""
+    lineas = ["\n--- ÁRBOL DE EXPANSIÓN MÍNIMA ---"]
+    for i, (comp, (peso, aristas)) in enumerate(zip(componentes, bosque), 1):
+        lineas.append(f"Componente {i} ({len(comp)} aeropuertos):")
+        lineas.append(f"  Peso total del MST: {peso:.2f} km")
+        lineas.append(f"  Número de aristas en MST: {len(aristas)}")
+    return "\n".join(lineas)
+
+
+def formatear_mas_lejanos(aeropuertos, codigo, lejanos):
+    """Ficha del aeropuerto de origen y la lista de aeropuertos_mas_lejanos"""
+    if lejanos is None:
+        return f" Aeropuerto {codigo} no encontrado"
+
+    info = aeropuertos[codigo]
+    lineas = [f"\n--- {len(lejanos)} AEROPUERTOS MÁS LEJANOS DESDE {codigo} ---",
+              f"Información de {codigo}:",
+              f"  Nombre: {info['nombre']}",
+              f"  Ciudad: {info['ciudad']}",
+              f"  País: {info['pais']}",
+              f"  Coordenadas: ({info['latitud']}, {info['longitud']})",
+              "\nAeropuertos más lejanos:"]
+    for i, (aero, dist) in enumerate(lejanos, 1):
+        info_aero = aeropuertos[aero]
+        lineas.append(f"{i}. {aero} - {info_aero['nombre']}")
+        lineas.append(f"   Ciudad: {info_aero['ciudad']}, País: {info_aero['pais']}")
+        lineas.append(f"   Coordenadas: ({info_aero['latitud']}, {info_aero['longitud']})")
+        lineas.append(f"   Distancia: {dist:.2f} km")
+        lineas.append("")
+    return "\n".join(lineas)
+
+
+def formatear_camino(grafo, origen, destino, resultado):
+    """Detalle del resultado de camino_minimo / camino_punto_a_punto; grafo es un GrafoAeropuertos"""
+    for codigo in (origen, destino):
+        if codigo not in grafo.aeropuertos:
+            return f"Aeropuerto {codigo} no encontrado"
+    distancia, camino, asentados = resultado
+    if distancia == float('inf'):
+        return f"No hay camino entre {origen} y {destino}"
+
+    lineas = [f"\n--- CAMINO MÍNIMO: {origen} → {destino} ---",
+              f"Distancia total: {distancia:.2f} km",
+              f"Ruta: {' → '.join(camino)}",
+              f"Aeropuertos explorados: {asentados}",
+              "\nDetalles del camino:"]
+    for i, aeropuerto in enumerate(camino):
+        info = grafo.aeropuertos[aeropuerto]
+        lineas.append(f"{i+1}. {aeropuerto} - {info['nombre']}")
+        lineas.append(f"   Ciudad: {info['ciudad']}, País: {info['pais']}")
+        lineas.append(f"   Coordenadas: ({info['latitud']}, {info['longitud']})")
+        if i < len(camino) - 1:
+            siguiente = camino[i+1]
+            lineas.append(f"   → Siguiente: {siguiente} ({grafo.grafo[aeropuerto][siguiente]} km)")
+        lineas.append("")
+    return "\n".join(lineas)
@@ -1,14 +1,52 @@
 import pandas as pd
+import numpy as np
 import heapq
 import math
+import os, sys, json, hashlib, contextlib
 from collections import deque
+from grafo_csr import GrafoCSR
+from cache_dijkstra import CacheDijkstra
+from caminos_paralelos import dijkstra_lote
+from conjuntos_disjuntos import ConjuntosDisjuntos
+from arbol_expansion import aristas_unicas, kruskal, boruvka
+from indice_espacial import IndiceEspacial
+from indice_busqueda import IndiceBusqueda
+from jerarquia_contraccion import JerarquiaContraccion
+from tabla_aeropuertos import TablaAeropuertos
+from bosque_dinamico import BosqueDinamico, lado_menor
+from busqueda_escalas import bellman_ford_acotado, bellman_ford_lote, frente_pareto, reconstruir
+import instrumentacion
+
+VERSION_SNAPSHOT = 1  # subirla cuando cambie el formato de los archivos del snapshot
+
+COLUMNAS_ORIGEN = ['Source Airport Code', 'Source Airport Name', 'Source Airport City',
+                   'Source Airport Country', 'Source Airport Latitude', 'Source Airport Longitude']
+COLUMNAS_DESTINO = ['Destination Airport Code', 'Destination Airport Name', 'Destination Airport City',
+                    'Destination Airport Country', 'Destination Airport Latitude', 'Destination Airport Longitude']
+# Solo se leen estas columnas; las coordenadas quedan en float64 para que las distancias no cambien
+TIPOS_CSV = {c: (float if 'Latitude' in c or 'Longitude' in c else str) for c in COLUMNAS_ORIGEN + COLUMNAS_DESTINO}
+ACCIONES_DELTA = ('agregar', 'quitar', 'distancia')  # columna Accion del CSV de cambios (aplicar_delta)
 
 class GrafoAeropuertos:
     def __init__(self):
-        self.aeropuertos = {}  # {codigo: {nombre, ciudad, pais, latitud, longitud}}
-        self.grafo = {}        # {codigo: {codigo_vecino: distancia}}
+        self.aeropuertos = TablaAeropuertos()  # {codigo: {nombre, ciudad, pais, latitud, longitud}} por columnas
+        self._grafo = {}       # {codigo: {codigo_vecino: distancia}}; None si todavía está solo en el CSR (ver grafo)
+        self.usar_csr = False  # si es True los recorridos usan la copia compacta en CSR
+        self._csr = None
+        self._factor_heuristica = None  # escala que hace consistente la heurística de A*
+        self._radianes = None  # (latitudes, cosenos de latitud, longitudes) en radianes, listas por id, para A*
+        self.cache_dijkstra = CacheDijkstra()  # resultados de dijkstra por origen
+        self.componentes_uf = ConjuntosDisjuntos()  # componentes conexas, se actualiza al agregar aristas
+        self._componentes = None  # listas de componentes armadas desde el union-find
+        self._bosque = None  # BosqueDinamico del último bosque_expansion_minima, se mantiene con cada cambio
+        self.motor_mst = 'kruskal'  # 'kruskal', 'boruvka' o 'prim' para bosque_expansion_minima
+        self._indice = None  # IndiceEspacial sobre las coordenadas de los aeropuertos
+        self._busqueda = None  # IndiceBusqueda por código, nombre, ciudad y país
+        self._jerarquia = None  # JerarquiaContraccion para el modo 'ch' de camino_punto_a_punto
+        self._ruta_snapshot = None  # snapshot que corresponde al grafo actual (ahí se guarda la jerarquía)
+        self.version = 0  # aumenta cada vez que cambia el grafo, para invalidar cachés externas (interfaz)
     
-    def calcular_distancia(self, lat1, lon1, lat2, lon2):
+    def calcular_distancia(self, lat1, lon1, lat2, lon2, redondear=True):
         """Calcula distancia en km entre dos coordenadas usando fórmula haversine"""
         R = 6371.0  # Radio de la Tierra en km
         
@@ -24,95 +62,525 @@ class GrafoAeropuertos:
         c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
         
         distancia = R * c
-        return round(distancia, 2)
+        return round(distancia, 2) if redondear else distancia
     
-    def cargar_datos(self, ruta_csv):
-        """Construye el grafo no dirigido y ponderado"""
+    @property
+    def grafo(self):
+        """Adyacencia {codigo: {codigo_vecino: distancia}}.
+
+        Después de cargar un snapshot el grafo está solo en el CSR mapeado en memoria; el dict se
+        arma recién la primera vez que algo lo pide (los recorridos con usar_csr no lo necesitan).
+        """
+        if self._grafo is None:
+            self._grafo = self._csr.a_dict()
+        return self._grafo
+
+    @grafo.setter
+    def grafo(self, grafo):
+        self._grafo = grafo
+
+    def _soltar_csr(self):
+        """Descarta el CSR, armando antes el dict si el grafo todavía estaba solo ahí"""
+        if self._grafo is None:
+            self._grafo = self._csr.a_dict()
+        self._csr = None
+
+    def activar_csr(self, activo=True):
+        """Activa o desactiva el backend CSR para dijkstra, es_conexo y prim_mst"""
+        self.usar_csr = activo
+        if not activo:
+            self._soltar_csr()
+
+    def csr(self):
+        """Devuelve la copia CSR del grafo, construyéndola si hace falta"""
+        if self._csr is None:
+            self._csr = GrafoCSR.desde_dict(self.grafo)
+        return self._csr
+
+    def calcular_distancias(self, lat1, lon1, lat2, lon2, redondear=True):
+        """Versión vectorizada de calcular_distancia: recibe arreglos y devuelve la lista de distancias
+        (sin redondear, el arreglo de NumPy)"""
+        R = 6371.0
+
+        lat1_rad = np.radians(np.asarray(lat1, dtype=float))
+        lon1_rad = np.radians(np.asarray(lon1, dtype=float))
+        lat2_rad = np.radians(np.asarray(lat2, dtype=float))
+        lon2_rad = np.radians(np.asarray(lon2, dtype=float))
+
+        dlat = lat2_rad - lat1_rad
+        dlon = lon2_rad - lon1_rad
+
+        a = np.sin(dlat/2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon/2)**2
+        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+
+        if not redondear:
+            return R * c
+        # round() de Python para redondear exactamente igual que calcular_distancia
+        return [round(d, 2) for d in (R * c).tolist()]
+
+    def _invalidar_derivados(self):
+        """Descarta todo lo que se calculó a partir del grafo anterior"""
+        self.version += 1
+        self._soltar_csr()
+        self._factor_heuristica = None
+        self._radianes = None
+        self.cache_dijkstra.limpiar()
+        self._componentes = None
+        self._indice = None
+        self._busqueda = None
+        self._jerarquia = None
+        self._ruta_snapshot = None
+        self._bosque = None
+
+    # ====== CAMBIOS INCREMENTALES ======
+    def _tras_cambio(self):
+        """Después de un cambio incremental: se descarta solo lo que se rehace barato al pedirlo
+        (CSR, listas de componentes, jerarquía); la caché de Dijkstra, el union-find y el bosque
+        de expansión mínima ya se corrigieron en el lugar."""
+        self.version += 1
+        self._soltar_csr()
+        self._componentes = None
+        self._jerarquia = None
+        self._ruta_snapshot = None
+
+    def agregar_aeropuerto(self, codigo, nombre, ciudad, pais, latitud, longitud):
+        """Agrega un aeropuerto todavía sin rutas (o actualiza sus datos si ya existe)"""
+        nuevo = codigo not in self.aeropuertos
+        self.aeropuertos.agregar(codigo, nombre, ciudad, pais, latitud, longitud)
+        codigo = self.aeropuertos.codigos[self.aeropuertos.ids[codigo]]  # el código internado
+        if nuevo:
+            self.grafo[codigo] = {}
+            self.componentes_uf.agregar(codigo)
+            self.cache_dijkstra.vertice_agregado(codigo)
+            if self._busqueda is not None:
+                self._busqueda.agregar(self.aeropuertos.ids[codigo], codigo, nombre, ciudad, pais)
+        else:
+            self._busqueda = None  # cambiaron los textos de un aeropuerto ya indexado
+        self._indice = None
+        self._factor_heuristica = None  # con otras coordenadas la cota de A* puede cambiar
+        self._radianes = None
+        self._tras_cambio()
+
+    def quitar_aeropuerto(self, codigo):
+        """Quita un aeropuerto con todas sus rutas.
+
+        La tabla corre en uno los ids de los aeropuertos que vienen después, así que se descarta
+        todo lo indexado por id (CSR, índices espacial y de búsqueda, coordenadas de A*) y se
+        rehacen las componentes; es una operación rara, no incremental.
+        """
+        if codigo not in self.aeropuertos:
+            raise KeyError(f"Aeropuerto {codigo} no encontrado")
+        grafo = self.grafo
+        for vecino in grafo.pop(codigo, {}):
+            grafo[vecino].pop(codigo, None)
+        self.aeropuertos.quitar(codigo)
+        self._invalidar_derivados()
+
+        self.componentes_uf = ConjuntosDisjuntos()
+        for u in grafo:
+            self.componentes_uf.agregar(u)
+        for u, vecinos in grafo.items():
+            for v in vecinos:
+                self.componentes_uf.unir(u, v)
+
+    def agregar_arista(self, origen, destino, distancia=None):
+        """Agrega (o reemplaza) una ruta no dirigida entre dos aeropuertos ya cargados.
+
+        Sin distancia se usa la geodésica. Las componentes, el bosque de expansión mínima y los
+        árboles de Dijkstra en caché se actualizan en vez de recalcularse.
+        """
+        for codigo in (origen, destino):
+            if codigo not in self.aeropuertos:
+                raise KeyError(f"Aeropuerto {codigo} no encontrado")
+        if distancia is None:
+            a, b = self.aeropuertos[origen], self.aeropuertos[destino]
+            distancia = self.calcular_distancia(a['latitud'], a['longitud'], b['latitud'], b['longitud'])
+
+        anterior = self.grafo[origen].get(destino)
+        self.grafo[origen][destino] = distancia
+        self.grafo[destino][origen] = distancia
+        self.componentes_uf.unir(origen, destino)
+        self._arista_cambiada(origen, destino, anterior)
+
+    def cambiar_distancia(self, origen, destino, distancia=None):
+        """Cambia el peso de una ruta existente (sin distancia, la recalcula con las coordenadas)"""
+        if destino not in self.grafo.get(origen, {}):
+            raise KeyError(f"No hay ruta entre {origen} y {destino}")
+        self.agregar_arista(origen, destino, distancia)
+
+    def quitar_arista(self, origen, destino):
+        """Quita una ruta; si era la última conexión entre dos partes de la red, la componente se parte"""
+        if destino not in self.grafo.get(origen, {}):
+            raise KeyError(f"No hay ruta entre {origen} y {destino}")
+        anterior = self.grafo[origen].pop(destino)
+        self.grafo[destino].pop(origen, None)
+        self._arista_cambiada(origen, destino, anterior)
+
+    def _arista_cambiada(self, u, v, anterior):
+        """Propaga el cambio de u–v (anterior: peso previo o None si es nueva) a lo que se mantiene"""
+        peso = self.grafo[u].get(v)
+        self.cache_dijkstra.arista_actualizada(self.grafo, u, v, anterior)
+
+        separado = None
+        if self._bosque is not None:
+            if peso is None:
+                separado = self._bosque.arista_quitada(u, v, self.grafo)
+            else:
+                self._bosque.arista_actualizada(u, v, self.grafo)
+        elif peso is None:
+            separado = lado_menor(self.grafo, u, v)
+        if separado is not None:
+            # Un union-find no sabe partir: se rehace solo la componente afectada
+            otro = v if u in separado else u
+            resto = {otro}
+            pila = [otro]
+            while pila:
+                for y in self.grafo[pila.pop()]:
+                    if y not in resto:
+                        resto.add(y)
+                        pila.append(y)
+            self.componentes_uf.separar(separado, resto)
+
+        # La cota de A* sigue valiendo si la arista se encarece; si se abarata puede tener que bajar
+        if peso is not None and self._factor_heuristica is not None:
+            a, b = self.aeropuertos[u], self.aeropuertos[v]
+            geodesica = self.calcular_distancia(a['latitud'], a['longitud'], b['latitud'], b['longitud'], redondear=False)
+            if geodesica > 0:
+                self._factor_heuristica = min(self._factor_heuristica, max(0.0, peso / geodesica * (1 - 1e-9)))
+        if self._busqueda is not None and (anterior is None or peso is None):
+            ids = self.aeropuertos.ids
+            for c in (u, v):
+                self._busqueda.cambiar_importancia(ids[c], len(self.grafo[c]))
+        self._tras_cambio()
+
+    @instrumentacion.medir('aplicar_delta')
+    def aplicar_delta(self, ruta_csv):
+        """Aplica un CSV de cambios de rutas sin reconstruir el grafo.
+
+        Columnas: Accion ('agregar', 'quitar' o 'distancia'), Source Airport Code, Destination
+        Airport Code y opcionalmente Distancia (vacía: la geodésica). Si además trae las columnas
+        del CSV de rutas, 'agregar' puede dar de alta aeropuertos nuevos. Las filas que no se
+        pueden aplicar se saltean. Devuelve {'agregadas', 'quitadas', 'cambiadas',
+        'aeropuertos_nuevos', 'omitidas': [(linea, motivo)]}.
+        """
+        df = pd.read_csv(ruta_csv, dtype=dict(TIPOS_CSV, Accion=str))
+        if 'Accion' not in df.columns:
+            raise ValueError("El CSV de cambios no tiene la columna Accion")
+        acciones = df['Accion'].fillna('').str.strip().str.lower().tolist()
+        desconocidas = sorted(set(acciones) - set(ACCIONES_DELTA))
+        if desconocidas:
+            raise ValueError(f"Acciones desconocidas en el CSV de cambios: {', '.join(desconocidas)}")
+        distancias = df['Distancia'].tolist() if 'Distancia' in df.columns else [float('nan')] * len(df)
+        if all(c in df.columns for c in COLUMNAS_ORIGEN + COLUMNAS_DESTINO):
+            datos_origen, datos_destino = df[COLUMNAS_ORIGEN].values.tolist(), df[COLUMNAS_DESTINO].values.tolist()
+        else:
+            datos_origen = datos_destino = None
+
+        resumen = {'agregadas': 0, 'quitadas': 0, 'cambiadas': 0, 'aeropuertos_nuevos': 0, 'omitidas': []}
+        filas = zip(acciones, df['Source Airport Code'].tolist(), df['Destination Airport Code'].tolist(), distancias)
+        for i, (accion, origen, destino, distancia) in enumerate(filas):
+            distancia = None if pd.isna(distancia) else float(distancia)
+            if accion == 'agregar' and datos_origen is not None:
+                for codigo, datos in ((origen, datos_origen[i]), (destino, datos_destino[i])):
+                    if isinstance(codigo, str) and codigo not in self.aeropuertos:
+                        self.agregar_aeropuerto(*datos)
+                        resumen['aeropuertos_nuevos'] += 1
+            try:
+                if accion == 'agregar':
+                    self.agregar_arista(origen, destino, distancia)
+                    resumen['agregadas'] += 1
+                elif accion == 'quitar':
+                    self.quitar_arista(origen, destino)
+                    resumen['quitadas'] += 1
+                else:
+                    self.cambiar_distancia(origen, destino, distancia)
+                    resumen['cambiadas'] += 1
+            except KeyError as e:
+                resumen['omitidas'].append((i + 2, e.args[0]))  # línea del CSV (la 1 es el encabezado)
+        return resumen
+
+    @instrumentacion.medir('cargar_datos')
+    def cargar_datos(self, ruta_csv, vectorizado=True, usar_snapshot=False, filas_por_bloque=100_000):
+        """Construye el grafo no dirigido y ponderado.
+
+        La carga vectorizada lee el CSV de a filas_por_bloque filas y va agregando cada bloque al
+        grafo, así la memoria máxima queda cerca del tamaño del grafo final y no del archivo
+        (None lee todo de una vez). El resultado es el mismo que cargando el archivo entero.
+        """
         try:
-            df = pd.read_csv(ruta_csv)
-            print(f"CSV cargado: {len(df)} registros")
-            
-            # Inicializar estructura del grafo
-            for _, fila in df.iterrows():
-                origen = fila['Source Airport Code']
-                destino = fila['Destination Airport Code']
-                
-                # Agregar aeropuertos al diccionario
-                if origen not in self.aeropuertos:
-                    self.aeropuertos[origen] = {
-                        'nombre': fila['Source Airport Name'],
-                        'ciudad': fila['Source Airport City'],
-                        'pais': fila['Source Airport Country'],
-                        'latitud': fila['Source Airport Latitude'],
-                        'longitud': fila['Source Airport Longitude']
-                    }
-                    self.grafo[origen] = {}
-                
-                if destino not in self.aeropuertos:
-                    self.aeropuertos[destino] = {
-                        'nombre': fila['Destination Airport Name'],
-                        'ciudad': fila['Destination Airport City'],
-                        'pais': fila['Destination Airport Country'],
-                        'latitud': fila['Destination Airport Latitude'],
-                        'longitud': fila['Destination Airport Longitude']
-                    }
-                    self.grafo[destino] = {}
-                
-                # Calcular distancia y agregar arista no dirigida
-                lat1 = fila['Source Airport Latitude']
-                lon1 = fila['Source Airport Longitude']
-                lat2 = fila['Destination Airport Latitude']
-                lon2 = fila['Destination Airport Longitude']
-                
-                distancia = self.calcular_distancia(lat1, lon1, lat2, lon2)
-                
-                # Grafo no dirigido - conexión bidireccional
-                self.grafo[origen][destino] = distancia
-                self.grafo[destino][origen] = distancia
-            
-            print(f"Grafo construido: {len(self.aeropuertos)} vértices, {sum(len(vecinos) for vecinos in self.grafo.values())//2} aristas")
+            ruta_snapshot = os.path.splitext(ruta_csv)[0] + '.snapshot'
+            if usar_snapshot and not self.grafo and self.cargar_snapshot(ruta_snapshot, ruta_csv):
+                print(f"Snapshot cargado: {ruta_snapshot}")
+                print(f"Grafo construido: {len(self.aeropuertos)} vértices, {len(self._csr.indices)//2} aristas")
+                self._ruta_snapshot = ruta_snapshot
+                instrumentacion.anotar(snapshot=True)
+                return True
+
+            if vectorizado:
+                registros = 0
+                for bloque in self._leer_bloques(ruta_csv, filas_por_bloque):
+                    with instrumentacion.tramo('construir_bloque', filas=len(bloque)):
+                        self._construir_vectorizado(bloque)
+                    registros += len(bloque)
+                print(f"CSV cargado: {registros} registros")
+            else:
+                df = pd.read_csv(ruta_csv)
+                registros = len(df)
+                print(f"CSV cargado: {len(df)} registros")
+                self._construir_por_filas(df)
+            self._invalidar_derivados()
+
+            aristas = sum(len(vecinos) for vecinos in self.grafo.values()) // 2
+            instrumentacion.contar(registros=registros, aeropuertos=len(self.aeropuertos), aristas=aristas)
+            print(f"Grafo construido: {len(self.aeropuertos)} vértices, {aristas} aristas")
+
+            if usar_snapshot:
+                try:
+                    self.guardar_snapshot(ruta_snapshot, ruta_csv)
+                    self._ruta_snapshot = ruta_snapshot
+                except OSError as e:
+                    print(f"No se pudo guardar el snapshot: {e}")
             return True
-            
+
         except Exception as e:
             print(f"Error: {e}")
             return False
-    
+
+    def _huella_csv(self, ruta_csv, con_hash=True):
+        """Tamaño, fecha de modificación y hash del CSV para saber si un snapshot sigue vigente"""
+        info = os.stat(ruta_csv)
+        huella = {'tamano': info.st_size, 'mtime_ns': info.st_mtime_ns}
+        if con_hash:
+            sha = hashlib.sha256()
+            with open(ruta_csv, 'rb') as f:
+                for bloque in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(bloque)
+            huella['sha256'] = sha.hexdigest()
+        return huella
+
+    @instrumentacion.medir('guardar_snapshot')
+    def guardar_snapshot(self, ruta_snapshot, ruta_csv):
+        """Guarda el grafo en binario (.npy + tabla de aeropuertos en JSON) junto con la huella del CSV"""
+        os.makedirs(ruta_snapshot, exist_ok=True)
+        csr = self.csr()
+        codigos = csr.codigos
+        tabla = self.aeropuertos
+        ids = [tabla.ids[c] for c in codigos]
+        latitudes, longitudes = tabla.coordenadas(codigos)
+
+        np.save(os.path.join(ruta_snapshot, 'indptr.npy'), csr.indptr)
+        np.save(os.path.join(ruta_snapshot, 'indices.npy'), csr.indices)
+        np.save(os.path.join(ruta_snapshot, 'pesos.npy'), csr.pesos)
+        np.save(os.path.join(ruta_snapshot, 'latitudes.npy'), latitudes)
+        np.save(os.path.join(ruta_snapshot, 'longitudes.npy'), longitudes)
+        # Una jerarquía de un CSV anterior ya no sirve
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(ruta_snapshot, 'jerarquia.json'))
+
+        meta = {
+            'version': VERSION_SNAPSHOT,
+            'csv': self._huella_csv(ruta_csv),
+            'codigos': codigos,
+            'nombres': [tabla.nombres[i] for i in ids],
+            'ciudades': [tabla.ciudades[i] for i in ids],
+            'paises': [tabla.paises[i] for i in ids],
+        }
+        # meta.json se escribe al final: si falta, el snapshot quedó a medias y no se usa
+        self._escribir_meta(ruta_snapshot, meta)
+
+    def _escribir_meta(self, ruta_snapshot, meta):
+        temporal = os.path.join(ruta_snapshot, 'meta.json.tmp')
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(temporal, os.path.join(ruta_snapshot, 'meta.json'))
+
+    def snapshot_vigente(self, ruta_snapshot, ruta_csv):
+        """Devuelve el meta del snapshot si corresponde a la versión y al CSV actuales, si no None"""
+        try:
+            with open(os.path.join(ruta_snapshot, 'meta.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('version') != VERSION_SNAPSHOT:
+            return None
+
+        guardada = meta['csv']
+        actual = self._huella_csv(ruta_csv, con_hash=False)
+        if actual['tamano'] != guardada['tamano']:
+            return None
+        # Misma fecha y tamaño: no hace falta leer el archivo; si solo cambió la fecha se compara el hash
+        if actual['mtime_ns'] != guardada['mtime_ns']:
+            if self._huella_csv(ruta_csv)['sha256'] != guardada['sha256']:
+                return None
+            # Mismo contenido con otra fecha (touch, checkout, copia): se guarda la fecha nueva para
+            # que los próximos arranques vuelvan a la comparación rápida sin leer todo el CSV
+            guardada['mtime_ns'] = actual['mtime_ns']
+            try:
+                self._escribir_meta(ruta_snapshot, meta)
+            except OSError:
+                pass  # snapshot en una carpeta de solo lectura: sigue valiendo, solo se vuelve a hashear
+        return meta
+
+    @instrumentacion.medir('cargar_snapshot')
+    def cargar_snapshot(self, ruta_snapshot, ruta_csv):
+        """Carga el grafo desde un snapshot vigente.
+
+        Las aristas quedan en el CSR mapeado en memoria (mmap) y el dict de adyacencia se arma
+        recién cuando se pide (ver grafo); las coordenadas sí se copian a la tabla, que es O(V).
+        """
+        meta = self.snapshot_vigente(ruta_snapshot, ruta_csv)
+        if meta is None:
+            return False
+
+        cargar = lambda nombre: np.load(os.path.join(ruta_snapshot, nombre + '.npy'), mmap_mode='r')
+        self.aeropuertos = TablaAeropuertos.desde_columnas(meta['codigos'], meta['nombres'], meta['ciudades'],
+                                                           meta['paises'], cargar('latitudes'), cargar('longitudes'))
+        self.grafo = {}  # el grafo anterior se reemplaza: no hace falta armarlo al invalidar
+        self._invalidar_derivados()
+        self._csr = GrafoCSR(self.aeropuertos.codigos, cargar('indptr'), cargar('indices'), cargar('pesos'))
+        self.grafo = None
+
+        self.componentes_uf = ConjuntosDisjuntos()
+        for componente in self._csr.componentes():
+            primero = self._csr.codigos[componente[0]]
+            self.componentes_uf.agregar(primero)
+            for i in componente[1:]:
+                self.componentes_uf.agregar(self._csr.codigos[i])
+                self.componentes_uf.unir(primero, self._csr.codigos[i])
+        return True
+
+    @instrumentacion.medir('construir_por_filas')
+    def _construir_por_filas(self, df):
+        """Carga original fila por fila con iterrows (se deja para comparar con la vectorizada)"""
+        for _, fila in df.iterrows():
+            origen = fila['Source Airport Code']
+            destino = fila['Destination Airport Code']
+
+            # Agregar aeropuertos al diccionario
+            if origen not in self.aeropuertos:
+                self.aeropuertos[origen] = {
+                    'nombre': fila['Source Airport Name'],
+                    'ciudad': fila['Source Airport City'],
+                    'pais': fila['Source Airport Country'],
+                    'latitud': fila['Source Airport Latitude'],
+                    'longitud': fila['Source Airport Longitude']
+                }
+                self.grafo[origen] = {}
+                self.componentes_uf.agregar(origen)
+
+            if destino not in self.aeropuertos:
+                self.aeropuertos[destino] = {
+                    'nombre': fila['Destination Airport Name'],
+                    'ciudad': fila['Destination Airport City'],
+                    'pais': fila['Destination Airport Country'],
+                    'latitud': fila['Destination Airport Latitude'],
+                    'longitud': fila['Destination Airport Longitude']
+                }
+                self.grafo[destino] = {}
+                self.componentes_uf.agregar(destino)
+
+            # Calcular distancia y agregar arista no dirigida
+            lat1 = fila['Source Airport Latitude']
+            lon1 = fila['Source Airport Longitude']
+            lat2 = fila['Destination Airport Latitude']
+            lon2 = fila['Destination Airport Longitude']
+
+            distancia = self.calcular_distancia(lat1, lon1, lat2, lon2)
+
+            # Grafo no dirigido - conexión bidireccional
+            self.grafo[origen][destino] = distancia
+            self.grafo[destino][origen] = distancia
+            self.componentes_uf.unir(origen, destino)
+        instrumentacion.contar(distancias=len(df))
+
+    def _leer_bloques(self, ruta_csv, filas_por_bloque):
+        """DataFrames sucesivos del CSV con solo las columnas que usa el grafo"""
+        lector = pd.read_csv(ruta_csv, usecols=list(TIPOS_CSV), dtype=TIPOS_CSV, chunksize=filas_por_bloque)
+        if filas_por_bloque is None:
+            yield lector
+            return
+        with lector:
+            yield from lector
+
+    def _construir_vectorizado(self, df):
+        """Carga en bloque: aeropuertos con drop_duplicates y todas las distancias en una pasada de NumPy.
+
+        Se puede llamar con bloques sucesivos del mismo CSV: los aeropuertos ya vistos se saltean
+        y las rutas repetidas conservan el orden de la primera aparición y el peso de la última.
+        """
+        campos = ['codigo', 'nombre', 'ciudad', 'pais', 'latitud', 'longitud']
+        columnas_origen, columnas_destino = COLUMNAS_ORIGEN, COLUMNAS_DESTINO
+        intern = sys.intern
+        tabla = self.aeropuertos
+
+        # Intercalar origen y destino de cada fila para respetar el orden de aparición del iterrows
+        n = len(df)
+        if n == 0:
+            return
+        origenes = df[columnas_origen].set_axis(campos, axis=1).set_axis(np.arange(0, 2*n, 2))
+        destinos = df[columnas_destino].set_axis(campos, axis=1).set_axis(np.arange(1, 2*n, 2))
+        todos = pd.concat([origenes, destinos]).sort_index(kind='stable')
+        nuevos = todos.drop_duplicates(subset='codigo', keep='first')
+        nuevos = nuevos[~nuevos['codigo'].isin(tabla.codigos)]
+
+        # La tabla interna los textos: cada código, ciudad o país repetido queda una sola vez en memoria
+        primero = len(tabla)
+        tabla.agregar_lote(nuevos['codigo'].tolist(), nuevos['nombre'].tolist(), nuevos['ciudad'].tolist(),
+                           nuevos['pais'].tolist(), nuevos['latitud'].to_numpy(dtype=float),
+                           nuevos['longitud'].to_numpy(dtype=float))
+        for codigo in tabla.codigos[primero:]:
+            self.grafo[codigo] = {}
+            self.componentes_uf.agregar(codigo)
+
+        # Entre filas repetidas de la misma ruta (en cualquier sentido) solo importan la primera,
+        # que fija el orden de los vecinos, y la última, que deja el peso final
+        ids, unicos = pd.factorize(pd.concat([df['Source Airport Code'], df['Destination Airport Code']], ignore_index=True),
+                                   use_na_sentinel=False)
+        id_origen, id_destino = ids[:n], ids[n:]
+        par = pd.Series(np.minimum(id_origen, id_destino) * (ids.max() + 1) + np.maximum(id_origen, id_destino))
+        quedan = (~par.duplicated(keep='first') | ~par.duplicated(keep='last')).to_numpy()
+        rutas = df[quedan]
+
+        # Todas las distancias de una vez
+        distancias = self.calcular_distancias(rutas['Source Airport Latitude'].to_numpy(),
+                                              rutas['Source Airport Longitude'].to_numpy(),
+                                              rutas['Destination Airport Latitude'].to_numpy(),
+                                              rutas['Destination Airport Longitude'].to_numpy())
+        instrumentacion.contar(distancias=len(distancias))
+
+        # Los códigos se internan una vez por código distinto, no por fila
+        unicos = [intern(c) if isinstance(c, str) else c for c in unicos.tolist()]
+        origenes = [unicos[i] for i in id_origen[quedan].tolist()]
+        destinos = [unicos[i] for i in id_destino[quedan].tolist()]
+
+        # Grafo no dirigido - conexión bidireccional
+        grafo = self.grafo
+        unir = self.componentes_uf.unir
+        for origen, destino, distancia in zip(origenes, destinos, distancias):
+            vecinos = grafo[origen]
+            if destino not in vecinos:  # una ruta repetida no cambia las componentes
+                unir(origen, destino)
+            vecinos[destino] = distancia
+            grafo[destino][origen] = distancia
+
+    def componentes_conexas(self):
+        """Componentes desde el índice union-find, cada una en el orden del grafo"""
+        if self._componentes is None:
+            self._componentes = self.componentes_uf.agrupar(self.grafo)
+        return self._componentes
+
+    def componente_de(self, codigo):
+        """Representante de la componente de un aeropuerto, en O(α(n))"""
+        return self.componentes_uf.encontrar(codigo)
+
+    @instrumentacion.medir('es_conexo')
     def es_conexo(self):
         """Determina si el grafo es conexo y encuentra componentes conexas"""
-        visitados = set()
-        componentes = []
-        
-        for aeropuerto in self.grafo:
-            if aeropuerto not in visitados:
-                # BFS para encontrar componente conexa
-                componente = []
-                cola = deque([aeropuerto])
-                visitados.add(aeropuerto)
-                
-                while cola:
-                    actual = cola.popleft()
-                    componente.append(actual)
-                    
-                    for vecino in self.grafo[actual]:
-                        if vecino not in visitados:
-                            visitados.add(vecino)
-                            cola.append(vecino)
-                
-                componentes.append(componente)
-        
-        es_conexo = len(componentes) == 1
-        
-        print(f"\n--- CONEXIDAD DEL GRAFO ---")
-        print(f"¿Es conexo? {'SÍ' if es_conexo else 'NO'}")
-        print(f"Número de componentes conexas: {len(componentes)}")
-        
-        for i, comp in enumerate(componentes, 1):
-            print(f"Componente {i}: {len(comp)} aeropuertos")
-            if len(comp) <= 10:  # Mostrar solo si son pocos
-                print(f"  Aeropuertos: {comp}")
-        
-        return es_conexo, componentes
+        componentes = self.componentes_conexas()
+        instrumentacion.contar(componentes=len(componentes))
+        return len(componentes) == 1, componentes
     
+    @instrumentacion.medir('prim_mst')
     def prim_mst(self, componente=None):
         """Algoritmo de Prim para encontrar el árbol de expansión mínima""" #uso prim pq la vd me da ql pava entender los otros y yo me parcho
         if componente is None:
@@ -120,7 +588,13 @@ class GrafoAeropuertos:
         
         if not componente:
             return 0, []
+
+        if self.usar_csr:
+            csr = self.csr()
+            peso_total, aristas = csr.prim([csr.ids[c] for c in componente])
+            return peso_total, [(csr.codigos[u], csr.codigos[v], peso) for u, v, peso in aristas]
         
+        en_componente = set(componente)  # pertenencia en O(1) en vez de recorrer la lista
         visitados = set()
         heap = []
         peso_total = 0
@@ -132,8 +606,9 @@ class GrafoAeropuertos:
         
         # Agregar todas las aristas desde el inicio
         for vecino, peso in self.grafo[inicio].items():
-            if vecino in componente:
+            if vecino in en_componente:
                 heapq.heappush(heap, (peso, inicio, vecino))
+        empujes = len(heap)
         
         while heap and len(visitados) < len(componente):
             peso, u, v = heapq.heappop(heap)
@@ -145,32 +620,85 @@ class GrafoAeropuertos:
                 
                 # Agregar aristas del nuevo vértice
                 for vecino, peso_vecino in self.grafo[v].items():
-                    if vecino in componente and vecino not in visitados:
+                    if vecino in en_componente and vecino not in visitados:
                         heapq.heappush(heap, (peso_vecino, v, vecino))
+                        empujes += 1
         
+        if instrumentacion.activa():
+            instrumentacion.contar(asentados=len(visitados), empujes=empujes,
+                                   relajadas=sum(len(self.grafo[v]) for v in visitados))
         return peso_total, aristas_mst
+
+    @instrumentacion.medir('bosque_expansion_minima')
+    def bosque_expansion_minima(self, motor=None):
+        """Árbol de expansión mínima de todas las componentes en una sola pasada.
+
+        motor: 'kruskal', 'boruvka' o 'prim' (por defecto self.motor_mst). Devuelve una lista de
+        (peso_total, aristas) alineada con componentes_conexas(). El bosque queda guardado y los
+        cambios de rutas lo actualizan; sin motor explícito se devuelve ese sin recalcular.
+        """
+        componentes = self.componentes_conexas()
+        if motor is None and self._bosque is not None:
+            return self._bosque.por_componentes(componentes)
+        motor = motor or self.motor_mst
+        if motor == 'prim':
+            resultado = [self.prim_mst(comp) for comp in componentes]
+            self._bosque = BosqueDinamico(arista for _, aristas in resultado for arista in aristas)
+            return resultado
+        if motor not in ('kruskal', 'boruvka'):
+            raise ValueError(f"Motor de MST desconocido: {motor}")
+
+        csr = self.csr()
+        u, v, pesos = aristas_unicas(csr)
+        elegidas = (kruskal if motor == 'kruskal' else boruvka)(len(csr.codigos), u, v, pesos)
+
+        # Repartir las aristas del bosque entre las componentes
+        indice = {self.componentes_uf.encontrar(comp[0]): i for i, comp in enumerate(componentes)}
+        bosque = [[0, []] for _ in componentes]
+        codigos = csr.codigos
+        for a, b, peso in zip(u[elegidas].tolist(), v[elegidas].tolist(), pesos[elegidas].tolist()):
+            arbol = bosque[indice[self.componentes_uf.encontrar(codigos[a])]]
+            arbol[0] += peso
+            arbol[1].append((codigos[a], codigos[b], peso))
+        self._bosque = BosqueDinamico(arista for _, aristas in bosque for arista in aristas)
+        return [tuple(arbol) for arbol in bosque]
     
     def peso_arbol_expansion_minima(self):
-        """Calcula el peso del árbol de expansión mínima para cada componente"""
-        _, componentes = self.es_conexo()
-        
-        print(f"\n--- ÁRBOL DE EXPANSIÓN MÍNIMA ---")
-        
-        for i, comp in enumerate(componentes, 1):
-            peso, aristas = self.prim_mst(comp)
-            print(f"Componente {i} ({len(comp)} aeropuertos):")
-            print(f"  Peso total del MST: {peso:.2f} km")
-            print(f"  Número de aristas en MST: {len(aristas)}")
-        
-        return peso
+        """Peso total del árbol (bosque) de expansión mínima, sumando todas las componentes"""
+        return sum(peso for peso, _ in self.bosque_expansion_minima())
     
-    def dijkstra(self, origen):
-        """Algoritmo de Dijkstra para todos los caminos mínimos desde un vértice"""
+    def dijkstra(self, origen, usar_cache=True):
+        """Algoritmo de Dijkstra para todos los caminos mínimos desde un vértice.
+
+        Con usar_cache el resultado se comparte con otras consultas desde el mismo origen,
+        así que los diccionarios devueltos no se deben modificar (los cambios de rutas los
+        corrigen en el lugar).
+        """
+        if usar_cache:
+            resultado = self.cache_dijkstra.obtener(origen)
+            if resultado is None:
+                resultado = self.dijkstra(origen, usar_cache=False)
+                self.cache_dijkstra.guardar(origen, *resultado)
+            return resultado
+
+        with instrumentacion.tramo('dijkstra', origen=origen, csr=self.usar_csr):
+            return self._dijkstra(origen)
+
+    def _dijkstra(self, origen):
+        if self.usar_csr:
+            csr = self.csr()
+            dist, pred = csr.dijkstra(csr.ids[origen])
+            codigos = csr.codigos
+            distancias = dict(zip(codigos, dist))
+            predecesores = dict(zip(codigos, (codigos[p] if p >= 0 else None for p in pred)))
+            return distancias, predecesores
+
         distancias = {a: float('inf') for a in self.grafo}
         predecesores = {a: None for a in self.grafo}
         distancias[origen] = 0
         
         heap = [(0, origen)]
+        empujes = 1
         
         while heap:
             dist_actual, actual = heapq.heappop(heap)
@@ -184,75 +712,457 @@ class GrafoAeropuertos:
                     distancias[vecino] = nueva_dist
                     predecesores[vecino] = actual
                     heapq.heappush(heap, (nueva_dist, vecino))
+                    empujes += 1
         
+        if instrumentacion.activa():
+            # Se asientan todos los alcanzables y cada uno relaja todas sus aristas
+            alcanzados = [a for a, d in distancias.items() if d != float('inf')]
+            instrumentacion.contar(asentados=len(alcanzados), empujes=empujes,
+                                   relajadas=sum(len(self.grafo[a]) for a in alcanzados))
         return distancias, predecesores
     
-    def aeropuertos_mas_lejanos(self, codigo):
-        """Encuentra los 10 aeropuertos con caminos mínimos más largos"""
-        if codigo not in self.aeropuertos:
-            print(f" Aeropuerto {codigo} no encontrado")
-            return
-        
-        distancias, _ = self.dijkstra(codigo)
-        
-        # Filtrar aeropuertos alcanzables y ordenar por distancia
-        alcanzables = [(aero, dist) for aero, dist in distancias.items() 
-                      if dist != float('inf') and aero != codigo]
-        alcanzables.sort(key=lambda x: x[1], reverse=True)
-        
-        print(f"\n--- 10 AEROPUERTOS MÁS LEJANOS DESDE {codigo} ---")
-        print(f"Información de {codigo}:")
-        info = self.aeropuertos[codigo]
-        print(f"  Nombre: {info['nombre']}")
-        print(f"  Ciudad: {info['ciudad']}")
-        print(f"  País: {info['pais']}")
-        print(f"  Coordenadas: ({info['latitud']}, {info['longitud']})")
-        
-        print(f"\nAeropuertos más lejanos:")
-        for i, (aero, dist) in enumerate(alcanzables[:10], 1):
-            info_aero = self.aeropuertos[aero]
-            print(f"{i}. {aero} - {info_aero['nombre']}")
-            print(f"   Ciudad: {info_aero['ciudad']}, País: {info_aero['pais']}")
-            print(f"   Coordenadas: ({info_aero['latitud']}, {info_aero['longitud']})")
-            print(f"   Distancia: {dist:.2f} km")
-            print()
-    
-    def camino_minimo(self, origen, destino):
-        """Encuentra el camino mínimo entre dos aeropuertos"""
-        if origen not in self.aeropuertos:
-            print(f"Aeropuerto {origen} no encontrado")
-            return
-        if destino not in self.aeropuertos:
-            print(f"Aeropuerto {destino} no encontrado")
-            return
-        
-        distancias, predecesores = self.dijkstra(origen)
-        
-        if distancias[destino] == float('inf'):
-            print(f"No hay camino entre {origen} y {destino}")
-            return
-        
-        # Reconstruir camino
+    def dijkstra_multiple(self, origenes=None, procesos=None, resumen=False):
+        """Dijkstra desde muchos orígenes (todos por defecto) repartido en procesos.
+
+        Generador de (codigo, resultado): el arreglo de distancias alineado con self.csr().codigos,
+        o con resumen=True la tupla (excentricidad, suma de distancias, aeropuertos alcanzables).
+        """
+        csr = self.csr()
+        ids = [csr.ids[c] for c in origenes] if origenes is not None else list(range(len(csr.codigos)))
+        for i, resultado in dijkstra_lote(csr, ids, procesos, resumen):
+            yield csr.codigos[i], resultado
+
+    @instrumentacion.medir('metricas_red')
+    def metricas_red(self, procesos=None):
+        """Diámetro, excentricidad de cada aeropuerto y longitud media de los caminos mínimos.
+
+        Si el grafo no es conexo las medidas se toman dentro de la componente de cada aeropuerto.
+        """
+        excentricidades = {}
+        suma, pares = 0, 0
+        for codigo, (excentricidad, total, alcanzables) in self.dijkstra_multiple(procesos=procesos, resumen=True):
+            excentricidades[codigo] = excentricidad
+            suma += total
+            pares += alcanzables
+
+        return {
+            'diametro': max(excentricidades.values(), default=0),
+            'excentricidades': excentricidades,
+            'longitud_media': suma / pares if pares else 0,
+        }
+
+    @instrumentacion.medir('preparar_jerarquia')
+    def preparar_jerarquia(self, limite_testigo=25, grado_nucleo=None):
+        """Preprocesa la jerarquía de contracción (conviene llamarla después de cargar_datos).
+
+        Si el grafo vino de un snapshot, la jerarquía se guarda ahí y las próximas cargas del
+        mismo CSV la leen en vez de volver a contraer.
+        """
+        if self._jerarquia is None:
+            ruta = self._ruta_snapshot
+            if ruta is not None:
+                self._jerarquia = self._cargar_jerarquia(ruta)
+            if self._jerarquia is None:
+                self._jerarquia = JerarquiaContraccion(self.csr(), limite_testigo, grado_nucleo)
+                if ruta is not None:
+                    try:
+                        self._guardar_jerarquia(ruta)
+                    except OSError as e:
+                        print(f"No se pudo guardar la jerarquía: {e}")
+        return self._jerarquia
+
+    def _guardar_jerarquia(self, ruta_snapshot):
+        for nombre, arreglo in self._jerarquia.a_arreglos().items():
+            np.save(os.path.join(ruta_snapshot, f'jerarquia_{nombre}.npy'), arreglo)
+        # Como en guardar_snapshot, el JSON va al final y ata la jerarquía a la huella del CSV
+        with open(os.path.join(ruta_snapshot, 'meta.json'), encoding='utf-8') as f:
+            huella = json.load(f)['csv']
+        temporal = os.path.join(ruta_snapshot, 'jerarquia.json.tmp')
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'version': VERSION_SNAPSHOT, 'csv': huella}, f)
+        os.replace(temporal, os.path.join(ruta_snapshot, 'jerarquia.json'))
+
+    def _cargar_jerarquia(self, ruta_snapshot):
+        """JerarquiaContraccion guardada en el snapshot, o None si falta o es de otro CSV"""
+        try:
+            with open(os.path.join(ruta_snapshot, 'jerarquia.json'), encoding='utf-8') as f:
+                meta_jerarquia = json.load(f)
+            with open(os.path.join(ruta_snapshot, 'meta.json'), encoding='utf-8') as f:
+                huella = json.load(f)['csv']
+            # Se compara el contenido y no la fecha, que snapshot_vigente actualiza si el CSV solo se tocó
+            if (meta_jerarquia.get('version') != VERSION_SNAPSHOT
+                    or meta_jerarquia['csv']['sha256'] != huella['sha256']
+                    or meta_jerarquia['csv']['tamano'] != huella['tamano']):
+                return None
+            arreglos = {nombre: np.load(os.path.join(ruta_snapshot, f'jerarquia_{nombre}.npy'))
+                        for nombre in ('rango', 'indptr', 'vecinos', 'pesos', 'intermedios', 'datos')}
+        except (OSError, ValueError, KeyError):
+            return None
+        return JerarquiaContraccion.desde_arreglos(self.csr(), arreglos)
+
+    def _camino_jerarquia(self, origen, destino):
+        csr = self.csr()
+        _, ids, asentados = self.preparar_jerarquia().camino(csr.ids[origen], csr.ids[destino])
+        if not ids:
+            return float('inf'), [], asentados
+        camino = [csr.codigos[i] for i in ids]
+        # Sumar las aristas originales en orden, igual que Dijkstra (los atajos redondean distinto)
+        distancia = 0
+        for u, v in zip(camino, camino[1:]):
+            distancia += self.grafo[u][v]
+        return distancia, camino, asentados
+
+    def _coordenadas_radianes(self):
+        """Coordenadas de la tabla en radianes como listas por id (se arman una vez por grafo, no por consulta)"""
+        if self._radianes is None:
+            tabla = self.aeropuertos
+            latitudes = np.radians(tabla.latitudes)
+            self._radianes = (latitudes.tolist(), np.cos(latitudes).tolist(), np.radians(tabla.longitudes).tolist())
+        return self._radianes
+
+    def _heuristica_astar(self):
+        """Factor por el que se multiplica la distancia geodésica para que A* no sobreestime.
+
+        Los pesos están redondeados a 2 decimales, así que una arista puede medir un poco menos
+        que la distancia geodésica exacta; se toma el menor cociente peso/geodésica del grafo.
+        """
+        if self._factor_heuristica is None:
+            csr = self.csr()
+            lat, lon = self.aeropuertos.coordenadas(csr.codigos)
+            u = np.repeat(np.arange(len(csr.codigos)), np.diff(csr.indptr))
+            v = csr.indices
+
+            lat1, lon1, lat2, lon2 = np.radians(lat[u]), np.radians(lon[u]), np.radians(lat[v]), np.radians(lon[v])
+            a = np.sin((lat2 - lat1)/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1)/2)**2
+            geodesica = 6371.0 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+
+            validas = geodesica > 0
+            factor = 1.0
+            if validas.any():
+                factor = min(1.0, float(np.min(csr.pesos[validas] / geodesica[validas])))
+            # margen para las diferencias de redondeo entre math y NumPy
+            self._factor_heuristica = max(0.0, factor * (1 - 1e-9))
+        return self._factor_heuristica
+
+    @instrumentacion.medir('camino_punto_a_punto')
+    def camino_punto_a_punto(self, origen, destino, modo='astar'):
+        """Camino mínimo entre dos aeropuertos deteniendo la búsqueda al llegar al destino.
+
+        modo: 'dijkstra' (corta al asentar el destino), 'bidireccional', 'astar' o 'ch'
+        (jerarquía de contracción, se prepara la primera vez con preparar_jerarquia).
+        Devuelve (distancia, camino, asentados); sin camino la distancia es inf y el camino [].
+        """
+        if origen == destino:
+            return 0, [origen], 1
+        instrumentacion.anotar(modo=modo)
+
+        # Si ya hay un árbol de caminos mínimos desde alguno de los extremos, se reutiliza
+        for inicio, fin in ((origen, destino), (destino, origen)):
+            if inicio in self.cache_dijkstra:
+                instrumentacion.anotar(cache=True)
+                distancias, predecesores = self.cache_dijkstra.obtener(inicio)
+                if distancias[fin] == float('inf'):
+                    return float('inf'), [], 0
+                camino = []
+                actual = fin
+                while actual is not None:
+                    camino.append(actual)
+                    actual = predecesores[actual]
+                # El árbol va de fin hacia inicio; el grafo es no dirigido
+                return distancias[fin], camino[::-1] if inicio == origen else camino, 0
+
+        if modo == 'bidireccional':
+            return self._bidireccional(origen, destino)
+        if modo == 'ch':
+            resultado = self._camino_jerarquia(origen, destino)
+            instrumentacion.contar(asentados=resultado[2])
+            return resultado
+
+        heuristica = None
+        if modo == 'astar':
+            # Distancia en línea recta al destino, solo de los aeropuertos que la búsqueda alcanza (y una
+            # vez por aeropuerto): calcularla para todos haría cada consulta O(N) antes de empezar
+            ids = self.aeropuertos.ids
+            latitudes, cosenos, longitudes = self._coordenadas_radianes()
+            i = ids[destino]
+            lat_destino, cos_destino, lon_destino = latitudes[i], cosenos[i], longitudes[i]
+            escala = self._heuristica_astar() * 2 * 6371.0
+            cotas = {}
+
+            def heuristica(c):
+                cota = cotas.get(c)
+                if cota is None:
+                    j = ids[c]
+                    a = (math.sin((lat_destino - latitudes[j]) / 2) ** 2
+                         + cosenos[j] * cos_destino * math.sin((lon_destino - longitudes[j]) / 2) ** 2)
+                    cota = cotas[c] = escala * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+                return cota
+        elif modo != 'dijkstra':
+            raise ValueError(f"Modo de búsqueda desconocido: {modo}")
+
+        distancias = {origen: 0}
+        predecesores = {origen: None}
+        asentados = set()
+        heap = [(heuristica(origen) if heuristica else 0, 0, origen)]
+        empujes = 1
+
+        while heap:
+            _, dist_actual, actual = heapq.heappop(heap)
+
+            if actual in asentados or dist_actual > distancias[actual]:
+                continue
+            asentados.add(actual)
+            if actual == destino:
+                break
+
+            for vecino, peso in self.grafo[actual].items():
+                nueva_dist = dist_actual + peso
+                if nueva_dist < distancias.get(vecino, float('inf')):
+                    distancias[vecino] = nueva_dist
+                    predecesores[vecino] = actual
+                    prioridad = nueva_dist + heuristica(vecino) if heuristica else nueva_dist
+                    heapq.heappush(heap, (prioridad, nueva_dist, vecino))
+                    empujes += 1
+
+        if instrumentacion.activa():
+            # El destino se asienta pero no se expande
+            instrumentacion.contar(asentados=len(asentados), empujes=empujes,
+                                   relajadas=sum(len(self.grafo[a]) for a in asentados if a != destino))
+        if destino not in asentados:
+            return float('inf'), [], len(asentados)
+
         camino = []
         actual = destino
         while actual is not None:
             camino.append(actual)
             actual = predecesores[actual]
         camino.reverse()
+        return distancias[destino], camino, len(asentados)
+
+    def _bidireccional(self, origen, destino):
+        """Dijkstra bidireccional: avanza desde ambos extremos hasta que los frentes se cruzan"""
+        distancias = ({origen: 0}, {destino: 0})
+        predecesores = ({origen: None}, {destino: None})
+        asentados = (set(), set())
+        heaps = ([(0, origen)], [(0, destino)])
+        mejor, encuentro = float('inf'), None
+        empujes = 2
+
+        while heaps[0] and heaps[1]:
+            # Ningún camino por los frentes actuales puede mejorar el mejor encontrado
+            if heaps[0][0][0] + heaps[1][0][0] >= mejor:
+                break
+
+            lado = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            dist_lado, otro = distancias[lado], distancias[1 - lado]
+            dist_actual, actual = heapq.heappop(heaps[lado])
+
+            if actual in asentados[lado] or dist_actual > dist_lado[actual]:
+                continue
+            asentados[lado].add(actual)
+
+            for vecino, peso in self.grafo[actual].items():
+                nueva_dist = dist_actual + peso
+                if nueva_dist < dist_lado.get(vecino, float('inf')):
+                    dist_lado[vecino] = nueva_dist
+                    predecesores[lado][vecino] = actual
+                    heapq.heappush(heaps[lado], (nueva_dist, vecino))
+                    empujes += 1
+                if vecino in otro and dist_lado[vecino] + otro[vecino] < mejor:
+                    mejor, encuentro = dist_lado[vecino] + otro[vecino], vecino
+
+        n_asentados = len(asentados[0]) + len(asentados[1])
+        if instrumentacion.activa():
+            instrumentacion.contar(asentados=n_asentados, empujes=empujes,
+                                   relajadas=sum(len(self.grafo[a]) for lado in asentados for a in lado))
+        if encuentro is None:
+            return float('inf'), [], n_asentados
+
+        # Unir la mitad desde el origen con la mitad hacia el destino
+        camino = []
+        actual = encuentro
+        while actual is not None:
+            camino.append(actual)
+            actual = predecesores[0][actual]
+        camino.reverse()
+        actual = predecesores[1][encuentro]
+        while actual is not None:
+            camino.append(actual)
+            actual = predecesores[1][actual]
+        return mejor, camino, n_asentados
+
+    @instrumentacion.medir('aeropuertos_mas_lejanos')
+    def aeropuertos_mas_lejanos(self, codigo, k=10):
+        """Encuentra los k aeropuertos con caminos mínimos más largos: [(codigo, distancia)], o None si no existe"""
+        if codigo not in self.aeropuertos:
+            return None
         
-        print(f"\n--- CAMINO MÍNIMO: {origen} → {destino} ---")
-        print(f"Distancia total: {distancias[destino]:.2f} km")
-        print(f"Ruta: {' → '.join(camino)}")
+        distancias, _ = self.dijkstra(codigo)
         
-        print(f"\nDetalles del camino:")
-        for i, aeropuerto in enumerate(camino):
-            info = self.aeropuertos[aeropuerto]
-            print(f"{i+1}. {aeropuerto} - {info['nombre']}")
-            print(f"   Ciudad: {info['ciudad']}, País: {info['pais']}")
-            print(f"   Coordenadas: ({info['latitud']}, {info['longitud']})")
-            
-            if i < len(camino) - 1:
-                siguiente = camino[i+1]
-                distancia_etapa = self.grafo[aeropuerto][siguiente]
-                print(f"   → Siguiente: {siguiente} ({distancia_etapa} km)")
-            print()
+        # Selección parcial de los k alcanzables más lejanos (mismo orden que ordenar todo)
+        return heapq.nlargest(k, ((aero, dist) for aero, dist in distancias.items()
+                                  if dist != float('inf') and aero != codigo),
+                              key=lambda x: x[1])
+
+    @instrumentacion.medir('mas_lejanos_lote')
+    def mas_lejanos_lote(self, codigos, k=10, procesos=None):
+        """Los k aeropuertos más lejanos para muchos orígenes a la vez: {codigo: [(aeropuerto, distancia)]}"""
+        codigos = [c for c in codigos if c in self.aeropuertos]
+        resultado = {}
+        for codigo, distancias in self.dijkstra_multiple(codigos, procesos=procesos):
+            resultado[codigo] = self._k_mas_lejanos(distancias, self.csr().ids[codigo], k)
+        return resultado
+
+    def _k_mas_lejanos(self, distancias, origen, k):
+        """Top-k con argpartition sobre el arreglo de distancias; los empates quedan en el orden del grafo"""
+        candidatos = np.flatnonzero(np.isfinite(distancias))
+        candidatos = candidatos[candidatos != origen]
+        valores = distancias[candidatos]
+
+        if len(candidatos) > k > 0:
+            umbral = valores[np.argpartition(valores, -k)[-k]]
+            mayores = candidatos[valores > umbral]
+            empatados = candidatos[valores == umbral][:k - len(mayores)]
+            candidatos = np.concatenate([mayores, empatados])
+            valores = distancias[candidatos]
+        elif k <= 0:
+            return []
+
+        orden = np.lexsort((candidatos, -valores))
+        codigos = self.csr().codigos
+        return [(codigos[i], d) for i, d in zip(candidatos[orden].tolist(), valores[orden].tolist())]
+
+    def indice_espacial(self):
+        """Índice espacial de los aeropuertos, construido al pedirlo"""
+        if self._indice is None:
+            self._indice = IndiceEspacial.desde_aeropuertos(self.aeropuertos)
+        return self._indice
+
+    def indice_busqueda(self):
+        """Índice de búsqueda por texto, construido al pedirlo (la interfaz lo pide al cargar)"""
+        if self._busqueda is None:
+            tabla = self.aeropuertos
+            grafo = self.grafo
+            with instrumentacion.tramo('indice_busqueda', aeropuertos=len(tabla)):
+                self._busqueda = IndiceBusqueda.desde_tabla(tabla, [len(grafo.get(c, ())) for c in tabla.codigos])
+                self._busqueda.precalcular()
+        return self._busqueda
+
+    def buscar_aeropuerto(self, texto, k=10):
+        """Aeropuertos que coinciden con un texto (código, nombre, ciudad o país): [(codigo, puntaje)].
+
+        Primero los que empiezan con el texto (puntaje 1), con los de más rutas antes; si no
+        alcanzan, los parecidos por trigramas (puntaje < 1), que cubren errores de tipeo.
+        """
+        codigos = self.aeropuertos.codigos
+        return [(codigos[i], puntaje) for i, puntaje in self.indice_busqueda().buscar(texto, k)]
+
+    def aeropuertos_cercanos(self, lat, lon, k=5):
+        """Los k aeropuertos más cercanos (en línea recta) a unas coordenadas: [(codigo, distancia)]"""
+        return self.indice_espacial().mas_cercanos(lat, lon, k)
+
+    def aeropuertos_en_radio(self, lat, lon, radio_km):
+        """Aeropuertos a menos de radio_km de unas coordenadas, del más cercano al más lejano"""
+        return self.indice_espacial().en_radio(lat, lon, radio_km)
+
+    @instrumentacion.medir('caminos_lote')
+    def caminos_lote(self, pares, modo='astar', min_por_origen=4):
+        """Camino mínimo para muchos pares (origen, destino): lista de (distancia, camino, asentados).
+
+        Los pares se resuelven agrupados por origen y, si un origen aparece al menos
+        min_por_origen veces, se calcula su árbol completo una vez (queda en la caché) y
+        el resto de sus pares sale de ahí (salvo con modo 'ch', donde cada consulta ya es más
+        barata que un árbol completo). Los resultados vuelven en el orden de pares;
+        un par con un código desconocido da (inf, [], 0).
+        """
+        pares = list(pares)
+        veces = {}
+        for origen, _ in pares:
+            veces[origen] = veces.get(origen, 0) + 1
+
+        resultados = [None] * len(pares)
+        for i in sorted(range(len(pares)), key=lambda i: pares[i][0]):
+            origen, destino = pares[i]
+            if origen not in self.aeropuertos or destino not in self.aeropuertos:
+                resultados[i] = (float('inf'), [], 0)
+                continue
+            if modo != 'ch' and veces[origen] >= min_por_origen:
+                self.dijkstra(origen)
+            resultados[i] = self.camino_punto_a_punto(origen, destino, modo)
+        return resultados
+
+    # ====== RUTAS CON ESCALAS ======
+    @instrumentacion.medir('rutas_pareto_pares')
+    def rutas_pareto_pares(self, pares, max_escalas=None):
+        """Rutas Pareto-óptimas en (distancia, escalas) para cada par (origen, destino).
+
+        Para cada par devuelve [(distancia, escalas, camino)] de menos a más escalas, cada ruta más
+        corta que la anterior; max_escalas descarta las que tienen más. Se hace un Bellman-Ford
+        acotado por origen distinto (ver busqueda_escalas); un código desconocido da [].
+        """
+        pares = list(pares)
+        csr = self.csr()
+        max_vuelos = None if max_escalas is None else max_escalas + 1
+        por_origen = {}
+        for i, (origen, destino) in enumerate(pares):
+            if origen in csr.ids and destino in csr.ids:
+                por_origen.setdefault(origen, []).append(i)
+
+        resultados = [[] for _ in pares]
+        for origen, posiciones in por_origen.items():
+            rondas, previos = bellman_ford_acotado(csr, csr.ids[origen], max_vuelos)
+            for i in posiciones:
+                t = csr.ids[pares[i][1]]
+                resultados[i] = [(d, max(vuelos - 1, 0), [csr.codigos[v] for v in reconstruir(rondas, previos, t, vuelos)])
+                                 for d, vuelos in frente_pareto(rondas, t)]
+        return resultados
+
+    def rutas_pareto(self, origen, destino, max_escalas=None):
+        """[(distancia, escalas, camino)] Pareto-óptimas entre dos aeropuertos (ver rutas_pareto_pares)"""
+        return self.rutas_pareto_pares([(origen, destino)], max_escalas)[0]
+
+    def ruta_penalizada(self, origen, destino, penalizacion_escala, max_escalas=None):
+        """Ruta que minimiza distancia + penalizacion_escala × escalas: (costo, distancia, escalas, camino), o None.
+
+        Con penalización no negativa la mejor ruta siempre está en el frente de Pareto, así que
+        alcanza con elegir de ahí (ante un empate, la de menos escalas).
+        """
+        frente = self.rutas_pareto(origen, destino, max_escalas)
+        if not frente:
+            return None
+        distancia, escalas, camino = min(frente, key=lambda ruta: (ruta[0] + penalizacion_escala * ruta[1], ruta[1]))
+        return distancia + penalizacion_escala * escalas, distancia, escalas, camino
+
+    @instrumentacion.medir('pareto_region')
+    def pareto_region(self, codigos, max_escalas=None):
+        """Frente (distancia, escalas) de todos los pares de aeropuertos de una región, sin caminos.
+
+        Todos los orígenes avanzan juntos: cada ronda es una operación de NumPy sobre la matriz
+        orígenes × aristas. Devuelve {(origen, destino): [(distancia, escalas)]} para los pares
+        conectados con a lo sumo max_escalas escalas.
+        """
+        csr = self.csr()
+        codigos = [c for c in dict.fromkeys(codigos) if c in csr.ids]
+        ids = [csr.ids[c] for c in codigos]
+        max_vuelos = None if max_escalas is None else max_escalas + 1
+        rondas = bellman_ford_lote(csr, ids, ids, max_vuelos)  # (rondas, orígenes, destinos)
+
+        mejora = np.empty(rondas.shape, dtype=bool)
+        mejora[0] = np.isfinite(rondas[0])
+        mejora[1:] = rondas[1:] < rondas[:-1]
+        origenes, destinos, vuelos = np.nonzero(mejora.transpose(1, 2, 0))
+        frentes = {}
+        for s, t, k in zip(origenes.tolist(), destinos.tolist(), vuelos.tolist()):
+            if s != t:
+                frentes.setdefault((codigos[s], codigos[t]), []).append((rondas[k, s, t].item(), k - 1))
+        return frentes
+
+    def camino_minimo(self, origen, destino, modo='astar'):
+        """Camino mínimo entre dos aeropuertos: (distancia, camino, asentados), o None si no hay camino"""
+        if origen not in self.aeropuertos or destino not in self.aeropuertos:
+            return None
+        
+        distancia, camino, asentados = self.camino_punto_a_punto(origen, destino, modo)
+        if distancia == float('inf'):
+            return None
+        return distancia, camino, asentados
@@ -0,0 +1,163 @@
+import heapq
+from collections import deque
+import numpy as np
+import instrumentacion
+
+
+class GrafoCSR:
+    """Grafo en formato CSR: códigos internados a enteros y adyacencias en arreglos contiguos de NumPy"""
+
+    def __init__(self, codigos, indptr, indices, pesos):
+        self.codigos = list(codigos)                  # {id: codigo}
+        self.ids = {c: i for i, c in enumerate(self.codigos)}  # {codigo: id}
+        self.indptr = indptr    # vecinos de i en indices[indptr[i]:indptr[i+1]]
+        self.indices = indices  # id de cada vecino
+        self.pesos = pesos      # distancia de cada arista, alineada con indices
+
+        # Rango de cada código en orden alfabético para desempatar el heap igual que
+        # las versiones con diccionarios, que comparan los códigos como strings
+        try:
+            orden = sorted(range(len(self.codigos)), key=self.codigos.__getitem__)
+        except TypeError:
+            orden = list(range(len(self.codigos)))
+        self._por_rango = orden
+        self._rango = [0] * len(orden)
+        for r, i in enumerate(orden):
+            self._rango[i] = r
+
+    @classmethod
+    def desde_dict(cls, grafo):
+        """Construye el CSR a partir del diccionario {codigo: {vecino: distancia}} conservando el orden"""
+        codigos = list(grafo)
+        ids = {c: i for i, c in enumerate(codigos)}
+        n = len(codigos)
+        m = sum(len(vecinos) for vecinos in grafo.values())
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.fromiter((len(v) for v in grafo.values()), dtype=np.int64, count=n))
+        indices = np.fromiter((ids[v] for vecinos in grafo.values() for v in vecinos), dtype=np.int32, count=m)
+        pesos = np.fromiter((w for vecinos in grafo.values() for w in vecinos.values()), dtype=np.float64, count=m)
+        return cls(codigos, indptr, indices, pesos)
+
+    def a_dict(self):
+        """Reconstruye el diccionario de adyacencias {codigo: {vecino: distancia}}"""
+        codigos = self.codigos
+        vecinos = [codigos[i] for i in self.indices.tolist()]
+        pesos = self.pesos.tolist()
+        indptr = self.indptr.tolist()
+        return {c: dict(zip(vecinos[indptr[i]:indptr[i + 1]], pesos[indptr[i]:indptr[i + 1]]))
+                for i, c in enumerate(codigos)}
+
+    def memoria(self):
+        """Bytes ocupados por los arreglos de adyacencia"""
+        return self.indptr.nbytes + self.indices.nbytes + self.pesos.nbytes
+
+    def dijkstra(self, origen):
+        """Dijkstra sobre ids; devuelve listas de distancias y predecesores (-1 = sin predecesor)"""
+        n = len(self.codigos)
+        indptr, indices, pesos = self.indptr.tolist(), self.indices, self.pesos
+        rango, por_rango = self._rango, self._por_rango
+
+        # Con grados bajos recorrer cada tramo como lista es más rápido que operar con NumPy por vértice
+        distancias = [float('inf')] * n
+        predecesores = [-1] * n
+        distancias[origen] = 0
+
+        heap = [(0, rango[origen])]
+        empujes = 1
+
+        while heap:
+            dist_actual, r = heapq.heappop(heap)
+            actual = por_rango[r]
+
+            if dist_actual > distancias[actual]:
+                continue
+
+            ini, fin = indptr[actual], indptr[actual + 1]
+            for vecino, peso in zip(indices[ini:fin].tolist(), pesos[ini:fin].tolist()):
+                nueva_dist = dist_actual + peso
+                if nueva_dist < distancias[vecino]:
+                    distancias[vecino] = nueva_dist
+                    predecesores[vecino] = actual
+                    heapq.heappush(heap, (nueva_dist, rango[vecino]))
+                    empujes += 1
+
+        if instrumentacion.activa():
+            alcanzados = np.isfinite(distancias)
+            instrumentacion.contar(asentados=int(alcanzados.sum()), empujes=empujes,
+                                   relajadas=int(np.diff(self.indptr)[alcanzados].sum()))
+        return distancias, predecesores
+
+    def componentes(self):
+        """BFS por componentes; cada componente es una lista de ids en orden de visita"""
+        n = len(self.codigos)
+        indptr, indices = self.indptr.tolist(), self.indices
+        visitados = bytearray(n)
+        componentes = []
+
+        for inicio in range(n):
+            if visitados[inicio]:
+                continue
+            componente = []
+            cola = deque([inicio])
+            visitados[inicio] = 1
+
+            while cola:
+                actual = cola.popleft()
+                componente.append(actual)
+
+                for vecino in indices[indptr[actual]:indptr[actual + 1]].tolist():
+                    if not visitados[vecino]:
+                        visitados[vecino] = 1
+                        cola.append(vecino)
+
+            componentes.append(componente)
+
+        return componentes
+
+    def prim(self, componente):
+        """Prim sobre ids de una componente; devuelve (peso_total, [(u, v, peso)]) con ids"""
+        if not componente:
+            return 0, []
+
+        indptr, indices, pesos = self.indptr.tolist(), self.indices, self.pesos
+        rango, por_rango = self._rango, self._por_rango
+
+        en_componente = bytearray(len(self.codigos))
+        for i in componente:
+            en_componente[i] = 1
+        visitados = bytearray(len(self.codigos))
+        n_visitados = 0
+        heap = []
+        peso_total = 0
+        aristas_mst = []
+
+        # Comenzar con el primer aeropuerto de la componente
+        inicio = componente[0]
+        visitados[inicio] = 1
+        n_visitados += 1
+
+        ini, fin = indptr[inicio], indptr[inicio + 1]
+        for vecino, peso in zip(indices[ini:fin].tolist(), pesos[ini:fin].tolist()):
+            if en_componente[vecino]:
+                heapq.heappush(heap, (peso, rango[inicio], rango[vecino]))
+        empujes = len(heap)
+
+        while heap and n_visitados < len(componente):
+            peso, ru, rv = heapq.heappop(heap)
+            v = por_rango[rv]
+
+            if not visitados[v]:
+                visitados[v] = 1
+                n_visitados += 1
+                peso_total += peso
+                aristas_mst.append((por_rango[ru], v, peso))
+
+                ini, fin = indptr[v], indptr[v + 1]
+                for vecino, peso_vecino in zip(indices[ini:fin].tolist(), pesos[ini:fin].tolist()):
+                    if en_componente[vecino] and not visitados[vecino]:
+                        heapq.heappush(heap, (peso_vecino, rv, rango[vecino]))
+                        empujes += 1
+
+        instrumentacion.contar(asentados=n_visitados, empujes=empujes)
+        return peso_total, aristas_mst
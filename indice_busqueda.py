@@ -0,0 +1,270 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+import numpy as np
+
+# Campos en orden de prioridad: un código que empieza igual pesa más que una ciudad, y esta más
+# que una palabra del nombre o el país
+CAMPOS = ('codigo', 'ciudad', 'nombre', 'pais')
+# Palabras que casi todos los nombres tienen: no sirven para buscar y llenarían los resultados
+GENERICAS = frozenset(['airport', 'international', 'intl', 'regional', 'municipal', 'airfield', 'field',
+                       'aeropuerto', 'internacional', 'aeroporto', 'aerodromo', 'aeroport',
+                       'de', 'del', 'la', 'el', 'los', 'las', 'the', 'of', 'y', 'and'])
+FIN = '\U0010ffff'   # mayor que cualquier carácter: [p, p + FIN) son las claves que empiezan con p
+RANGO_AMPLIO = 2000  # con más apariciones que esto en el rango, el prefijo se ordena con NumPy
+LARGO_CACHE = 2      # los prefijos de hasta este largo se guardan ya ordenados
+TOPE_CACHE = 50      # resultados guardados por prefijo corto
+
+
+def normalizar(texto):
+    """Minúsculas, sin tildes ni signos, con espacios simples: 'São Paulo-Guarulhos' → 'sao paulo guarulhos'"""
+    texto = unicodedata.normalize('NFKD', str(texto))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+    return ' '.join(re.sub(r'[\W_]+', ' ', texto).split())
+
+
+def trigramas(palabra):
+    """Trigramas de una palabra, con un espacio a cada lado para marcar el inicio y el fin"""
+    palabra = f" {palabra} "
+    return {palabra[i:i + 3] for i in range(len(palabra) - 2)}
+
+
+class IndiceBusqueda:
+    """Búsqueda de aeropuertos por código, nombre, ciudad o país, alineada con los ids de la tabla.
+
+    - Prefijos: cada campo completo y cada palabra (sin las genéricas) es una clave normalizada;
+      las claves van en una lista ordenada, que hace de trie plano: las que empiezan con p
+      forman un rango contiguo que se encuentra con dos bisect. Un prefijo de una o dos letras
+      abarca miles de claves: esos rangos se ordenan con NumPy sobre una copia plana de las
+      apariciones y el resultado de los más cortos se guarda.
+    - Aproximada: índice invertido {trigrama: palabras}. Cada palabra de la consulta se compara
+      con las palabras indexadas por coeficiente de Dice sobre trigramas (con un error de tipeo
+      todavía comparten la mayoría) y cada aeropuerto toma la mejor palabra que tenga.
+    - El orden entre coincidencias: campo, coincidencia exacta de la clave, importancia (cantidad
+      de rutas, así los hubs aparecen primero) y código.
+    """
+
+    def __init__(self, codigos, nombres, ciudades, paises, importancia=None):
+        self.codigos = codigos
+        self.importancia = list(importancia) if importancia is not None else [0] * len(codigos)
+        self._claves = {}        # {clave: [(campo, id)]}
+        self._palabras = []      # claves de una sola palabra, por número de palabra
+        self._largos = []        # cantidad de trigramas de cada palabra
+        self._trigramas = {}     # {trigrama: [números de palabra]}
+        self._arreglos = {}      # {trigrama: arreglo de números de palabra}, se arma al consultarlo
+        self._cache = {}         # {prefijo corto: ids ordenados (los TOPE_CACHE mejores)}
+        self._plana = None       # apariciones en arreglos en el orden de _ordenadas (ver _compilar)
+        self._separadas = {}     # {texto del campo: claves que genera}; ciudades y países se repiten
+        for i in range(len(codigos)):
+            self._indexar(i, (codigos[i], ciudades[i], nombres[i], paises[i]))
+        self._ordenadas = sorted(self._claves)
+
+    @classmethod
+    def desde_tabla(cls, tabla, importancia=None):
+        return cls(tabla.codigos, tabla.nombres, tabla.ciudades, tabla.paises, importancia)
+
+    def __len__(self):
+        return len(self.importancia)
+
+    def _claves_de(self, valor):
+        """Claves de un campo: el texto normalizado completo y sus palabras no genéricas"""
+        claves = self._separadas.get(valor)
+        if claves is None:
+            texto = normalizar(valor) if isinstance(valor, str) else ''
+            claves = [texto] + [p for p in texto.split() if p not in GENERICAS and p != texto] if texto else []
+            self._separadas[valor] = claves
+        return claves
+
+    def _indexar(self, i, valores):
+        """Agrega las claves del aeropuerto i (valores en el orden de CAMPOS); devuelve las claves nuevas"""
+        mejores = {}  # {clave: campo} con el campo de más prioridad que la tiene
+        for campo, valor in enumerate(valores):
+            for clave in self._claves_de(valor):
+                if clave not in mejores:
+                    mejores[clave] = campo
+        nuevas = []
+        for clave, campo in mejores.items():
+            apariciones = self._claves.get(clave)
+            if apariciones is None:
+                apariciones = self._claves[clave] = []
+                nuevas.append(clave)
+                if ' ' not in clave:
+                    self._agregar_palabra(clave)
+            apariciones.append((campo, i))
+        return nuevas
+
+    def _agregar_palabra(self, palabra):
+        numero = len(self._palabras)
+        self._palabras.append(palabra)
+        grams = trigramas(palabra)
+        self._largos.append(len(grams))
+        for gram in grams:
+            self._trigramas.setdefault(gram, []).append(numero)
+            self._arreglos.pop(gram, None)
+
+    def agregar(self, i, codigo, nombre, ciudad, pais, importancia=0):
+        """Indexa un aeropuerto nuevo (id i, el siguiente de la tabla) sin rehacer el índice"""
+        self.importancia.append(importancia)
+        for clave in self._indexar(i, (codigo, ciudad, nombre, pais)):
+            insort(self._ordenadas, clave)
+        self._cache.clear()
+        self._plana = None
+
+    def cambiar_importancia(self, i, importancia):
+        self.importancia[i] = importancia
+        self._cache.clear()
+        if self._plana is not None:
+            self._plana['importancia'][i] = importancia
+
+    # ====== PREFIJOS ======
+    def _rango(self, prefijo):
+        """Posiciones [desde, hasta) de las claves ordenadas que empiezan con prefijo"""
+        ordenadas = self._ordenadas
+        return bisect_left(ordenadas, prefijo), bisect_left(ordenadas, prefijo + FIN)
+
+    def _prefijo(self, prefijo, desde, hasta):
+        """{id: (campo, no exacta)} con la mejor aparición de cada aeropuerto en las claves del rango"""
+        ordenadas, claves = self._ordenadas, self._claves
+        candidatos = {}
+        for j in range(desde, hasta):
+            clave = ordenadas[j]
+            inexacta = clave != prefijo
+            for campo, i in claves[clave]:
+                previo = candidatos.get(i)
+                if previo is None or (campo, inexacta) < previo:
+                    candidatos[i] = (campo, inexacta)
+        return candidatos
+
+    def _mejores(self, candidatos, k):
+        importancia, codigos = self.importancia, self.codigos
+        return heapq.nsmallest(k, candidatos, key=lambda i: (*candidatos[i], -importancia[i], codigos[i]))
+
+    def _compilar(self):
+        """Apariciones de todas las claves en arreglos contiguos en el orden de _ordenadas (tipo CSR)"""
+        if self._plana is None:
+            claves, ordenadas = self._claves, self._ordenadas
+            indptr = np.zeros(len(ordenadas) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(claves[c]) for c in ordenadas])
+            total = int(indptr[-1])
+            orden_codigo = np.empty(len(self.codigos), dtype=np.int64)
+            orden_codigo[sorted(range(len(self.codigos)), key=self.codigos.__getitem__)] = np.arange(len(self.codigos))
+            self._plana = {
+                'indptr': indptr,
+                'campo': np.fromiter((campo for c in ordenadas for campo, _ in claves[c]), dtype=np.int64, count=total),
+                'id': np.fromiter((i for c in ordenadas for _, i in claves[c]), dtype=np.int64, count=total),
+                'importancia': np.array(self.importancia, dtype=np.float64),
+                'orden_codigo': orden_codigo,
+            }
+        return self._plana
+
+    def _prefijo_amplio(self, prefijo, desde, hasta, k):
+        """Los k mejores ids de un rango con muchas claves, ordenando con NumPy en vez de recorrer en Python"""
+        plana = self._compilar()
+        a, b = plana['indptr'][desde], plana['indptr'][hasta]
+        ids = plana['id'][a:b]
+        rango = plana['campo'][a:b] * 2 + 1
+        if self._ordenadas[desde] == prefijo:  # la clave exacta, si está, es la primera del rango
+            rango[:plana['indptr'][desde + 1] - a] -= 1
+        orden = np.lexsort((plana['orden_codigo'][ids], -plana['importancia'][ids], rango))
+        # Un aeropuerto aparece una vez por cada clave suya en el rango: vale su primera aparición
+        mejores, vistos = [], set()
+        for i in ids[orden].tolist():
+            if i not in vistos:
+                vistos.add(i)
+                mejores.append(i)
+                if len(mejores) == k:
+                    break
+        return mejores
+
+    def autocompletar(self, texto, k=10):
+        """Ids de los aeropuertos con algún campo (o palabra) que empieza con el texto, mejores primero.
+
+        Con varias palabras también valen los aeropuertos donde cada palabra empieza alguna
+        palabra de sus campos ('buenos ezeiza', 'new york jfk').
+        """
+        consulta = normalizar(texto)
+        if not consulta:
+            return []
+        corta = len(consulta) <= LARGO_CACHE and k <= TOPE_CACHE
+        if corta and consulta in self._cache:
+            return self._cache[consulta][:k]
+
+        desde, hasta = self._rango(consulta)
+        palabras = consulta.split()
+        cuantos = TOPE_CACHE if corta else k
+        indptr = self._compilar()['indptr']
+        if len(palabras) == 1 and indptr[hasta] - indptr[desde] > RANGO_AMPLIO:
+            mejores = self._prefijo_amplio(consulta, desde, hasta, cuantos)
+        else:
+            candidatos = self._prefijo(consulta, desde, hasta)
+            if len(palabras) > 1:
+                por_palabra = sorted((self._prefijo(p, *self._rango(p)) for p in palabras), key=len)
+                for i in por_palabra[0]:
+                    if i not in candidatos and all(i in otros for otros in por_palabra[1:]):
+                        # Después de los que tienen el texto entero como prefijo de un campo
+                        candidatos[i] = (len(CAMPOS), max(otros[i] for otros in por_palabra))
+            mejores = self._mejores(candidatos, cuantos)
+        if corta:
+            self._cache[consulta] = mejores
+        return mejores[:k]
+
+    def precalcular(self):
+        """Llena la caché de los prefijos de una letra: son los más caros y el primero que se tipea"""
+        for letra in sorted({clave[0] for clave in self._ordenadas if clave}):
+            self.autocompletar(letra, TOPE_CACHE)
+
+    # ====== APROXIMADA ======
+    def _palabras_trigrama(self, gram):
+        arreglo = self._arreglos.get(gram)
+        if arreglo is None:
+            arreglo = self._arreglos[gram] = np.array(self._trigramas[gram], dtype=np.int64)
+        return arreglo
+
+    def aproximados(self, texto, k=10, minimo=0.45):
+        """[(id, puntaje)] parecidos por trigramas (puntaje en [0, 1]), para errores de tipeo.
+
+        El puntaje es el promedio, sobre las palabras de la consulta, del mejor Dice entre esa
+        palabra y alguna palabra del aeropuerto.
+        """
+        palabras = normalizar(texto).split()
+        palabras = [p for p in palabras if p not in GENERICAS] or palabras
+        if not palabras:
+            return []
+        largos = np.array(self._largos)
+        puntajes = {}  # {id: [suma de puntajes, mejor campo]}
+        for palabra in palabras:
+            todos = trigramas(palabra)
+            grams = [g for g in todos if g in self._trigramas]
+            if not grams:
+                continue
+            comunes = np.bincount(np.concatenate([self._palabras_trigrama(g) for g in grams]),
+                                  minlength=len(self._palabras))
+            candidatas = np.flatnonzero(comunes)
+            dice = 2 * comunes[candidatas] / (len(todos) + largos[candidatas])
+            elegidas = dice >= minimo
+            mejor = {}  # {id: (dice, -campo)} de la palabra del aeropuerto más parecida
+            for numero, d in zip(candidatas[elegidas].tolist(), dice[elegidas].tolist()):
+                for campo, i in self._claves[self._palabras[numero]]:
+                    previo = mejor.get(i)
+                    if previo is None or (d, -campo) > previo:
+                        mejor[i] = (d, -campo)
+            for i, (d, campo) in mejor.items():
+                acumulado = puntajes.setdefault(i, [0.0, -campo])
+                acumulado[0] += d / len(palabras)
+                acumulado[1] = min(acumulado[1], -campo)
+
+        importancia, codigos = self.importancia, self.codigos
+        mejores = heapq.nsmallest(k, (i for i, (p, _) in puntajes.items() if p >= minimo),
+                                  key=lambda i: (-round(puntajes[i][0], 9), puntajes[i][1], -importancia[i], codigos[i]))
+        return [(i, puntajes[i][0]) for i in mejores]
+
+    def buscar(self, texto, k=10):
+        """[(id, puntaje)]: primero los de prefijo (puntaje 1) y, si faltan, los aproximados (< 1)"""
+        resultados = [(i, 1.0) for i in self.autocompletar(texto, k)]
+        if len(resultados) < k:
+            vistos = {i for i, _ in resultados}
+            for i, puntaje in self.aproximados(texto, k):
+                if i not in vistos and len(resultados) < k:
+                    resultados.append((i, min(puntaje, 0.99)))
+        return resultados
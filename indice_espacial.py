@@ -0,0 +1,125 @@
+import math
+import numpy as np
+from tabla_aeropuertos import TablaAeropuertos
+
+R_TIERRA = 6371.0  # km, el mismo radio que calcular_distancia
+
+
+class IndiceEspacial:
+    """Grilla de celdas lat/lon sobre los aeropuertos para consultas espaciales sin recorrerlos todos.
+
+    - Los puntos quedan ordenados por celda (fila * columnas + columna), así cada fila de una
+      caja es un solo tramo contiguo del arreglo.
+    - en_caja sirve para recortar a la vista (etiquetas); en_radio y mas_cercanos usan la caja
+      que envuelve el círculo y después filtran con la distancia haversine exacta.
+    - Las cajas con lon_min > lon_max cruzan el antimeridiano.
+    """
+
+    def __init__(self, codigos, latitudes, longitudes, tamano_celda=2.0):
+        self.codigos = list(codigos)
+        self.lat = np.asarray(latitudes, dtype=float)
+        self.lon = np.asarray(longitudes, dtype=float)
+        self.tamano_celda = tamano_celda
+        self.filas = math.ceil(180 / tamano_celda)
+        self.columnas = math.ceil(360 / tamano_celda)
+
+        celda = self._fila(self.lat) * self.columnas + self._columna(self.lon)
+        self.orden = np.argsort(celda, kind='stable')
+        self.inicio = np.searchsorted(celda[self.orden], np.arange(self.filas * self.columnas + 1))
+
+    @classmethod
+    def desde_aeropuertos(cls, aeropuertos, tamano_celda=2.0):
+        """Índice sobre {codigo: {latitud, longitud, ...}}; omite los que no tienen coordenadas válidas"""
+        if isinstance(aeropuertos, TablaAeropuertos):
+            validos = np.isfinite(aeropuertos.latitudes) & np.isfinite(aeropuertos.longitudes)
+            codigos = [c for c, valido in zip(aeropuertos.codigos, validos.tolist()) if valido]
+            return cls(codigos, aeropuertos.latitudes[validos], aeropuertos.longitudes[validos], tamano_celda)
+        codigos, lats, lons = [], [], []
+        for codigo, info in aeropuertos.items():
+            try:
+                lat, lon = float(info['latitud']), float(info['longitud'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if math.isfinite(lat) and math.isfinite(lon):
+                codigos.append(codigo)
+                lats.append(lat)
+                lons.append(lon)
+        return cls(codigos, lats, lons, tamano_celda)
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def _fila(self, lat):
+        return np.clip(np.floor((np.asarray(lat) + 90) / self.tamano_celda), 0, self.filas - 1).astype(np.int64)
+
+    def _columna(self, lon):
+        return np.clip(np.floor((np.asarray(lon) + 180) / self.tamano_celda), 0, self.columnas - 1).astype(np.int64)
+
+    # ====== CONSULTAS ======
+    def en_caja(self, lat_min, lat_max, lon_min, lon_max):
+        """Posiciones (en self.codigos) de los puntos dentro de la caja, en orden creciente"""
+        if lon_min > lon_max:  # cruza el antimeridiano
+            return np.union1d(self.en_caja(lat_min, lat_max, lon_min, 180.0),
+                              self.en_caja(lat_min, lat_max, -180.0, lon_max))
+        lat_min, lat_max = max(lat_min, -90.0), min(lat_max, 90.0)
+        lon_min, lon_max = max(lon_min, -180.0), min(lon_max, 180.0)
+        if lat_min > lat_max or lon_min > lon_max or not len(self.codigos):
+            return np.empty(0, dtype=np.int64)
+
+        c0, c1 = int(self._columna(lon_min)), int(self._columna(lon_max))
+        tramos = [self.orden[self.inicio[f * self.columnas + c0]:self.inicio[f * self.columnas + c1 + 1]]
+                  for f in range(int(self._fila(lat_min)), int(self._fila(lat_max)) + 1)]
+        candidatos = np.concatenate(tramos)
+        lat, lon = self.lat[candidatos], self.lon[candidatos]
+        dentro = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+        return np.sort(candidatos[dentro])
+
+    def distancias(self, lat, lon, posiciones):
+        """Distancia haversine (km, sin redondear) desde (lat, lon) a los puntos indicados"""
+        lat1, lon1 = math.radians(lat), math.radians(lon)
+        lat2, lon2 = np.radians(self.lat[posiciones]), np.radians(self.lon[posiciones])
+        a = np.sin((lat2 - lat1) / 2)**2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+        return R_TIERRA * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    def _en_radio(self, lat, lon, radio_km):
+        """(posiciones, distancias) a menos de radio_km, ordenadas por distancia"""
+        angulo = radio_km / R_TIERRA
+        if angulo >= math.pi:
+            candidatos = np.arange(len(self.codigos))
+        else:
+            grados = math.degrees(angulo)
+            if lat + grados >= 90 or lat - grados <= -90:
+                ancho = 180.0  # el círculo contiene un polo: todas las longitudes
+            else:
+                ancho = math.degrees(math.asin(min(1.0, math.sin(angulo) / math.cos(math.radians(lat)))))
+            if ancho >= 180:
+                lon_min, lon_max = -180.0, 180.0
+            else:
+                lon_min = (lon - ancho + 180) % 360 - 180
+                lon_max = (lon + ancho + 180) % 360 - 180
+            candidatos = self.en_caja(lat - grados, lat + grados, lon_min, lon_max)
+
+        distancias = self.distancias(lat, lon, candidatos)
+        cerca = distancias <= radio_km
+        candidatos, distancias = candidatos[cerca], distancias[cerca]
+        orden = np.lexsort((candidatos, distancias))
+        return candidatos[orden], distancias[orden]
+
+    def en_radio(self, lat, lon, radio_km):
+        """[(codigo, distancia)] a menos de radio_km de (lat, lon), del más cercano al más lejano"""
+        posiciones, distancias = self._en_radio(lat, lon, radio_km)
+        return [(self.codigos[i], round(d, 2)) for i, d in zip(posiciones.tolist(), distancias.tolist())]
+
+    def mas_cercanos(self, lat, lon, k=1):
+        """Los k puntos más cercanos a (lat, lon) como [(codigo, distancia)].
+
+        Busca en círculos cada vez más grandes (el doble cada vez) hasta juntar k puntos;
+        como cada círculo se consulta exacto, los k primeros son los verdaderos más cercanos.
+        """
+        radio = R_TIERRA * math.radians(self.tamano_celda)
+        while True:
+            posiciones, distancias = self._en_radio(lat, lon, radio)
+            if len(posiciones) >= k or radio >= math.pi * R_TIERRA:
+                break
+            radio *= 2
+        return [(self.codigos[i], round(d, 2)) for i, d in zip(posiciones[:k].tolist(), distancias[:k].tolist())]
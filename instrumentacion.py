@@ -0,0 +1,320 @@
+import atexit
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+# Instrumentación opcional: tramos con tiempo y contadores (asentados, empujes al heap, aristas
+# relajadas, segmentos dibujados...) que se exportan como JSON o como traza de Chrome
+# (chrome://tracing o https://ui.perfetto.dev).
+#
+#   instrumentacion.activar(perfil=True)          # perfil: cProfile de cada tramo de primer nivel
+#   with instrumentacion.tramo('dijkstra', origen='EZE'):
+#       ...
+#       instrumentacion.contar(asentados=n, empujes=m)
+#   instrumentacion.exportar_chrome('traza.json')
+#
+# Apagada (lo normal) tramo() devuelve siempre el mismo objeto vacío y contar() no hace nada: el
+# costo es una llamada y un if por operación, nunca por vértice. Los algoritmos solo calculan los
+# contadores caros cuando activa() es True.
+
+MAX_TRAMOS = 200_000  # los más viejos se descartan para que una sesión larga no crezca sin límite
+LINEAS_PERFIL = 25    # funciones del cProfile que se guardan por tramo
+
+
+class _TramoNulo:
+    """Lo que devuelve tramo() con la instrumentación apagada"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+    def contar(self, **contadores):
+        pass
+
+    def anotar(self, **atributos):
+        pass
+
+
+_NULO = _TramoNulo()
+
+
+class Tramo:
+    """Una operación medida; se abre y cierra con with y puede anidarse (por hilo)"""
+    __slots__ = ('registro', 'nombre', 'atributos', 'contadores', 'inicio', 'duracion', 'hilo',
+                 'profundidad', 'perfil', 'memoria', '_perfilador', '_memoria_inicio')
+
+    def __init__(self, registro, nombre, atributos):
+        self.registro = registro
+        self.nombre = nombre
+        self.atributos = atributos
+        self.contadores = {}
+        self.inicio = self.duracion = 0  # ns desde el origen del registro
+        self.hilo = threading.get_ident()
+        self.profundidad = 0
+        self.perfil = None    # texto de pstats (solo tramos de primer nivel con perfil activado)
+        self.memoria = None   # {'pico_bytes', 'neta_bytes'} (ídem, con memoria activada)
+        self._perfilador = None
+        self._memoria_inicio = 0
+
+    def contar(self, **contadores):
+        for nombre, n in contadores.items():
+            self.contadores[nombre] = self.contadores.get(nombre, 0) + n
+
+    def anotar(self, **atributos):
+        self.atributos.update(atributos)
+
+    def __enter__(self):
+        pila = self.registro._pila()
+        self.profundidad = len(pila)
+        pila.append(self)
+        # cProfile y el pico de tracemalloc no se pueden anidar: solo en los tramos de primer nivel
+        if self.profundidad == 0:
+            if self.registro.memoria and tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+                self._memoria_inicio = tracemalloc.get_traced_memory()[0]
+            if self.registro.perfil:
+                perfilador = cProfile.Profile()
+                try:
+                    perfilador.enable()
+                    self._perfilador = perfilador
+                except ValueError:  # otro hilo ya está perfilando
+                    pass
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        fin = time.perf_counter_ns()
+        self.duracion = fin - self.inicio
+        self.inicio -= self.registro.origen
+        if self._perfilador is not None:
+            self._perfilador.disable()
+            texto = io.StringIO()
+            pstats.Stats(self._perfilador, stream=texto).sort_stats('cumulative').print_stats(LINEAS_PERFIL)
+            self.perfil = texto.getvalue()
+            self._perfilador = None
+        if self.profundidad == 0 and self.registro.memoria and tracemalloc.is_tracing():
+            actual, pico = tracemalloc.get_traced_memory()
+            self.memoria = {'pico_bytes': pico - self._memoria_inicio, 'neta_bytes': actual - self._memoria_inicio}
+        if tipo is not None:
+            self.atributos['error'] = tipo.__name__
+        pila = self.registro._pila()
+        if pila and pila[-1] is self:
+            pila.pop()
+        self.registro._guardar(self)
+        return False
+
+    def a_dict(self):
+        datos = {
+            'nombre': self.nombre,
+            'inicio_us': self.inicio / 1000,
+            'duracion_ms': self.duracion / 1e6,
+            'hilo': self.hilo,
+            'profundidad': self.profundidad,
+            'atributos': self.atributos,
+            'contadores': self.contadores,
+        }
+        if self.memoria is not None:
+            datos['memoria'] = self.memoria
+        if self.perfil is not None:
+            datos['perfil'] = self.perfil
+        return datos
+
+
+class Registro:
+    """Tramos terminados de todos los hilos; hay uno global (REGISTRO) que usan las funciones del módulo"""
+
+    def __init__(self, max_tramos=MAX_TRAMOS):
+        self.activo = False
+        self.perfil = False
+        self.memoria = False
+        self.origen = time.perf_counter_ns()
+        self.tramos = deque(maxlen=max_tramos)
+        self.descartados = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._inicio_tracemalloc = False
+
+    def activar(self, perfil=False, memoria=False):
+        """Empieza a registrar; perfil agrega cProfile y memoria el pico de tracemalloc por operación"""
+        self.perfil = perfil
+        self.memoria = memoria
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._inicio_tracemalloc = True
+        self.activo = True
+
+    def desactivar(self):
+        self.activo = False
+        if self._inicio_tracemalloc:
+            tracemalloc.stop()
+            self._inicio_tracemalloc = False
+
+    def limpiar(self):
+        with self._lock:
+            self.tramos.clear()
+            self.descartados = 0
+
+    def _pila(self):
+        pila = getattr(self._local, 'pila', None)
+        if pila is None:
+            pila = self._local.pila = []
+        return pila
+
+    def _guardar(self, tramo):
+        with self._lock:
+            if len(self.tramos) == self.tramos.maxlen:
+                self.descartados += 1
+            self.tramos.append(tramo)
+
+    def actual(self):
+        """Tramo abierto más interno del hilo actual (el vacío si no hay ninguno)"""
+        pila = self._pila()
+        return pila[-1] if pila else _NULO
+
+    def tramo(self, nombre, **atributos):
+        if not self.activo:
+            return _NULO
+        return Tramo(self, nombre, atributos)
+
+    def registrar(self, nombre, inicio, fin, **contadores):
+        """Agrega un tramo ya terminado medido por fuera (inicio y fin de time.perf_counter, en segundos)"""
+        if not self.activo:
+            return
+        tramo = Tramo(self, nombre, {})
+        tramo.inicio = int(inicio * 1e9) - self.origen
+        tramo.duracion = int((fin - inicio) * 1e9)
+        tramo.profundidad = len(self._pila())
+        tramo.contar(**contadores)
+        self._guardar(tramo)
+
+    # ====== RESULTADOS ======
+    def resumen(self):
+        """{nombre: {llamadas, total_ms, max_ms, contadores sumados}} ordenado por tiempo total"""
+        with self._lock:
+            tramos = list(self.tramos)
+        por_nombre = {}
+        for tramo in tramos:
+            datos = por_nombre.setdefault(tramo.nombre, {'llamadas': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'contadores': {}})
+            ms = tramo.duracion / 1e6
+            datos['llamadas'] += 1
+            datos['total_ms'] += ms
+            datos['max_ms'] = max(datos['max_ms'], ms)
+            for contador, n in tramo.contadores.items():
+                datos['contadores'][contador] = datos['contadores'].get(contador, 0) + n
+        return dict(sorted(por_nombre.items(), key=lambda item: -item[1]['total_ms']))
+
+    def exportar_json(self, ruta):
+        """Resumen por operación más cada tramo (con su perfil y memoria si se capturaron)"""
+        with self._lock:
+            tramos = [tramo.a_dict() for tramo in self.tramos]
+        datos = {'resumen': self.resumen(), 'descartados': self.descartados, 'tramos': tramos}
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False, indent=1, default=str)
+
+    def exportar_chrome(self, ruta):
+        """Formato Trace Event de Chrome: un evento completo ('X') por tramo con los contadores en args"""
+        pid = os.getpid()
+        with self._lock:
+            tramos = list(self.tramos)
+        eventos = []
+        for tramo in tramos:
+            args = dict(tramo.atributos, **tramo.contadores)
+            if tramo.memoria is not None:
+                args.update(tramo.memoria)
+            eventos.append({'name': tramo.nombre, 'cat': 'grafo', 'ph': 'X', 'pid': pid, 'tid': tramo.hilo,
+                            'ts': tramo.inicio / 1000, 'dur': tramo.duracion / 1000, 'args': args})
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, f, default=str)
+
+
+REGISTRO = Registro()
+
+
+def activa():
+    return REGISTRO.activo
+
+
+def activar(perfil=False, memoria=False):
+    REGISTRO.activar(perfil, memoria)
+
+
+def desactivar():
+    REGISTRO.desactivar()
+
+
+def tramo(nombre, **atributos):
+    """Context manager que mide una operación; apagada devuelve un objeto vacío compartido"""
+    if not REGISTRO.activo:
+        return _NULO
+    return Tramo(REGISTRO, nombre, atributos)
+
+
+def contar(**contadores):
+    """Suma contadores al tramo abierto del hilo actual"""
+    if REGISTRO.activo:
+        REGISTRO.actual().contar(**contadores)
+
+
+def anotar(**atributos):
+    """Agrega atributos al tramo abierto del hilo actual"""
+    if REGISTRO.activo:
+        REGISTRO.actual().anotar(**atributos)
+
+
+def registrar(nombre, inicio, fin, **contadores):
+    REGISTRO.registrar(nombre, inicio, fin, **contadores)
+
+
+def medir(nombre=None):
+    """Decorador: cada llamada es un tramo (con el nombre de la función si no se da otro)"""
+    def decorador(funcion):
+        etiqueta = nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not REGISTRO.activo:
+                return funcion(*args, **kwargs)
+            with Tramo(REGISTRO, etiqueta, {}):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def resumen():
+    return REGISTRO.resumen()
+
+
+def exportar_json(ruta):
+    REGISTRO.exportar_json(ruta)
+
+
+def exportar_chrome(ruta):
+    REGISTRO.exportar_chrome(ruta)
+
+
+def activar_desde_entorno(entorno=os.environ):
+    """Activa la instrumentación según variables de entorno y exporta al salir del proceso.
+
+    GRAFO_TRAZA=archivo (traza de Chrome), GRAFO_PERFIL=archivo (JSON) y GRAFO_CAPTURA con
+    'cprofile' y/o 'tracemalloc' separados por comas. Devuelve si quedó activada.
+    """
+    traza, perfil = entorno.get('GRAFO_TRAZA'), entorno.get('GRAFO_PERFIL')
+    if not traza and not perfil:
+        return False
+    captura = {c.strip().lower() for c in entorno.get('GRAFO_CAPTURA', '').split(',')}
+    activar(perfil='cprofile' in captura, memoria='tracemalloc' in captura)
+    if traza:
+        atexit.register(exportar_chrome, traza)
+    if perfil:
+        atexit.register(exportar_json, perfil)
+    return True
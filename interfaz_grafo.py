@@ -1,11 +1,18 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, ttk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.collections import LineCollection
-import matplotlib.image as mpimg
 import os, sys, urllib.request
+import numpy as np
 from grafo_aereopuertos import GrafoAeropuertos
+from capa_aristas import CapaAristas
+from vista_mapa import VistaMapa
+from mapa_fondo import cargar_piramide
+from ejecutor_tareas import EjecutorTareas
+from autocompletado import EntradaAutocompletada
+from salida_buffer import SalidaBuffer
+from formato_resultados import formatear_conexidad, formatear_mst, formatear_mas_lejanos, formatear_camino
+import instrumentacion
 
 
 class InterfazGrafo:
@@ -30,6 +37,10 @@ class InterfazGrafo:
         self._color_aristas = "#444"
         self._color_nodos = "#007ACC"
         self._pos_cache = None
+        self._capa_cache = None  # (subgrafo, versión del grafo, CapaAristas)
+        self._etiquetas_por_zoom = True
+        self._progreso_activo = False  # si la barra indeterminada está animándose
+        self.salida = None  # SalidaBuffer del cuadro de texto, se crea con el widget
 
         sys.stdout = self  # Redirigir print al cuadro de texto
 
@@ -63,17 +74,30 @@ class InterfazGrafo:
         tk.Button(frame_botones, text="Top 10 más lejanos",
                   command=self.mas_lejanos, width=16,
                   bg="#50C878", fg="white").pack(side=tk.LEFT, padx=6)
+        tk.Label(frame_botones, text="Radio (km):", bg="#e0e6eb").pack(side=tk.LEFT, padx=(8, 2))
+        self.entry_radio = tk.Entry(frame_botones, width=6)
+        self.entry_radio.insert(0, "500")
+        self.entry_radio.pack(side=tk.LEFT, padx=4)
+        tk.Button(frame_botones, text="Cercanos",
+                  command=self.en_radio, width=10,
+                  bg="#50C878", fg="white").pack(side=tk.LEFT, padx=6)
+
+        # Sugerencias por código, nombre, ciudad o país mientras se escribe
+        for entrada in (self.entry_origen, self.entry_destino, self.entry_codigo):
+            EntradaAutocompletada(entrada, self.grafo.buscar_aeropuerto, self._describir_aeropuerto)
 
-        instr = "Zoom: W/S | Mover: ← ↑ ↓ → | Esc: salir fullscreen"
+        instr = "Zoom: W/S | Mover: ← ↑ ↓ → | Clic: origen, clic der.: destino | Esc: salir fullscreen"
         tk.Label(frame_botones, text=instr, bg="#e0e6eb", fg="#333").pack(side=tk.RIGHT, padx=10)
 
-        # Eventos de teclado
-        self.root.bind("w", lambda e: self._zoom_key(True))
-        self.root.bind("s", lambda e: self._zoom_key(False))
-        self.root.bind("<Up>", lambda e: self._move_view(0, 10))
-        self.root.bind("<Down>", lambda e: self._move_view(0, -10))
-        self.root.bind("<Left>", lambda e: self._move_view(-10, 0))
-        self.root.bind("<Right>", lambda e: self._move_view(10, 0))
+        # Eventos de teclado (no mientras se escribe en una entrada)
+        def atajo(accion):
+            return lambda e: None if isinstance(e.widget, tk.Entry) else accion()
+        self.root.bind("w", atajo(lambda: self._zoom_key(True)))
+        self.root.bind("s", atajo(lambda: self._zoom_key(False)))
+        self.root.bind("<Up>", atajo(lambda: self._move_view(0, 10)))
+        self.root.bind("<Down>", atajo(lambda: self._move_view(0, -10)))
+        self.root.bind("<Left>", atajo(lambda: self._move_view(-10, 0)))
+        self.root.bind("<Right>", atajo(lambda: self._move_view(10, 0)))
 
         # ====== FRAME CENTRAL ======
         frame_grafo = tk.Frame(self.root, bg="white")
@@ -84,11 +108,10 @@ class InterfazGrafo:
         self.canvas = FigureCanvasTkAgg(self.fig, master=frame_grafo)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # Fondo, aristas, nodos y etiquetas se crean una vez; zoom/pan solo cambia los límites
         self.mapa = self._cargar_mapa_fondo()
-        if self.mapa is not None:
-            self.ax.imshow(self.mapa, extent=[-180, 180, -90, 90], zorder=0)
-        else:
-            self.ax.set_facecolor("#E0E0E0")
+        self.vista = VistaMapa(self.ax, self.canvas, self.mapa)
+        self.canvas.mpl_connect("button_press_event", self._al_hacer_clic)
 
         # ====== FRAME INFERIOR ======
         frame_salida = tk.Frame(self.root)
@@ -97,6 +120,26 @@ class InterfazGrafo:
         self.text_salida = tk.Text(frame_salida, height=9, wrap=tk.WORD, bg="#f7f9fa")
         self.text_salida.pack(fill=tk.BOTH, expand=True)
         self.text_salida.insert(tk.END, "Bienvenido al sistema de aeropuertos.\n")
+        self.salida = SalidaBuffer(self.root, self.text_salida)
+
+        # Estado del cálculo en curso (los algoritmos corren fuera del hilo de Tk)
+        frame_estado = tk.Frame(frame_salida)
+        frame_estado.pack(fill=tk.X, pady=(4, 0))
+        self.lbl_estado = tk.Label(frame_estado, text="", anchor="w")
+        self.lbl_estado.pack(side=tk.LEFT)
+        self.btn_cancelar = tk.Button(frame_estado, text="Cancelar", state=tk.DISABLED,
+                                      command=lambda: self.tareas.cancelar())
+        self.btn_cancelar.pack(side=tk.RIGHT, padx=4)
+        self.progreso = ttk.Progressbar(frame_estado, mode="indeterminate", length=140)
+        self.progreso.pack(side=tk.RIGHT, padx=4)
+        # Los índices perezosos que el hilo de Tk consulta directamente (sugerencias, clics, "Cercanos")
+        # se arman antes de que arranque el trabajador: desde ahí el trabajador no los construye ni
+        # los toca, y el índice espacial solo se lee. El de búsqueda guarda cachés internas, pero
+        # solo lo usa el hilo de Tk. La interfaz no modifica el grafo, así que no se invalidan.
+        self.grafo.indice_espacial()
+        self.grafo.indice_busqueda()
+        self.tareas = EjecutorTareas(self.root, al_cambiar=self._mostrar_estado,
+                                     al_revisar=self.salida.programar)
 
         # Mostrar grafo completo al inicio
         if self.grafo.grafo:
@@ -105,12 +148,11 @@ class InterfazGrafo:
     # ====== AUXILIARES ======
     def _cargar_mapa_fondo(self):
         """
-        Carga el archivo local 'mapamundi_fondo.png' y lo prepara como fondo del grafo.
-        - Admite JPG o PNG.
-        - Si el PNG tiene transparencia, la elimina para que se vea bien detrás.
-        - Redimensiona la imagen para ajustarse a los límites geográficos del mapa.
+        Carga 'mapamundi_fondo.png' (junto a este .py) como pirámide de resoluciones para el fondo.
+        - La imagen se decodifica en memoria una sola vez por proceso, sin archivos temporales.
+        - Si el PNG tiene transparencia, se pinta sobre blanco para que se vea bien detrás.
         """
-        archivo = "mapamundi_fondo.png"  # Asegúrate de que esté en la misma carpeta que este .py
+        archivo = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mapamundi_fondo.png")
 
         if not os.path.exists(archivo):
             print("⚠️ No se encontró el archivo 'mapamundi_fondo.png' en la carpeta del proyecto.")
@@ -118,27 +160,7 @@ class InterfazGrafo:
             return None
 
         try:
-            from PIL import Image
-            import matplotlib.image as mpimg
-
-            # Abrir y convertir la imagen
-            img = Image.open(archivo).convert("RGBA")
-
-            # Si tiene transparencia (canal alfa), eliminarla
-            if img.mode == "RGBA":
-                fondo = Image.new("RGB", img.size, (255, 255, 255))
-                fondo.paste(img, mask=img.split()[3])  # elimina la transparencia
-                img = fondo
-
-            # Redimensionar para un ancho estándar de mapa
-            img = img.resize((2048, 1024))  # se adapta bien a las coordenadas [-180,180]x[-90,90]
-
-            # Guardar temporalmente en formato JPG para cargarlo con matplotlib
-            temp_path = "mapamundi_temp.jpg"
-            img.save(temp_path, "JPEG", quality=90)
-
-            # Cargar con matplotlib (sin canal alfa, para evitar superposición)
-            mapa = mpimg.imread(temp_path)
+            mapa = cargar_piramide(archivo)
             print("🗺️ Mapa de fondo cargado exitosamente.")
             return mapa
 
@@ -146,109 +168,224 @@ class InterfazGrafo:
             print("❌ Error cargando el mapa de fondo:", e)
             return None
 
-
     def write(self, texto):
-        try:
-            self.text_salida.insert(tk.END, texto)
-            self.text_salida.see(tk.END)
+        # Se junta en el buffer y se vuelca al cuadro de texto por tandas (desde cualquier hilo)
+        if self.salida is None:
             sys.__stdout__.write(texto)
-        except Exception:
-            pass
-
-    def flush(self): pass
+        else:
+            self.salida.write(texto)
+
+    def flush(self):
+        if self.salida is not None:
+            self.salida.flush()
+
+    def _mostrar_estado(self, tarea):
+        """Indicador de progreso: nombre y tiempo de la tarea en curso, o nada si no hay ninguna"""
+        if tarea is None:
+            self.lbl_estado.config(text="")
+            self.progreso.stop()
+            self.btn_cancelar.config(state=tk.DISABLED)
+            self._progreso_activo = False
+            return
+        self.lbl_estado.config(text=f"⏳ {tarea.nombre}… {tarea.transcurrido():.1f} s")
+        self.btn_cancelar.config(state=tk.NORMAL)
+        if not self._progreso_activo:
+            self.progreso.start(15)
+            self._progreso_activo = True
 
     # ====== GRAFO ======
-    def _get_positions(self, subgrafo=None):
-        if self._pos_cache and not subgrafo:
-            return self._pos_cache
+    def _calcular_posiciones(self):
+        # Las coordenadas ya están en arreglos float de la tabla: sin convertir aeropuerto por aeropuerto
+        tabla = self.grafo.aeropuertos
+        lon, lat = tabla.longitudes, tabla.latitudes
+        validos = (np.isfinite(lon) & np.isfinite(lat)).tolist()
+        return {code: xy for code, xy, valido in zip(tabla.codigos, zip(lon.tolist(), lat.tolist()), validos) if valido}
 
-        datos = subgrafo if subgrafo else self.grafo.grafo
-        pos = {}
-        for code, info in self.grafo.aeropuertos.items():
-            try:
-                pos[code] = (float(info["longitud"]), float(info["latitud"]))
-            except:
-                continue
+    def _get_positions(self, subgrafo=None):
+        if self._pos_cache and not subgrafo and self._pos_cache[0] == self.grafo.version:
+            return self._pos_cache[1]
+        pos = self._calcular_posiciones()
         if not subgrafo:
-            self._pos_cache = pos
+            self._pos_cache = (self.grafo.version, pos)
         return pos
 
+    def _construir_capa(self, datos, pos):
+        with instrumentacion.tramo('capa_aristas') as tramo:
+            capa = CapaAristas(datos, pos)
+            tramo.contar(segmentos=len(capa))
+        return capa
+
+    def _get_capa(self, datos, pos):
+        """Aristas del subgrafo ya deduplicadas y en NumPy; se rehacen solo si cambia el subgrafo"""
+        if self._capa_cache is None or self._capa_cache[0] is not datos or self._capa_cache[1] != self.grafo.version:
+            self._capa_cache = (datos, self.grafo.version, self._construir_capa(datos, pos))
+        return self._capa_cache[2]
+
+    def _preparar_capa(self, subgrafo=None):
+        """Arma por adelantado (en el hilo trabajador) las posiciones y la capa que después usa mostrar_grafo.
+
+        No toca las cachés: devuelve (versión, datos, posiciones, capa) para que _adoptar_capa
+        las guarde desde el hilo de Tk, el único que las lee y las escribe.
+        """
+        version = self.grafo.version
+        datos = subgrafo if subgrafo else self.grafo.grafo
+        pos = self._calcular_posiciones()
+        return version, datos, pos, self._construir_capa(datos, pos)
+
+    def _adoptar_capa(self, preparada):
+        """Guarda en las cachés (hilo de Tk) lo que armó _preparar_capa, si el grafo no cambió desde entonces"""
+        version, datos, pos, capa = preparada
+        if version != self.grafo.version:
+            return
+        self._pos_cache = (version, pos)
+        self._capa_cache = (datos, version, capa)
+
     def mostrar_grafo_completo(self):
         self._reset_zoom()
         self._subgrafo_actual = None
-        self.mostrar_grafo(self.grafo.grafo)
 
+        def mostrar(preparada):
+            self._adoptar_capa(preparada)
+            self.mostrar_grafo(self.grafo.grafo)
+
+        self.tareas.ejecutar("Preparando grafo", self._preparar_capa, mostrar)
+
+    @instrumentacion.medir('mostrar_grafo')
     def mostrar_grafo(self, subgrafo=None, color_aristas="#444", color_nodos="#007ACC"):
         self._subgrafo_actual = subgrafo
         self._color_aristas = color_aristas
         self._color_nodos = color_nodos
 
-        self.ax.clear()
-        if self.mapa is not None:
-            self.ax.imshow(self.mapa, extent=[-180, 180, -90, 90], zorder=0)
-        else:
-            self.ax.set_facecolor("#E0E0E0")
-
-        x_min, x_max = (-180 / self.zoom_scale) + self.pan_x, (180 / self.zoom_scale) + self.pan_x
-        y_min, y_max = (-90 / self.zoom_scale) + self.pan_y, (90 / self.zoom_scale) + self.pan_y
-        self.ax.set_xlim(x_min, x_max)
-        self.ax.set_ylim(y_min, y_max)
-        self.ax.set_axis_off()
-
         datos = subgrafo if subgrafo else self.grafo.grafo
         pos = self._get_positions(subgrafo)
-        segmentos = [[pos[u], pos[v]] for u in datos for v in datos[u] if u in pos and v in pos]
-        if segmentos:
-            self.ax.add_collection(LineCollection(segmentos, linewidths=0.4, colors=color_aristas, alpha=0.5, zorder=2))
-
-        xs, ys = zip(*pos.values())
-        self.ax.scatter(xs, ys, s=15, c=color_nodos, alpha=0.8, zorder=3)
-
-        if len(pos) < 200 or self.zoom_scale > 1.8:
-            for code, (x, y) in pos.items():
-                nombre = self.grafo.aeropuertos.get(code, {}).get("nombre", "")
-                self.ax.text(x, y, f"{code}\n{nombre[:15]}", fontsize=6,
-                             ha="center", va="bottom", color="black", zorder=4)
+        textos = [f"{code}\n{self.grafo.aeropuertos.get(code, {}).get('nombre', '')[:15]}" for code in pos]
+        self._etiquetas_por_zoom = len(pos) >= 200  # con muchos nodos solo se rotula al acercarse
+        self.vista.mostrar(self._get_capa(datos, pos), list(pos.values()), list(pos), textos,
+                           color_aristas=color_aristas, color_nodos=color_nodos)
+        self._actualizar_vista()
 
-        self.canvas.draw_idle()
+    def _limites(self):
+        x_min, x_max = (-180 / self.zoom_scale) + self.pan_x, (180 / self.zoom_scale) + self.pan_x
+        y_min, y_max = (-90 / self.zoom_scale) + self.pan_y, (90 / self.zoom_scale) + self.pan_y
+        return x_min, x_max, y_min, y_max
+
+    def _actualizar_vista(self):
+        """Aplica zoom/pan actuales sobre los artistas ya creados"""
+        con_etiquetas = not self._etiquetas_por_zoom or self.zoom_scale > 1.8
+        self.vista.actualizar(*self._limites(), con_etiquetas)
+
+    def _describir_aeropuerto(self, code):
+        info = self.grafo.aeropuertos[code]
+        return f"{code}  {info['nombre']} ({info['ciudad']}, {info['pais']})"
+
+    def _resolver_codigo(self, texto):
+        """Código exacto o, si no lo es, el mejor resultado de buscar_aeropuerto (None si no hay ninguno)"""
+        texto = texto.strip()
+        code = texto.upper()
+        if not texto or code in self.grafo.aeropuertos:
+            return code or None
+        resultados = self.grafo.buscar_aeropuerto(texto, 1)
+        if not resultados:
+            return None
+        code = resultados[0][0]
+        print(f"\n'{texto}' → {self._describir_aeropuerto(code)}")
+        return code
 
     # ====== FUNCIONALIDAD ======
+    # Cada acción se parte en calcular (hilo trabajador) y mostrar (hilo de Tk, con el resultado)
     def verificar_conexidad(self):
         self._reset_zoom()
 
-        es_conexo, comps = self.grafo.es_conexo()
-        print("\n--- CONEXIDAD ---")
-        print(f"¿Es conexo? {'Sí' if es_conexo else 'No'}")
+        def calcular():
+            es_conexo, comps = self.grafo.es_conexo()
+            texto = formatear_conexidad(es_conexo, comps, self.grafo.bosque_expansion_minima())
+            return texto, self._preparar_capa()
 
-        for i, comp in enumerate(comps, 1):
-            peso, _ = self.grafo.prim_mst(comp)
-            print(f"  Componente {i}: {len(comp)} aeropuertos — Distancia total: {peso:.2f} km")
+        def mostrar(resultado):
+            texto, preparada = resultado
+            print(texto)
+            self._adoptar_capa(preparada)
+            self.mostrar_grafo()
 
-        self.mostrar_grafo()
+        self.tareas.ejecutar("Verificando conexidad", calcular, mostrar)
 
     def mst(self):
         self._reset_zoom()
-        _, comps = self.grafo.es_conexo()
-        print("\n--- ÁRBOL DE EXPANSIÓN MÍNIMA ---")
-        for i, comp in enumerate(comps, 1):
-            peso, aristas = self.grafo.prim_mst(comp)
-            print(f"Componente {i}: {len(comp)} aeropuertos — Peso total: {peso:.2f} km")
-        if comps:
-            peso, aristas = self.grafo.prim_mst(comps[0])
-            sub = {}
-            for u, v, w in aristas:
-                sub.setdefault(u, {})[v] = w
-                sub.setdefault(v, {})[u] = w
-            self.mostrar_grafo(sub, color_aristas="#50C878", color_nodos="#E87461")
+
+        def calcular():
+            _, comps = self.grafo.es_conexo()
+            bosque = self.grafo.bosque_expansion_minima()
+            sub, preparada = {}, None
+            if comps:
+                for u, v, w in bosque[0][1]:
+                    sub.setdefault(u, {})[v] = w
+                    sub.setdefault(v, {})[u] = w
+                preparada = self._preparar_capa(sub)
+            return formatear_mst(comps, bosque), sub, preparada
+
+        def mostrar(resultado):
+            texto, sub, preparada = resultado
+            print(texto)
+            if sub:
+                self._adoptar_capa(preparada)
+                self.mostrar_grafo(sub, color_aristas="#50C878", color_nodos="#E87461")
+
+        self.tareas.ejecutar("Árbol de expansión mínima", calcular, mostrar)
 
     def mas_lejanos(self):
         self._reset_zoom()
-        code = self.entry_codigo.get().strip().upper()
-        if not code:
+        texto = self.entry_codigo.get().strip()
+        if not texto:
             messagebox.showwarning("Atención", "Ingrese código de aeropuerto.")
             return
-        print(f"\n--- 10 MÁS LEJANOS DESDE {code} ---")
-        self.grafo.aeropuertos_mas_lejanos(code)
+        code = self._resolver_codigo(texto)
+        if code is None:
+            messagebox.showerror("No encontrado", f"Aeropuerto {texto} no encontrado.")
+            return
+        self.tareas.ejecutar(f"Más lejanos desde {code}",
+                             lambda: formatear_mas_lejanos(self.grafo.aeropuertos, code,
+                                                           self.grafo.aeropuertos_mas_lejanos(code)),
+                             print)
+
+    def en_radio(self):
+        code = self._resolver_codigo(self.entry_codigo.get())
+        if code is None:
+            messagebox.showwarning("Atención", "Ingrese un código de aeropuerto válido.")
+            return
+        try:
+            radio = float(self.entry_radio.get())
+        except ValueError:
+            messagebox.showwarning("Atención", "Ingrese el radio en km.")
+            return
+
+        info = self.grafo.aeropuertos[code]
+        cercanos = [(c, d) for c, d in self.grafo.aeropuertos_en_radio(info["latitud"], info["longitud"], radio)
+                    if c != code]
+        print(f"\n--- AEROPUERTOS A MENOS DE {radio:.0f} km DE {code} ---")
+        for c, d in cercanos[:20]:
+            print(f"  {c} - {self.grafo.aeropuertos[c]['nombre']} ({d:.2f} km)")
+        if len(cercanos) > 20:
+            print(f"  ... y {len(cercanos) - 20} más")
+        print(f"Total: {len(cercanos)} aeropuertos")
+
+    def _al_hacer_clic(self, evento):
+        """
+        Selecciona el aeropuerto más cercano al clic: izquierdo → origen, derecho → destino.
+        """
+        if evento.inaxes is not self.ax or evento.xdata is None:
+            return
+        cercanos = self.grafo.aeropuertos_cercanos(evento.ydata, evento.xdata, k=1)
+        # La tolerancia se achica al acercarse para no elegir un aeropuerto lejano al clic
+        if not cercanos or cercanos[0][1] > 400 / self.zoom_scale:
+            return
+
+        code = cercanos[0][0]
+        entrada = self.entry_destino if evento.button == 3 else self.entry_origen
+        for e in (entrada, self.entry_codigo):
+            e.delete(0, tk.END)
+            e.insert(0, code)
+        info = self.grafo.aeropuertos[code]
+        print(f"\nSeleccionado: {code} - {info['nombre']} ({info['ciudad']}, {info['pais']})")
 
     def camino_minimo(self):
         self._reset_zoom()
@@ -257,37 +394,33 @@ class InterfazGrafo:
         Dibuja ÚNICAMENTE el camino mínimo entre dos aeropuertos (origen → destino),
         y mantiene el control de zoom/pan sobre ese camino.
         """
-        origen = self.entry_origen.get().strip().upper()
-        destino = self.entry_destino.get().strip().upper()
+        textos = (self.entry_origen.get().strip(), self.entry_destino.get().strip())
 
-        if not origen or not destino:
+        if not all(textos):
             messagebox.showwarning("Atención", "Ingrese ambos aeropuertos.")
             return
 
-        dist, pred = self.grafo.dijkstra(origen)
-        if dist.get(destino, float("inf")) == float("inf"):
+        # Un código exacto se usa tal cual; un nombre, ciudad o código mal escrito, su mejor coincidencia
+        codigos = []
+        for texto in textos:
+            code = self._resolver_codigo(texto)
+            if code is None:
+                messagebox.showerror("No encontrado", f"Aeropuerto {texto} no encontrado.")
+                return
+            codigos.append(code)
+        origen, destino = codigos
+
+        # Búsqueda punto a punto (A*): se detiene al llegar al destino
+        self.tareas.ejecutar(f"Camino {origen} → {destino}",
+                             lambda: self.grafo.camino_punto_a_punto(origen, destino),
+                             lambda resultado: self._mostrar_camino(origen, destino, *resultado))
+
+    def _mostrar_camino(self, origen, destino, distancia, camino, asentados):
+        if distancia == float("inf"):
             messagebox.showerror("Sin conexión", "No hay camino disponible.")
             return
 
-        # reconstruir el camino
-        camino = []
-        cur = destino
-        while cur:
-            camino.append(cur)
-            cur = pred[cur]
-        camino.reverse()
-
-        print(f"\n--- CAMINO MÍNIMO {origen} → {destino} ---")
-        for i, code in enumerate(camino, 1):
-            info = self.grafo.aeropuertos.get(code, {})
-            nombre = info.get("nombre", info.get("Source Airport Name", "Desconocido"))
-            ciudad = info.get("ciudad", info.get("Source Airport City", "Desconocido"))
-            pais = info.get("pais", info.get("Source Airport Country", "Desconocido"))
-            lat = info.get("latitud", info.get("Source Airport Latitude", "N/A"))
-            lon = info.get("longitud", info.get("Source Airport Longitude", "N/A"))
-
-            print(f"{i}. {code} - {nombre} ({ciudad}, {pais}) [Lat: {lat}, Lon: {lon}]")
-        print(f"Distancia total: {dist[destino]:.2f} km\n")
+        print(formatear_camino(self.grafo, origen, destino, (distancia, camino, asentados)))
 
         # construir subgrafo SOLO con las aristas del camino
         sub = {}
@@ -303,63 +436,41 @@ class InterfazGrafo:
         self._color_nodos = "#F4D03F"
         self._mostrar_solo_camino(sub, camino)
 
+    @instrumentacion.medir('mostrar_camino')
     def _mostrar_solo_camino(self, subgrafo, nodos_camino):
         """
         Muestra sólo el subgrafo correspondiente al camino mínimo,
         respetando zoom/pan, y permitiendo zoom interactivo.
         """
-        self.ax.clear()
-        if self.mapa is not None:
-            self.ax.imshow(self.mapa, extent=[-180, 180, -90, 90], zorder=0)
-        else:
-            self.ax.set_facecolor("#E0E0E0")
-
-        # aplicar zoom y desplazamiento actuales
-        x_min, x_max = (-180 / self.zoom_scale) + self.pan_x, (180 / self.zoom_scale) + self.pan_x
-        y_min, y_max = (-90 / self.zoom_scale) + self.pan_y, (90 / self.zoom_scale) + self.pan_y
-        self.ax.set_xlim(x_min, x_max)
-        self.ax.set_ylim(y_min, y_max)
-        self.ax.set_axis_off()
-
         pos = self._get_positions(subgrafo)
+        nodos = [n for n in nodos_camino if n in pos]
+        textos = [f"{code}\n{self.grafo.aeropuertos.get(code, {}).get('nombre', '')[:15]}" for code in nodos]
 
-        # dibujar aristas del camino
-        segmentos = [[pos[u], pos[v]] for u in subgrafo for v in subgrafo[u] if u in pos and v in pos]
-        if segmentos:
-            self.ax.add_collection(LineCollection(segmentos, linewidths=1.5, colors="#E74C3C", alpha=0.9, zorder=2))
-
-        # dibujar nodos del camino (resaltados)
-        xs = [pos[n][0] for n in nodos_camino if n in pos]
-        ys = [pos[n][1] for n in nodos_camino if n in pos]
-        self.ax.scatter(xs, ys, s=40, c="#F4D03F", edgecolors="black", linewidths=0.7, zorder=3)
-
-        # etiquetas solo para los nodos del camino
-        for code in nodos_camino:
-            if code in pos:
-                x, y = pos[code]
-                nombre = self.grafo.aeropuertos.get(code, {}).get("nombre", "")
-                self.ax.text(x, y, f"{code}\n{nombre[:15]}",
-                             fontsize=7, ha="center", va="bottom", color="black", zorder=4)
-
-        self.canvas.draw_idle()
+        # etiquetas solo para los nodos del camino, siempre visibles
+        self._etiquetas_por_zoom = False
+        self.vista.mostrar(CapaAristas(subgrafo, pos), [pos[n] for n in nodos], nodos, textos,
+                           color_aristas="#E74C3C", color_nodos="#F4D03F", ancho_linea=1.5, alpha_lineas=0.9,
+                           tam_nodo=40, borde_nodo="black", ancho_borde=0.7, alpha_nodos=1.0,
+                           etiquetas_siempre=True, tam_fuente=7)
+        self._actualizar_vista()
 
     # ====== MOVIMIENTO Y ZOOM ======
     def _zoom_key(self, zoom_in):
         """
         Controla el zoom sobre el subgrafo actual (mantiene vista local).
+        Solo cambia los límites de los ejes: los artistas ya están creados.
         """
         self.zoom_scale *= self.zoom_step if zoom_in else 1 / self.zoom_step
         self.zoom_scale = max(0.5, min(self.zoom_scale, 5.0))
+        self._actualizar_vista()
 
-        # Redibuja el último subgrafo mostrado (camino, MST, grafo completo)
-        if self._subgrafo_actual:
-            # Si estamos mostrando un camino mínimo
-            if self._color_aristas == "#E74C3C":
-                self._mostrar_solo_camino(self._subgrafo_actual, list(self._subgrafo_actual.keys()))
-            else:
-                self.mostrar_grafo(self._subgrafo_actual, self._color_aristas, self._color_nodos)
-        else:
-            self.mostrar_grafo(self.grafo.grafo)
+    def _move_view(self, dx, dy):
+        """
+        Desplaza la vista (en grados, ajustado al zoom para que el paso se sienta igual).
+        """
+        self.pan_x += dx / self.zoom_scale
+        self.pan_y += dy / self.zoom_scale
+        self._actualizar_vista()
 
     def _reset_zoom(self):
         """
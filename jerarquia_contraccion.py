@@ -0,0 +1,259 @@
+import heapq
+import time
+import numpy as np
+
+INF = float('inf')
+
+
+class JerarquiaContraccion:
+    """Jerarquía de contracción sobre un GrafoCSR no dirigido, para caminos punto a punto rápidos.
+
+    - Preproceso: se contraen los vértices de a uno, del menos al más importante (diferencia
+      de aristas + vecinos ya contraídos, con actualización perezosa). Al contraer v, cada par de
+      vecinos u, w que no tenga un camino alternativo igual o más corto (búsqueda de testigo
+      acotada) recibe un atajo u–w con peso d(u,v) + d(v,w) que recuerda a v como intermedio.
+    - Consulta: Dijkstra bidireccional que solo sube de rango; se encuentran en el vértice
+      más importante del camino. Los atajos se desarman recursivamente para devolver la
+      secuencia completa de aeropuertos.
+    - Núcleo (opcional): con grado_nucleo, los vértices con más vecinos que eso se dejan sin
+      contraer; se preprocesa mucho más rápido en redes densas a cambio de consultas más lentas.
+    """
+
+    def __init__(self, csr, limite_testigo=25, grado_nucleo=None):
+        self.csr = csr
+        self.limite_testigo = limite_testigo  # vértices asentados como máximo en cada búsqueda de testigo
+        self.grado_nucleo = grado_nucleo if grado_nucleo is not None else INF
+        inicio = time.perf_counter()
+        self._contraer()
+        self.tiempo_preproceso = time.perf_counter() - inicio
+
+    # ====== PREPROCESO ======
+    def _contraer(self):
+        n = len(self.csr.codigos)
+        indptr, indices, pesos = self.csr.indptr.tolist(), self.csr.indices.tolist(), self.csr.pesos.tolist()
+        # Grafo que queda (solo vértices sin contraer): {vecino: peso}
+        adyacencia = [{} for _ in range(n)]
+        for u in range(n):
+            vecinos = adyacencia[u]
+            for w, peso in zip(indices[indptr[u]:indptr[u + 1]], pesos[indptr[u]:indptr[u + 1]]):
+                if w != u and peso < vecinos.get(w, INF):
+                    vecinos[w] = peso
+        medio = {}  # {(u, w) con u < w: vértice intermedio del atajo}
+
+        self.rango = [0] * n
+        self.arriba = [None] * n  # {vecino de mayor rango: (peso, intermedio o -1)}
+        contraidos_vecinos = [0] * n
+        self.atajos = 0
+
+        heap = [(self._prioridad(v, adyacencia, contraidos_vecinos), v) for v in range(n)]
+        heapq.heapify(heap)
+        siguiente_rango = 0
+        while heap:
+            prioridad, v = heapq.heappop(heap)
+            if self.arriba[v] is not None:
+                continue
+            vecinos = adyacencia[v]
+            if len(vecinos) > self.grado_nucleo:
+                # Demasiados vecinos: se aplaza. Si solo quedan aplazados y ninguno bajó del umbral, es el núcleo
+                if prioridad == INF:
+                    heapq.heappush(heap, (INF, v))
+                    reactivados = [u for _, u in heap if self.arriba[u] is None and len(adyacencia[u]) <= self.grado_nucleo]
+                    if not reactivados:
+                        break
+                    for u in reactivados:
+                        heapq.heappush(heap, (self._prioridad(u, adyacencia, contraidos_vecinos), u))
+                else:
+                    heapq.heappush(heap, (INF, v))
+                continue
+            # Actualización perezosa: si la prioridad empeoró y ya no es la mínima, vuelve a la cola
+            atajos = self._atajos_necesarios(v, adyacencia)
+            prioridad = len(atajos) - len(vecinos) + contraidos_vecinos[v]
+            if heap and prioridad > heap[0][0]:
+                heapq.heappush(heap, (prioridad, v))
+                continue
+
+            self.rango[v] = siguiente_rango
+            siguiente_rango += 1
+            self.arriba[v] = {w: (peso, medio.get((min(v, w), max(v, w)), -1)) for w, peso in vecinos.items()}
+
+            for u, w, peso in atajos:
+                if peso < adyacencia[u].get(w, INF):
+                    if w not in adyacencia[u]:
+                        self.atajos += 1
+                    adyacencia[u][w] = adyacencia[w][u] = peso
+                    medio[(min(u, w), max(u, w))] = v
+            for u in vecinos:
+                del adyacencia[u][v]
+                contraidos_vecinos[u] += 1
+            adyacencia[v] = {}
+
+        # Núcleo: los vértices que quedan no se contraen (contraerlos llena de atajos el grafo denso
+        # que forman los grandes hubs). Toman los rangos más altos y guardan todas sus aristas, así
+        # la consulta hace un Dijkstra bidireccional normal dentro del núcleo.
+        nucleo = [v for v in range(n) if self.arriba[v] is None]
+        for v in nucleo:
+            self.rango[v] = siguiente_rango
+            siguiente_rango += 1
+            self.arriba[v] = {w: (peso, medio.get((min(v, w), max(v, w)), -1)) for w, peso in adyacencia[v].items()}
+        self.nucleo = len(nucleo)
+
+    def _atajos_necesarios(self, v, adyacencia):
+        """Atajos (u, w, peso) que hacen falta al sacar v (cada par una vez, u < w)"""
+        vecinos = adyacencia[v]
+        if len(vecinos) < 2:
+            return []
+        maximo_salida = max(vecinos.values())
+        atajos = []
+        for u, peso_u in vecinos.items():
+            objetivos = {w: peso_u + peso_w for w, peso_w in vecinos.items() if w > u}
+            if not objetivos:
+                continue
+            testigo = self._testigo(u, v, objetivos, peso_u + maximo_salida, adyacencia)
+            for w, via in objetivos.items():
+                if testigo.get(w, INF) > via:
+                    atajos.append((u, w, via))
+        return atajos
+
+    def _testigo(self, origen, excluido, objetivos, cota, adyacencia):
+        """Dijkstra acotado desde origen sin pasar por excluido; para al superar la cota o el límite"""
+        distancias = {origen: 0}
+        heap = [(0, origen)]
+        asentados = 0
+        pendientes = len(objetivos)
+        while heap and asentados < self.limite_testigo and pendientes:
+            dist, u = heapq.heappop(heap)
+            if dist > distancias[u]:
+                continue
+            asentados += 1
+            if u in objetivos:
+                pendientes -= 1
+            for w, peso in adyacencia[u].items():
+                if w == excluido:
+                    continue
+                nueva = dist + peso
+                if nueva <= cota and nueva < distancias.get(w, INF):
+                    distancias[w] = nueva
+                    heapq.heappush(heap, (nueva, w))
+        return distancias
+
+    def _prioridad(self, v, adyacencia, contraidos_vecinos):
+        """Diferencia de aristas (atajos nuevos - aristas que se van) + vecinos ya contraídos"""
+        return len(self._atajos_necesarios(v, adyacencia)) - len(adyacencia[v]) + contraidos_vecinos[v]
+
+    # ====== CONSULTA ======
+    def camino(self, origen, destino):
+        """(distancia, camino de ids, asentados) entre dos ids; sin camino (inf, [], asentados)"""
+        if origen == destino:
+            return 0, [origen], 1
+
+        distancias = ({origen: 0}, {destino: 0})
+        previos = ({origen: -1}, {destino: -1})
+        heaps = ([(0, origen)], [(0, destino)])
+        asentados = 0
+        mejor, encuentro = INF, -1
+
+        lado = 0
+        while heaps[0] or heaps[1]:
+            # Alternar; un lado termina cuando su mínimo ya no puede mejorar el mejor encuentro
+            if not heaps[lado] or heaps[lado][0][0] >= mejor:
+                heaps[lado].clear()
+                lado = 1 - lado
+                continue
+            dist, u = heapq.heappop(heaps[lado])
+            if dist > distancias[lado][u]:
+                lado = 1 - lado
+                continue
+            asentados += 1
+            otro = distancias[1 - lado].get(u)
+            if otro is not None and dist + otro < mejor:
+                mejor, encuentro = dist + otro, u
+            for w, (peso, _) in self.arriba[u].items():
+                nueva = dist + peso
+                if nueva < distancias[lado].get(w, INF):
+                    distancias[lado][w] = nueva
+                    previos[lado][w] = u
+                    heapq.heappush(heaps[lado], (nueva, w))
+            lado = 1 - lado
+
+        if encuentro < 0:
+            return INF, [], asentados
+
+        # Subida desde el origen hasta el encuentro y bajada hasta el destino, con atajos desarmados
+        tramo = []
+        u = encuentro
+        while u != -1:
+            tramo.append(u)
+            u = previos[0][u]
+        tramo.reverse()
+        u = previos[1][encuentro]
+        while u != -1:
+            tramo.append(u)
+            u = previos[1][u]
+
+        camino = [tramo[0]]
+        for a, b in zip(tramo, tramo[1:]):
+            self._desarmar(a, b, camino)
+        return mejor, camino, asentados
+
+    def _arista(self, a, b):
+        """(peso, intermedio) de la arista a–b, guardada en el extremo de menor rango"""
+        return self.arriba[a][b] if self.rango[a] < self.rango[b] else self.arriba[b][a]
+
+    def _desarmar(self, a, b, camino):
+        """Agrega a camino los vértices de a→b (sin a), reemplazando atajos por sus tramos originales"""
+        pila = [(a, b)]
+        while pila:
+            a, b = pila.pop()
+            intermedio = self._arista(a, b)[1]
+            if intermedio < 0:
+                camino.append(b)
+            else:
+                pila.append((intermedio, b))
+                pila.append((a, intermedio))
+
+    # ====== PERSISTENCIA ======
+    def a_arreglos(self):
+        """Rangos y aristas hacia arriba en arreglos planos (formato CSR) para guardarlos con np.save"""
+        largos = [len(a) for a in self.arriba]
+        indptr = np.zeros(len(largos) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(largos)
+        return {
+            'rango': np.array(self.rango, dtype=np.int32),
+            'indptr': indptr,
+            'vecinos': np.fromiter((w for a in self.arriba for w in a), dtype=np.int32, count=indptr[-1]),
+            'pesos': np.fromiter((p for a in self.arriba for p, _ in a.values()), dtype=np.float64, count=indptr[-1]),
+            'intermedios': np.fromiter((m for a in self.arriba for _, m in a.values()), dtype=np.int32, count=indptr[-1]),
+            'datos': np.array([self.atajos, self.nucleo, self.tiempo_preproceso]),
+        }
+
+    @classmethod
+    def desde_arreglos(cls, csr, arreglos):
+        """Reconstruye una jerarquía guardada con a_arreglos sin volver a contraer"""
+        jerarquia = cls.__new__(cls)
+        jerarquia.csr = csr
+        jerarquia.rango = arreglos['rango'].tolist()
+        indptr = arreglos['indptr'].tolist()
+        vecinos, pesos = arreglos['vecinos'].tolist(), arreglos['pesos'].tolist()
+        intermedios = arreglos['intermedios'].tolist()
+        jerarquia.arriba = [dict(zip(vecinos[indptr[v]:indptr[v + 1]],
+                                     zip(pesos[indptr[v]:indptr[v + 1]], intermedios[indptr[v]:indptr[v + 1]])))
+                            for v in range(len(jerarquia.rango))]
+        atajos, nucleo, tiempo = arreglos['datos'].tolist()
+        jerarquia.atajos, jerarquia.nucleo, jerarquia.tiempo_preproceso = int(atajos), int(nucleo), tiempo
+        return jerarquia
+
+    def memoria(self):
+        """Bytes aproximados del índice (aristas hacia arriba con peso e intermedio, más los rangos)"""
+        aristas = sum(len(a) for a in self.arriba)
+        return aristas * 3 * 8 + len(self.rango) * 8
+
+    def estadisticas(self):
+        return {
+            'vertices': len(self.rango),
+            'aristas_originales': len(self.csr.indices) // 2,
+            'atajos': self.atajos,
+            'nucleo': self.nucleo,
+            'aristas_hacia_arriba': sum(len(a) for a in self.arriba),
+            'memoria_bytes': self.memoria(),
+            'preproceso_s': self.tiempo_preproceso,
+        }
@@ -1,11 +1,36 @@
 from grafo_aereopuertos import GrafoAeropuertos
-from interfaz_grafo import InterfazGrafo
+import instrumentacion
 import os
-import tkinter as tk
+import sys
+
+def buscar_csv(ruta_base):
+    """Busca un CSV en subcarpetas; pregunta cuál usar solo si hay una terminal para responder"""
+    interactivo = sys.stdin is not None and sys.stdin.isatty()
+    for root, _, files in os.walk(ruta_base):
+        for file in files:
+            if file.endswith('.csv'):
+                ruta_completa = os.path.join(root, file)
+                print(f"Encontrado: {ruta_completa}")
+                if not interactivo:
+                    return ruta_completa
+                usar = input("¿Usar este archivo? (s/n): ").strip().lower()
+                if usar == 's':
+                    return ruta_completa
+    return None
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        # Con argumentos: consultas por lotes sin interfaz (no se importa tkinter ni matplotlib)
+        from consultas_cli import main as main_cli
+        return main_cli(argv)
 
-def main():
     print("=== SISTEMA DE AEROPUERTOS - VALEN Y GABO ===")
 
+    # GRAFO_TRAZA / GRAFO_PERFIL: medir la sesión y exportar al cerrar (ver instrumentacion.py)
+    if instrumentacion.activar_desde_entorno():
+        print("Instrumentación activada")
+
     grafo = GrafoAeropuertos()
 
     # Ruta absoluta del CSV en la misma carpeta del script
@@ -19,32 +44,27 @@ def main():
         print("No se encontró 'flights_final.csv' en la carpeta del proyecto.")
         print("Buscando archivos CSV en subcarpetas...")
 
-        archivo_csv = None
-        for root, _, files in os.walk(ruta_base):
-            for file in files:
-                if file.endswith('.csv'):
-                    ruta_completa = os.path.join(root, file)
-                    print(f"Encontrado: {ruta_completa}")
-                    usar = input("¿Usar este archivo? (s/n): ").strip().lower()
-                    if usar == 's':
-                        archivo_csv = ruta_completa
-                        break
-            if archivo_csv:
-                break
+        archivo_csv = buscar_csv(ruta_base)
 
         if not archivo_csv:
             print("No se encontró ningún archivo CSV válido.")
             return
 
-    # === Cargar datos ===
-    if not grafo.cargar_datos(archivo_csv):
+    # === Cargar datos (desde el snapshot binario si el CSV no ha cambiado) ===
+    if not grafo.cargar_datos(archivo_csv, usar_snapshot=True):
         print("Error al cargar los datos.")
         return
 
-    # === Lanzar interfaz gráfica ===
+    # Índice de búsqueda por texto, para que la primera sugerencia de la interfaz no espere a construirlo
+    grafo.indice_busqueda()
+
+    # === Lanzar interfaz gráfica (se importa recién aquí) ===
+    import tkinter as tk
+    from interfaz_grafo import InterfazGrafo
+
     root = tk.Tk()
     app = InterfazGrafo(root, grafo)
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import os
+import numpy as np
+
+EXTENT_MUNDO = [-180, 180, -90, 90]
+
+_piramides = {}  # {(ruta, mtime, tamaño): PiramideMapa}, para decodificar cada archivo una sola vez
+
+
+class PiramideMapa:
+    """Imagen del mapamundi en varias resoluciones (cada nivel a la mitad del anterior).
+
+    Se arma una vez en memoria. Al dibujar se elige el nivel cuya resolución alcanza para
+    la vista y se recorta solo la región visible (un slice de NumPy, sin copiar), así que
+    alejado se dibuja una imagen chica y acercado solo el pedazo nítido que se ve.
+    """
+
+    def __init__(self, imagen, ancho_minimo=256):
+        self.niveles = [np.ascontiguousarray(imagen)]
+        while self.niveles[-1].shape[1] // 2 >= ancho_minimo:
+            previo = self.niveles[-1].astype(np.uint16)
+            alto, ancho = previo.shape[:2]
+            previo = previo[:alto // 2 * 2, :ancho // 2 * 2]
+            # Promedio de bloques de 2x2
+            reducido = (previo[0::2, 0::2] + previo[1::2, 0::2] + previo[0::2, 1::2] + previo[1::2, 1::2] + 2) // 4
+            self.niveles.append(reducido.astype(np.uint8))
+
+    def nivel_para(self, x_min, x_max, max_ancho):
+        """Nivel más chico que todavía da ~1 píxel de imagen por píxel de pantalla"""
+        ancho_vista = (min(x_max, 180) - max(x_min, -180)) / 360.0
+        nivel = 0
+        while nivel + 1 < len(self.niveles) and self.niveles[nivel + 1].shape[1] * ancho_vista >= max_ancho:
+            nivel += 1
+        return nivel
+
+    def vista(self, x_min, x_max, y_min, y_max, max_ancho=1024):
+        """Recorte del nivel adecuado que cubre la vista: (imagen, extent) listo para imshow (origen arriba)"""
+        imagen = self.niveles[self.nivel_para(x_min, x_max, max_ancho)]
+        alto, ancho = imagen.shape[:2]
+
+        c0 = int(np.clip(np.floor((x_min + 180) / 360 * ancho), 0, ancho))
+        c1 = int(np.clip(np.ceil((x_max + 180) / 360 * ancho), 0, ancho))
+        f0 = int(np.clip(np.floor((90 - y_max) / 180 * alto), 0, alto))
+        f1 = int(np.clip(np.ceil((90 - y_min) / 180 * alto), 0, alto))
+        extent = [c0 / ancho * 360 - 180, c1 / ancho * 360 - 180, 90 - f1 / alto * 180, 90 - f0 / alto * 180]
+        return imagen[f0:f1, c0:c1], extent
+
+
+def decodificar_mapa(ruta, tamano=(2048, 1024)):
+    """Lee la imagen en memoria, quita la transparencia (fondo blanco) y la lleva a tamano"""
+    from PIL import Image
+
+    img = Image.open(ruta).convert("RGBA")
+    fondo = Image.new("RGB", img.size, (255, 255, 255))
+    fondo.paste(img, mask=img.split()[3])
+    # 2:1 se adapta bien a las coordenadas [-180,180]x[-90,90]
+    return np.asarray(fondo.resize(tamano))
+
+
+def cargar_piramide(ruta, tamano=(2048, 1024)):
+    """PiramideMapa de la imagen, decodificada una vez por proceso mientras el archivo no cambie"""
+    info = os.stat(ruta)
+    clave = (os.path.abspath(ruta), info.st_mtime_ns, info.st_size, tamano)
+    if clave not in _piramides:
+        _piramides[clave] = PiramideMapa(decodificar_mapa(ruta, tamano))
+    return _piramides[clave]
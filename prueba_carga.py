@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.parse import urlencode
+
+# Prueba de carga local para servidor_http.py: varias conexiones keep-alive mandan consultas
+# mezcladas durante un tiempo fijo y al final se reporta el rendimiento y la latencia.
+#
+#   python servidor_http.py --csv flights_final.csv &
+#   python prueba_carga.py --conexiones 32 --duracion 10
+
+
+async def pedir(lector, escritor, host, ruta):
+    """Una petición GET sobre una conexión abierta; devuelve (estado, cuerpo)"""
+    escritor.write(f"GET {ruta} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1'))
+    await escritor.drain()
+    estado = int((await lector.readline()).split()[1])
+    largo = 0
+    while True:
+        linea = await lector.readline()
+        if linea in (b'\r\n', b''):
+            break
+        nombre, _, valor = linea.decode('latin-1').partition(':')
+        if nombre.strip().lower() == 'content-length':
+            largo = int(valor)
+    return estado, await lector.readexactly(largo)
+
+
+def generar_consulta(codigos, mezcla, azar):
+    """Ruta aleatoria según la mezcla {endpoint: peso}; se repiten orígenes para que haya agrupación"""
+    tipo = azar.choices(list(mezcla), weights=list(mezcla.values()))[0]
+    frecuentes = codigos[:50]
+    if tipo == 'camino':
+        return tipo, '/camino?' + urlencode({'origen': azar.choice(codigos), 'destino': azar.choice(codigos)})
+    if tipo == 'lejanos':
+        return tipo, '/lejanos?' + urlencode({'codigo': azar.choice(frecuentes), 'k': 10})
+    if tipo == 'dijkstra':
+        return tipo, '/dijkstra?' + urlencode({'origen': azar.choice(frecuentes),
+                                               'destinos': ','.join(azar.sample(codigos, 5))})
+    return tipo, f'/{tipo}'
+
+
+async def cliente(host, puerto, codigos, mezcla, fin, latencias, errores, semilla):
+    azar = random.Random(semilla)
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    try:
+        while time.perf_counter() < fin:
+            tipo, ruta = generar_consulta(codigos, mezcla, azar)
+            inicio = time.perf_counter()
+            estado, _ = await pedir(lector, escritor, host, ruta)
+            latencias.setdefault(tipo, []).append((time.perf_counter() - inicio) * 1000)
+            if estado != 200:
+                errores[tipo] = errores.get(tipo, 0) + 1
+    finally:
+        escritor.close()
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+async def correr(args):
+    lector, escritor = await asyncio.open_connection(args.host, args.puerto)
+    _, cuerpo = await pedir(lector, escritor, args.host, '/aeropuertos')
+    escritor.close()
+    codigos = json.loads(cuerpo)['aeropuertos']
+    random.Random(0).shuffle(codigos)
+
+    mezcla = dict(parte.split('=') for parte in args.mezcla.split(','))
+    mezcla = {tipo: float(peso) for tipo, peso in mezcla.items()}
+    latencias, errores = {}, {}
+    inicio = time.perf_counter()
+    fin = inicio + args.duracion
+    await asyncio.gather(*(cliente(args.host, args.puerto, codigos, mezcla, fin, latencias, errores, i)
+                           for i in range(args.conexiones)))
+    duracion = time.perf_counter() - inicio
+
+    todas = [ms for valores in latencias.values() for ms in valores]
+    print(f"{len(todas)} consultas en {duracion:.1f} s con {args.conexiones} conexiones: "
+          f"{len(todas) / duracion:.1f} consultas/s")
+    print(f"{'endpoint':<12}{'n':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errores':>9}")
+    for tipo, valores in sorted(latencias.items()) + [('total', todas)]:
+        print(f"{tipo:<12}{len(valores):>8}{percentil(valores, 50):>10.1f}{percentil(valores, 99):>10.1f}"
+              f"{max(valores):>10.1f}{errores.get(tipo, sum(errores.values()) if tipo == 'total' else 0):>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Prueba de carga para servidor_http.py')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--conexiones', type=int, default=16)
+    parser.add_argument('--duracion', type=float, default=10.0, help='segundos')
+    parser.add_argument('--mezcla', default='camino=6,lejanos=2,dijkstra=1,conexidad=0.5,mst=0.5',
+                        help='peso de cada tipo de consulta')
+    asyncio.run(correr(parser.parse_args(argv)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import sys
+import threading
+import tkinter as tk
+
+
+class SalidaBuffer:
+    """Salida de texto (para sys.stdout) que junta lo escrito y lo vuelca al widget cada intervalo_ms.
+
+    - write() se puede llamar desde cualquier hilo: solo agrega a una lista bajo un lock.
+    - El volcado corre en el hilo de Tk con root.after y hace un solo insert y un solo see
+      por tanda, en lugar de uno por cada print.
+    - El widget guarda como mucho max_lineas; las más viejas se borran.
+    """
+
+    def __init__(self, root, texto, intervalo_ms=100, max_lineas=5000, eco=None):
+        self.root = root
+        self.texto = texto
+        self.intervalo_ms = intervalo_ms
+        self.max_lineas = max_lineas
+        self.eco = eco if eco is not None else sys.__stdout__  # copia en la consola
+        self._partes = []
+        self._lock = threading.Lock()
+        self._programado = False
+
+    def write(self, texto):
+        with self._lock:
+            self._partes.append(texto)
+        # Desde otro hilo no se puede usar root.after: el volcado lo programa el hilo de Tk
+        # en su próxima revisión (ver EjecutorTareas.al_revisar)
+        if threading.current_thread() is threading.main_thread():
+            self.programar()
+
+    def flush(self):
+        if threading.current_thread() is threading.main_thread():
+            self.programar()
+
+    def programar(self):
+        """Agenda un volcado si hay texto pendiente y no hay uno agendado (solo desde el hilo de Tk)"""
+        if self._partes and not self._programado:
+            self._programado = True
+            self.root.after(self.intervalo_ms, self.volcar)
+
+    def volcar(self):
+        """Escribe en el widget todo lo acumulado de una vez"""
+        self._programado = False
+        with self._lock:
+            partes, self._partes = self._partes, []
+        if not partes:
+            return
+        texto = "".join(partes)
+
+        try:
+            self.texto.insert(tk.END, texto)
+            lineas = int(self.texto.index("end-1c").split(".")[0])
+            if lineas > self.max_lineas:
+                self.texto.delete("1.0", f"{lineas - self.max_lineas + 1}.0")
+            self.texto.see(tk.END)
+        except tk.TclError:
+            pass  # la ventana ya se cerró
+        if self.eco is not None:
+            self.eco.write(texto)
+            self.eco.flush()
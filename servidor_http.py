@@ -0,0 +1,313 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+from grafo_aereopuertos import GrafoAeropuertos
+
+# Servicio HTTP/JSON local con el grafo cargado en memoria (solo biblioteca estándar, sin tkinter):
+#
+#   python servidor_http.py --csv flights_final.csv --puerto 8765 --procesos 4
+#   curl 'localhost:8765/camino?origen=BOG&destino=MAD'
+#
+# GET /dijkstra?origen=X[&destinos=A,B]   GET /camino?origen=X&destino=Y[&modo=astar]
+# GET /lejanos?codigo=X[&k=10]            GET /conexidad      GET /mst[?motor=kruskal]
+# GET /aeropuertos                        GET /metricas (histogramas de latencia)
+
+_grafo = None  # grafo del proceso (o hilo) trabajador
+
+
+class ErrorConsulta(Exception):
+    """Error del cliente: se responde con el código HTTP indicado"""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+# ====== CONSULTAS (corren en el pool de trabajadores) ======
+def _iniciar_trabajador(ruta_csv, grafo=None):
+    """Carga el grafo una vez por trabajador (desde el snapshot, que ya dejó listo el proceso principal)"""
+    global _grafo
+    if grafo is None:
+        grafo = GrafoAeropuertos()
+        with contextlib.redirect_stdout(sys.stderr):
+            grafo.cargar_datos(ruta_csv, usar_snapshot=True)
+    _grafo = grafo
+
+
+def _codigo(parametros, nombre):
+    codigo = parametros.get(nombre, '').strip().upper()
+    if not codigo:
+        raise ErrorConsulta(400, f"Falta el parámetro '{nombre}'")
+    if codigo not in _grafo.aeropuertos:
+        raise ErrorConsulta(404, f"Aeropuerto {codigo} no encontrado")
+    return codigo
+
+
+def _entero(parametros, nombre, por_defecto):
+    try:
+        return int(parametros.get(nombre, por_defecto))
+    except ValueError:
+        raise ErrorConsulta(400, f"El parámetro '{nombre}' debe ser entero")
+
+
+def consultar_dijkstra(parametros):
+    origen = _codigo(parametros, 'origen')
+    distancias, _ = _grafo.dijkstra(origen)
+    if 'destinos' in parametros:
+        destinos = [c.strip().upper() for c in parametros['destinos'].split(',') if c.strip()]
+        distancias = {c: distancias.get(c, float('inf')) for c in destinos}
+    return {'origen': origen,
+            'distancias': {c: d for c, d in distancias.items() if d != float('inf')}}
+
+
+def consultar_camino(parametros):
+    origen, destino = _codigo(parametros, 'origen'), _codigo(parametros, 'destino')
+    modo = parametros.get('modo', 'astar')
+    if modo not in ('astar', 'bidireccional', 'dijkstra', 'ch'):
+        raise ErrorConsulta(400, f"Modo de búsqueda desconocido: {modo}")
+    distancia, camino, asentados = _grafo.camino_punto_a_punto(origen, destino, modo)
+    return {'origen': origen, 'destino': destino,
+            'distancia': distancia if distancia != float('inf') else None,
+            'camino': camino, 'explorados': asentados}
+
+
+def consultar_lejanos(parametros):
+    codigo = _codigo(parametros, 'codigo')
+    k = _entero(parametros, 'k', 10)
+    lejanos = _grafo.aeropuertos_mas_lejanos(codigo, k)
+    return {'codigo': codigo, 'k': k, 'lejanos': [{'codigo': c, 'distancia': d} for c, d in lejanos]}
+
+
+def consultar_conexidad(parametros):
+    es_conexo, componentes = _grafo.es_conexo()
+    return {'es_conexo': es_conexo,
+            'componentes': [{'aeropuertos': len(comp), 'ejemplo': comp[0]} for comp in componentes]}
+
+
+def consultar_mst(parametros):
+    motor = parametros.get('motor') or None
+    if motor not in (None, 'kruskal', 'boruvka', 'prim'):
+        raise ErrorConsulta(400, f"Motor de MST desconocido: {motor}")
+    bosque = _grafo.bosque_expansion_minima(motor)
+    return {'motor': motor or _grafo.motor_mst,
+            'peso_total': sum(peso for peso, _ in bosque),
+            'componentes': [{'aeropuertos': len(aristas) + 1, 'aristas': len(aristas), 'peso': peso}
+                            for peso, aristas in bosque]}
+
+
+def consultar_aeropuertos(parametros):
+    return {'aeropuertos': list(_grafo.aeropuertos)}
+
+
+CONSULTAS = {
+    '/dijkstra': consultar_dijkstra,
+    '/camino': consultar_camino,
+    '/lejanos': consultar_lejanos,
+    '/conexidad': consultar_conexidad,
+    '/mst': consultar_mst,
+    '/aeropuertos': consultar_aeropuertos,
+}
+
+
+def _resolver(ruta, parametros):
+    """Corre la consulta en el trabajador; devuelve (estado HTTP, cuerpo JSON ya serializado)"""
+    try:
+        return 200, json.dumps(CONSULTAS[ruta](dict(parametros)), ensure_ascii=False)
+    except ErrorConsulta as e:
+        return e.estado, json.dumps({'error': str(e)}, ensure_ascii=False)
+
+
+# ====== MÉTRICAS ======
+class HistogramaLatencia:
+    """Conteo de latencias en cubetas de ancho creciente (x2), de 0.25 ms a ~70 s"""
+
+    LIMITES_MS = [0.25 * 2 ** i for i in range(19)]
+
+    def __init__(self):
+        self.cubetas = [0] * (len(self.LIMITES_MS) + 1)
+        self.total = 0
+        self.suma_ms = 0.0
+        self.maximo_ms = 0.0
+
+    def registrar(self, ms):
+        i = 0
+        while i < len(self.LIMITES_MS) and ms > self.LIMITES_MS[i]:
+            i += 1
+        self.cubetas[i] += 1
+        self.total += 1
+        self.suma_ms += ms
+        self.maximo_ms = max(self.maximo_ms, ms)
+
+    def percentil(self, p):
+        """Cota superior de la cubeta donde cae el percentil p (0-100)"""
+        if not self.total:
+            return 0.0
+        objetivo = p / 100 * self.total
+        acumulado = 0
+        for limite, cantidad in zip(self.LIMITES_MS + [self.maximo_ms], self.cubetas):
+            acumulado += cantidad
+            if acumulado >= objetivo:
+                return min(limite, self.maximo_ms)
+        return self.maximo_ms
+
+    def resumen(self):
+        return {
+            'consultas': self.total,
+            'media_ms': self.suma_ms / self.total if self.total else 0.0,
+            'p50_ms': self.percentil(50),
+            'p90_ms': self.percentil(90),
+            'p99_ms': self.percentil(99),
+            'max_ms': self.maximo_ms,
+            'cubetas': {f"<={limite:g}ms": n for limite, n in zip(self.LIMITES_MS, self.cubetas) if n},
+        }
+
+
+# ====== SERVIDOR ======
+class ServidorGrafo:
+    """Servidor HTTP/1.1 mínimo sobre asyncio.
+
+    - El lazo de eventos solo lee peticiones y escribe respuestas; las búsquedas corren en
+      el pool (procesos con su propia copia del grafo, o un hilo si procesos=0).
+    - Consultas idénticas simultáneas se agrupan: corre una sola y todas esperan su resultado.
+    - Cada ruta tiene su histograma de latencia, visible en /metricas.
+    """
+
+    def __init__(self, ruta_csv, procesos=None):
+        self.ruta_csv = ruta_csv
+        self.procesos = (os.cpu_count() or 1) if procesos is None else procesos
+        self.histogramas = {ruta: HistogramaLatencia() for ruta in CONSULTAS}
+        self.en_curso = {}  # {(ruta, parámetros): Future compartido}
+        self.agrupadas = 0
+        self.pool = None
+
+    def iniciar_pool(self):
+        if self.procesos == 0:
+            # Un solo hilo: el grafo del proceso principal y sus cachés no admiten accesos simultáneos
+            grafo = GrafoAeropuertos()
+            with contextlib.redirect_stdout(sys.stderr):
+                if not grafo.cargar_datos(self.ruta_csv, usar_snapshot=True):
+                    raise SystemExit(1)
+            self.pool = ThreadPoolExecutor(1, initializer=_iniciar_trabajador, initargs=(self.ruta_csv, grafo))
+        else:
+            # El proceso principal deja el snapshot al día para que cada trabajador cargue rápido
+            with contextlib.redirect_stdout(sys.stderr):
+                if not GrafoAeropuertos().cargar_datos(self.ruta_csv, usar_snapshot=True):
+                    raise SystemExit(1)
+            self.pool = ProcessPoolExecutor(self.procesos, initializer=_iniciar_trabajador,
+                                            initargs=(self.ruta_csv,))
+        # Forzar la carga en los trabajadores antes de aceptar conexiones
+        list(self.pool.map(_resolver, ['/aeropuertos'] * max(self.procesos, 1), [()] * max(self.procesos, 1)))
+
+    async def consultar(self, ruta, parametros):
+        clave = (ruta, tuple(sorted(parametros.items())))
+        futuro = self.en_curso.get(clave)
+        if futuro is not None:
+            self.agrupadas += 1
+            return await asyncio.shield(futuro)
+
+        lazo = asyncio.get_running_loop()
+        futuro = lazo.run_in_executor(self.pool, _resolver, ruta, clave[1])
+        self.en_curso[clave] = futuro
+        try:
+            return await asyncio.shield(futuro)
+        finally:
+            self.en_curso.pop(clave, None)
+
+    def metricas(self):
+        return {'procesos': self.procesos, 'agrupadas': self.agrupadas,
+                'rutas': {ruta: h.resumen() for ruta, h in self.histogramas.items() if h.total}}
+
+    async def atender(self, lector, escritor):
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    metodo, objetivo, version = linea.decode('latin-1').split()
+                except ValueError:
+                    await self._responder(escritor, 400, {'error': 'Petición mal formada'}, False)
+                    break
+
+                cabeceras = {}
+                while True:
+                    linea = await lector.readline()
+                    if linea in (b'\r\n', b'\n', b''):
+                        break
+                    nombre, _, valor = linea.decode('latin-1').partition(':')
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                if 'content-length' in cabeceras:
+                    await lector.readexactly(int(cabeceras['content-length']))
+
+                seguir = (cabeceras.get('connection', '').lower() != 'close'
+                          and version.upper() == 'HTTP/1.1')
+                inicio = time.perf_counter()
+                url = urlsplit(objetivo)
+                parametros = dict(parse_qsl(url.query))
+
+                if metodo != 'GET':
+                    await self._responder(escritor, 405, {'error': 'Solo se admite GET'}, seguir)
+                elif url.path == '/metricas':
+                    await self._responder(escritor, 200, self.metricas(), seguir)
+                elif url.path not in CONSULTAS:
+                    await self._responder(escritor, 404, {'error': f'Ruta desconocida: {url.path}'}, seguir)
+                else:
+                    try:
+                        estado, cuerpo = await self.consultar(url.path, parametros)
+                    except Exception as e:
+                        estado, cuerpo = 500, json.dumps({'error': str(e)}, ensure_ascii=False)
+                    await self._responder(escritor, estado, cuerpo, seguir)
+                    self.histogramas[url.path].registrar((time.perf_counter() - inicio) * 1000)
+
+                if not seguir:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, escritor, estado, cuerpo, seguir):
+        if not isinstance(cuerpo, str):
+            cuerpo = json.dumps(cuerpo, ensure_ascii=False)
+        datos = cuerpo.encode('utf-8')
+        razon = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}.get(estado, 'Error')
+        escritor.write((f"HTTP/1.1 {estado} {razon}\r\n"
+                        "Content-Type: application/json; charset=utf-8\r\n"
+                        f"Content-Length: {len(datos)}\r\n"
+                        f"Connection: {'keep-alive' if seguir else 'close'}\r\n\r\n").encode('latin-1') + datos)
+        await escritor.drain()
+
+    async def servir(self, host='127.0.0.1', puerto=8765):
+        self.iniciar_pool()
+        servidor = await asyncio.start_server(self.atender, host, puerto)
+        print(f"Escuchando en http://{host}:{puerto} ({self.procesos} procesos)", file=sys.stderr)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    ruta_base = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='Servicio HTTP/JSON de consultas sobre la red de aeropuertos')
+    parser.add_argument('--csv', default=os.path.join(ruta_base, 'flights_final.csv'))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--procesos', type=int, help='procesos trabajadores (0 = un hilo en este proceso)')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(ServidorGrafo(args.csv, args.procesos).servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+import sys
+from collections.abc import Mapping, MutableMapping
+import numpy as np
+
+CAMPOS = ('nombre', 'ciudad', 'pais', 'latitud', 'longitud')
+
+
+def _internar(valor):
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
+class RegistroAeropuerto(Mapping):
+    """Vista tipo dict de una fila de la tabla: info['latitud'] lee la columna e info['nombre'] = x la escribe"""
+    __slots__ = ('_tabla', '_id')
+
+    def __init__(self, tabla, id_aeropuerto):
+        self._tabla = tabla
+        self._id = id_aeropuerto
+
+    def __getitem__(self, campo):
+        tabla, i = self._tabla, self._id
+        if campo == 'latitud':
+            return float(tabla._lat[i])
+        if campo == 'longitud':
+            return float(tabla._lon[i])
+        if campo == 'nombre':
+            return tabla.nombres[i]
+        if campo == 'ciudad':
+            return tabla.ciudades[i]
+        if campo == 'pais':
+            return tabla.paises[i]
+        raise KeyError(campo)
+
+    def __setitem__(self, campo, valor):
+        tabla, i = self._tabla, self._id
+        if campo == 'latitud':
+            tabla._lat[i] = valor
+        elif campo == 'longitud':
+            tabla._lon[i] = valor
+        elif campo in ('nombre', 'ciudad', 'pais'):
+            getattr(tabla, {'nombre': 'nombres', 'ciudad': 'ciudades', 'pais': 'paises'}[campo])[i] = _internar(valor)
+        else:
+            raise KeyError(campo)
+
+    def __iter__(self):
+        return iter(CAMPOS)
+
+    def __len__(self):
+        return len(CAMPOS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class TablaAeropuertos(MutableMapping):
+    """Datos de los aeropuertos por columnas, indexados por un id entero en orden de llegada.
+
+    - codigos, nombres, ciudades y paises son listas de strings internados (cada ciudad o país
+      repetido se guarda una vez); latitudes y longitudes son arreglos float64 de NumPy.
+    - Como diccionario {codigo: info} sigue funcionando igual que antes: tabla[codigo] devuelve
+      un RegistroAeropuerto que lee y escribe sobre las columnas, y tabla[codigo] = {...} agrega
+      o reemplaza un aeropuerto.
+    """
+
+    def __init__(self):
+        self.codigos = []   # {id: codigo}
+        self.ids = {}       # {codigo: id}
+        self.nombres = []
+        self.ciudades = []
+        self.paises = []
+        self._lat = np.empty(0, dtype=np.float64)  # con capacidad extra para agregar de a uno
+        self._lon = np.empty(0, dtype=np.float64)
+
+    @classmethod
+    def desde_columnas(cls, codigos, nombres, ciudades, paises, latitudes, longitudes):
+        tabla = cls()
+        tabla.agregar_lote(codigos, nombres, ciudades, paises, latitudes, longitudes)
+        return tabla
+
+    # ====== COLUMNAS ======
+    @property
+    def latitudes(self):
+        return self._lat[:len(self.codigos)]
+
+    @property
+    def longitudes(self):
+        return self._lon[:len(self.codigos)]
+
+    def coordenadas(self, codigos):
+        """(latitudes, longitudes) de una lista de códigos, como arreglos alineados con ella"""
+        ids = np.fromiter((self.ids[c] for c in codigos), dtype=np.int64, count=len(codigos))
+        return self._lat[ids], self._lon[ids]
+
+    def _reservar(self, n):
+        if n > len(self._lat):
+            capacidad = max(n, 2 * len(self._lat), 16)
+            for nombre in ('_lat', '_lon'):
+                columna = np.full(capacidad, np.nan)
+                columna[:len(self.codigos)] = getattr(self, nombre)[:len(self.codigos)]
+                setattr(self, nombre, columna)
+
+    # ====== ALTAS Y BAJAS ======
+    def agregar(self, codigo, nombre, ciudad, pais, latitud, longitud):
+        """Agrega un aeropuerto (o reemplaza sus datos si el código ya está); devuelve su id"""
+        i = self.ids.get(codigo)
+        if i is not None:
+            self.nombres[i], self.ciudades[i], self.paises[i] = _internar(nombre), _internar(ciudad), _internar(pais)
+            self._lat[i], self._lon[i] = latitud, longitud
+            return i
+        i = len(self.codigos)
+        self._reservar(i + 1)
+        codigo = _internar(codigo)
+        self.codigos.append(codigo)
+        self.ids[codigo] = i
+        self.nombres.append(_internar(nombre))
+        self.ciudades.append(_internar(ciudad))
+        self.paises.append(_internar(pais))
+        self._lat[i], self._lon[i] = latitud, longitud
+        return i
+
+    def agregar_lote(self, codigos, nombres, ciudades, paises, latitudes, longitudes):
+        """Agrega muchos aeropuertos nuevos (códigos que todavía no están) con una sola copia de las coordenadas"""
+        inicio = len(self.codigos)
+        codigos = [_internar(c) for c in codigos]
+        self._reservar(inicio + len(codigos))
+        self._lat[inicio:inicio + len(codigos)] = latitudes
+        self._lon[inicio:inicio + len(codigos)] = longitudes
+        for i, codigo in enumerate(codigos, inicio):
+            self.ids[codigo] = i
+        self.codigos.extend(codigos)
+        self.nombres.extend(map(_internar, nombres))
+        self.ciudades.extend(map(_internar, ciudades))
+        self.paises.extend(map(_internar, paises))
+
+    def quitar(self, codigo):
+        """Quita un aeropuerto; los ids de los que vienen después bajan en uno (O(n)).
+
+        Todo lo que se indexó por id sobre esta tabla queda desalineado: en un grafo hay que usar
+        GrafoAeropuertos.quitar_aeropuerto, que también quita las rutas y rehace esos índices.
+        """
+        i = self.ids.pop(codigo)
+        n = len(self.codigos)
+        for columna in (self.codigos, self.nombres, self.ciudades, self.paises):
+            del columna[i]
+        for nombre in ('_lat', '_lon'):
+            columna = getattr(self, nombre)
+            columna[i:n - 1] = columna[i + 1:n].copy()
+        for j in range(i, n - 1):
+            self.ids[self.codigos[j]] = j
+
+    # ====== INTERFAZ DE DICCIONARIO ======
+    def __delitem__(self, codigo):
+        # Con del los ids se correrían sin que se enteren los índices construidos sobre ellos
+        raise TypeError(f"No se puede borrar {codigo!r} con del: usar GrafoAeropuertos.quitar_aeropuerto "
+                        "(o TablaAeropuertos.quitar si la tabla no pertenece a un grafo)")
+
+    def __getitem__(self, codigo):
+        return RegistroAeropuerto(self, self.ids[codigo])
+
+    def __setitem__(self, codigo, info):
+        self.agregar(codigo, info['nombre'], info['ciudad'], info['pais'], info['latitud'], info['longitud'])
+
+    def __contains__(self, codigo):
+        return codigo in self.ids
+
+    def __iter__(self):
+        return iter(self.codigos)
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __repr__(self):
+        return f"TablaAeropuertos({len(self)} aeropuertos)"
+
+    def memoria(self):
+        """Bytes aproximados: punteros de las listas, coordenadas y el índice por código (sin los strings)"""
+        n = len(self.codigos)
+        return n * 4 * 8 + self._lat.nbytes + self._lon.nbytes + sys.getsizeof(self.ids)
@@ -0,0 +1,325 @@
+import math
+import time
+from collections import deque
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgb
+from matplotlib.figure import Figure
+from indice_espacial import IndiceEspacial
+from mapa_fondo import PiramideMapa, EXTENT_MUNDO
+import instrumentacion
+
+
+class ImagenPantalla(Artist):
+    """Imagen RGBA del tamaño del eje en píxeles, pegada tal cual sobre él (sin remuestrear).
+
+    Las filas van de abajo hacia arriba, como las espera draw_image.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.imagen = None
+
+    def draw(self, renderer):
+        if not self.get_visible() or self.imagen is None:
+            return
+        caja = self.axes.bbox
+        gc = renderer.new_gc()
+        gc.set_clip_rectangle(caja)
+        renderer.draw_image(gc, round(caja.x0), round(caja.y0), self.imagen)
+        gc.restore()
+
+
+class VistaMapa:
+    """Artistas persistentes del mapa (fondo, aristas, nodos y etiquetas).
+
+    Se crean una sola vez; al cambiar de grafo solo se cambian sus datos y al hacer zoom/pan
+    solo se mueven los límites de los ejes. Las etiquetas no son artistas del eje: cada texto
+    se rasteriza una vez a una imagen chica (sprite) y se pinta encima del mapa después de cada
+    dibujo. Si lo único que cambia es qué etiquetas se ven (mismos límites y datos), se restaura
+    el último fondo y se pintan encima con blitting, sin redibujar el mapa.
+
+    Nivel de detalle: alejado, las aristas (raster de densidad) y los nodos (un punto por nodo)
+    se componen con NumPy en una sola imagen del tamaño del eje en píxeles que se pega sin
+    remuestrear (ImagenPantalla); matplotlib no tiene que dibujar miles de marcadores uno por uno.
+    Acercado, las aristas son líneas y el scatter recibe solo los nodos dentro de la vista.
+    """
+
+    def __init__(self, ax, canvas, mapa=None, max_etiquetas=300, max_nodos=2000):
+        self.ax = ax
+        self.canvas = canvas
+        self.max_etiquetas = max_etiquetas  # con más etiquetas en vista no se lee ninguna
+        self.max_nodos = max_nodos          # con más nodos en vista se dibujan en el raster
+
+        self.ax.set_axis_off()
+        self.ax.set_aspect("equal")
+        if mapa is not None:
+            # Se acepta una imagen suelta o una PiramideMapa; al mover la vista se cambia el recorte
+            self.piramide = mapa if isinstance(mapa, PiramideMapa) else PiramideMapa(mapa)
+            self.fondo = self.ax.imshow(self.piramide.niveles[-1], extent=EXTENT_MUNDO, zorder=0)
+        else:
+            self.piramide = None
+            self.fondo = None
+            self.ax.set_facecolor("#E0E0E0")
+
+        self.lineas = LineCollection([], zorder=2)
+        self.ax.add_collection(self.lineas)
+        self.nodos = self.ax.scatter([], [], zorder=3)
+        self.raster = ImagenPantalla()  # nivel de detalle: aristas y nodos ya compuestos, sobre las líneas
+        self.raster.set_zorder(2.5)
+        self.raster.set_visible(False)
+        self.ax.add_artist(self.raster)
+        self.estilo_nodos = (to_rgb("#007ACC"), 0.8, 15)  # (color, alpha, tamaño) para el raster
+
+        self._sprites = {}         # {(texto, tamaño de fuente, dpi): imagen RGBA}, se rasterizan una vez
+        self._lienzo_sprites = None  # figura fuera de pantalla donde se rasterizan los sprites
+        self._con_etiqueta = []    # índices de los nodos con etiqueta visible ahora
+        self._datos = 0            # aumenta con cada mostrar(), para saber si la escena cambió
+        self._escena = None        # (límites, datos) de lo último pedido a actualizar
+        self._escena_dibujada = None  # (límites, datos) del último dibujo completo (el de _fondo_blit)
+        self.capa = None
+        self.xy = np.empty((0, 2))
+        self.indice = None         # IndiceEspacial de los nodos mostrados, para recortar etiquetas
+        self.codigos = []
+        self.textos = []
+        self.estilo_etiqueta = {}
+        self.color_aristas = "#444"
+        self.etiquetas_siempre = False
+        self._ultimo_pedido = None  # argumentos del último actualizar, para rehacerlo al cambiar el tamaño
+
+        # Medición de latencia: tiempo entre pedir un cuadro y terminar de dibujarlo
+        self.tiempos_frame = deque(maxlen=200)  # ms
+        self.al_dibujar = None                  # callback(ms) opcional
+        self._pedido = None
+        self._fondo_blit = None
+        self.canvas.mpl_connect("draw_event", self._al_dibujar)
+        self.canvas.mpl_connect("resize_event", self._al_redimensionar)
+
+    # ====== DATOS ======
+    @instrumentacion.medir('vista.mostrar')
+    def mostrar(self, capa, xy, codigos, textos, color_aristas="#444", color_nodos="#007ACC",
+                ancho_linea=0.4, alpha_lineas=0.5, tam_nodo=15, borde_nodo="none", ancho_borde=0,
+                alpha_nodos=0.8, etiquetas_siempre=False, tam_fuente=6):
+        """Cambia el contenido de la vista reutilizando los mismos artistas"""
+        self.capa = capa
+        self.xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        self.codigos = list(codigos)
+        self.textos = list(textos)
+        self.indice = IndiceEspacial(self.codigos, self.xy[:, 1], self.xy[:, 0])
+        self.color_aristas = color_aristas
+        self.etiquetas_siempre = etiquetas_siempre
+
+        self.lineas.set_linewidth(ancho_linea)
+        self.lineas.set_color(color_aristas)
+        self.lineas.set_alpha(alpha_lineas)
+
+        self.nodos.set_offsets(self.xy)
+        self.nodos.set_sizes([tam_nodo])
+        self.nodos.set_facecolor(color_nodos)
+        self.nodos.set_edgecolor(borde_nodo)
+        self.nodos.set_linewidth(ancho_borde)
+        self.nodos.set_alpha(alpha_nodos)
+        self.estilo_nodos = (to_rgb(color_nodos), alpha_nodos, tam_nodo)
+
+        self._con_etiqueta = []
+        self.estilo_etiqueta = {"fontsize": tam_fuente}
+        self._datos += 1
+
+    @instrumentacion.medir('vista.actualizar')
+    def actualizar(self, x_min, x_max, y_min, y_max, con_etiquetas):
+        """Aplica la vista: límites, aristas visibles y etiquetas; luego pide un redibujo.
+
+        Con los mismos límites y datos que el último dibujo solo se repintan las etiquetas (blit),
+        y si tampoco cambiaron no se hace nada.
+        """
+        self._pedido = time.perf_counter()
+        self._ultimo_pedido = (x_min, x_max, y_min, y_max, con_etiquetas)
+        escena = ((x_min, x_max, y_min, y_max), self._datos)
+        if escena == self._escena_dibujada and escena == self._escena and self._fondo_blit is not None:
+            antes = self._con_etiqueta
+            self._actualizar_etiquetas(x_min, x_max, y_min, y_max, con_etiquetas or self.etiquetas_siempre)
+            if self._con_etiqueta != antes:
+                self.refrescar_etiquetas()
+            else:
+                self._pedido = None
+            return
+        self._escena = escena
+        self.ax.set_xlim(x_min, x_max)
+        self.ax.set_ylim(y_min, y_max)
+        self.ax.apply_aspect()  # la caja del eje en píxeles ya con el aspecto aplicado
+
+        if self.piramide is not None:
+            imagen, extent = self.piramide.vista(x_min, x_max, y_min, y_max, max_ancho=self.ax.bbox.width)
+            self.fondo.set_data(imagen)
+            self.fondo.set_extent(extent)
+
+        segmentos = self.capa.visibles(x_min, x_max, y_min, y_max) if self.capa is not None else []
+        en_vista = self._nodos_en_vista(x_min, x_max, y_min, y_max)
+        nodos_en_raster = segmentos is None or len(en_vista) > self.max_nodos
+        if segmentos is None:
+            self.lineas.set_segments([])
+        else:
+            self.lineas.set_segments(segmentos)
+            instrumentacion.contar(segmentos=len(segmentos))
+        self.nodos.set_offsets(np.empty((0, 2)) if nodos_en_raster else self.xy[en_vista])
+
+        if nodos_en_raster:
+            caja = self.ax.bbox
+            ancho, alto = max(int(caja.width), 1), max(int(caja.height), 1)
+            imagen = np.zeros((alto, ancho, 4), dtype=np.uint8)
+            if segmentos is None:
+                self._componer_aristas(imagen, x_min, x_max, y_min, y_max)
+            self._componer_nodos(imagen, en_vista, x_min, x_max, y_min, y_max)
+            self.raster.imagen = imagen
+            self.raster.set_visible(True)
+            instrumentacion.contar(pixeles_raster=ancho * alto, nodos_raster=len(en_vista))
+        else:
+            self.raster.set_visible(False)
+
+        self._actualizar_etiquetas(x_min, x_max, y_min, y_max, con_etiquetas or self.etiquetas_siempre)
+        instrumentacion.contar(etiquetas=len(self._con_etiqueta))
+        self.canvas.draw_idle()
+
+    def _al_redimensionar(self, evento):
+        """La imagen de nivel de detalle tiene el tamaño del eje: al cambiarlo se rehace la vista"""
+        if self._ultimo_pedido is not None:
+            self._escena = None
+            self.actualizar(*self._ultimo_pedido)
+
+    # ====== NIVEL DE DETALLE ======
+    def _radio_nodo(self):
+        """Radio en píxeles del marcador de un nodo (el tamaño del scatter es el área en puntos²)"""
+        return max(math.sqrt(self.estilo_nodos[2]) * self.ax.figure.dpi / 72 / 2, 0.5)
+
+    def _nodos_en_vista(self, x_min, x_max, y_min, y_max):
+        """Índices de los nodos cuyo marcador toca la vista (se agranda la caja en un radio)"""
+        if self.indice is None or not len(self.xy):
+            return np.empty(0, dtype=np.intp)
+        margen = self._radio_nodo() * (x_max - x_min) / max(self.ax.bbox.width, 1)
+        return self.indice.en_caja(y_min - margen, y_max + margen, x_min - margen, x_max + margen)
+
+    def _componer_aristas(self, imagen, x_min, x_max, y_min, y_max):
+        """Copia el raster de densidad de aristas a la imagen de la vista, un píxel por píxel de pantalla"""
+        alto, ancho = imagen.shape[:2]
+        recorte, (e_x0, e_x1, e_y0, e_y1) = self.capa.raster_vista(self.color_aristas, x_min, x_max, y_min, y_max,
+                                                                   max_ancho=ancho)
+        if not recorte.size:
+            return
+        # Vecino más cercano: para cada columna/fila de pantalla, la del recorte que cae en su centro
+        x = x_min + (np.arange(ancho) + 0.5) * (x_max - x_min) / ancho
+        y = y_min + (np.arange(alto) + 0.5) * (y_max - y_min) / alto
+        columnas = np.floor((x - e_x0) / (e_x1 - e_x0) * recorte.shape[1]).astype(np.intp)
+        filas = np.floor((y - e_y0) / (e_y1 - e_y0) * recorte.shape[0]).astype(np.intp)
+        c0, c1 = np.searchsorted(columnas, 0), np.searchsorted(columnas, recorte.shape[1])
+        f0, f1 = np.searchsorted(filas, 0), np.searchsorted(filas, recorte.shape[0])
+        pixeles = np.ascontiguousarray(recorte).view(np.uint32)[..., 0]  # un RGBA por entero
+        imagen.view(np.uint32)[f0:f1, c0:c1, 0] = pixeles[filas[f0:f1, None], columnas[None, c0:c1]]
+
+    def _componer_nodos(self, imagen, en_vista, x_min, x_max, y_min, y_max):
+        """Estampa un disco por nodo visible sobre la imagen, con el color y alpha del scatter"""
+        if not len(en_vista):
+            return
+        alto, ancho = imagen.shape[:2]
+        xy = self.xy[en_vista]
+        px = np.floor((xy[:, 0] - x_min) / (x_max - x_min) * ancho).astype(np.intp)
+        py = np.floor((xy[:, 1] - y_min) / (y_max - y_min) * alto).astype(np.intp)
+        r = self._radio_nodo()
+        m = math.ceil(r)
+        # Se marca sobre una grilla con 2m píxeles de borde: los discos que se salen no necesitan recorte
+        ancho_m = ancho + 4 * m
+        cubierto = np.zeros((alto + 4 * m, ancho_m), dtype=bool)
+        paso = np.arange(-m, m + 1)
+        dy, dx = np.meshgrid(paso, paso, indexing="ij")
+        disco = (dy * ancho_m + dx)[dx * dx + dy * dy <= r * r]
+        centros = (np.clip(py, -m, alto + m - 1) + 2 * m) * ancho_m + np.clip(px, -m, ancho + m - 1) + 2 * m
+        cubierto.ravel()[(centros[:, None] + disco).ravel()] = True
+        cubierto = cubierto[2 * m:2 * m + alto, 2 * m:2 * m + ancho]
+        # Composición "over" del nodo (color, alpha) sobre lo que hubiera debajo. Debajo solo puede
+        # estar el raster de aristas (un solo color, varía el alpha): se precalcula para los 256 alphas
+        color, alpha, _ = self.estilo_nodos
+        alpha_debajo = np.arange(256) / 255
+        a = alpha + alpha_debajo * (1 - alpha)
+        rgb = (np.multiply.outer(alpha_debajo * (1 - alpha), to_rgb(self.color_aristas)) + np.multiply(color, alpha)) / a[:, None]
+        tabla = np.round(np.column_stack([rgb, a]) * 255).astype(np.uint8).view(np.uint32)[:, 0]
+        imagen.view(np.uint32)[..., 0][cubierto] = tabla[imagen[..., 3][cubierto]]
+
+    def _actualizar_etiquetas(self, x_min, x_max, y_min, y_max, con_etiquetas):
+        """Elige qué nodos llevan etiqueta: los que están dentro de la vista, si no son demasiados"""
+        self._con_etiqueta = []
+        if not con_etiquetas or not len(self.xy):
+            return
+        en_vista = self.indice.en_caja(y_min, y_max, x_min, x_max)
+        if len(en_vista) > self.max_etiquetas and not self.etiquetas_siempre:
+            return
+        self._con_etiqueta = en_vista.tolist()
+
+    # ====== DIBUJO ======
+    def _al_dibujar(self, evento):
+        """Tras cada dibujo completo: guarda el fondo para blitting, pinta las etiquetas y mide"""
+        self._fondo_blit = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._escena_dibujada = self._escena
+        self._pintar_etiquetas()
+        self._medir()
+
+    def _sprite(self, texto):
+        """Imagen RGBA del texto de una etiqueta, rasterizada una sola vez"""
+        dpi = self.ax.figure.dpi
+        clave = (texto, self.estilo_etiqueta["fontsize"], dpi)
+        imagen = self._sprites.get(clave)
+        if imagen is None:
+            if self._lienzo_sprites is None or self._lienzo_sprites.figure.dpi != dpi:
+                figura = Figure(dpi=dpi)
+                figura.patch.set_alpha(0)
+                figura.text(0, 0, "", ha="left", va="bottom", multialignment="center", color="black")
+                self._lienzo_sprites = FigureCanvasAgg(figura)
+            lienzo = self._lienzo_sprites
+            figura = lienzo.figure
+            artista = figura.texts[0]
+            artista.set_text(texto)
+            artista.set_fontsize(clave[1])
+            caja = artista.get_window_extent(lienzo.get_renderer())
+            ancho, alto = math.ceil(caja.width) + 2, math.ceil(caja.height) + 2
+            figura.set_size_inches(ancho / dpi, alto / dpi)
+            artista.set_position((1 / ancho, 1 / alto))  # un píxel de margen
+            lienzo.draw()
+            # draw_image recibe las filas de abajo hacia arriba
+            imagen = self._sprites[clave] = np.ascontiguousarray(np.asarray(lienzo.buffer_rgba())[:alto, :ancho][::-1])
+        return imagen
+
+    def _pintar_etiquetas(self):
+        """Pinta los sprites de las etiquetas visibles centrados sobre su nodo, recortados al eje"""
+        if not self._con_etiqueta:
+            return
+        renderer = self.canvas.get_renderer()
+        gc = renderer.new_gc()
+        gc.set_clip_rectangle(self.ax.bbox)
+        puntos = self.ax.transData.transform(self.xy[self._con_etiqueta])
+        for (x, y), i in zip(puntos.tolist(), self._con_etiqueta):
+            imagen = self._sprite(self.textos[i])
+            renderer.draw_image(gc, round(x - imagen.shape[1] / 2), round(y), imagen)
+        gc.restore()
+
+    def refrescar_etiquetas(self):
+        """Redibuja solo la capa de etiquetas sobre el último fondo (blitting)"""
+        if self._fondo_blit is None:
+            self.canvas.draw_idle()
+            return
+        self._pedido = time.perf_counter()
+        self.canvas.restore_region(self._fondo_blit)
+        self._pintar_etiquetas()
+        self.canvas.blit(self.ax.bbox)
+        self._medir()
+
+    def _medir(self):
+        if self._pedido is None:
+            return
+        fin = time.perf_counter()
+        ms = (fin - self._pedido) * 1000
+        # El cuadro va desde el pedido (actualizar o refrescar_etiquetas) hasta terminar de pintar
+        instrumentacion.registrar('cuadro', self._pedido, fin, etiquetas=len(self._con_etiqueta))
+        self._pedido = None
+        self.tiempos_frame.append(ms)
+        if self.al_dibujar is not None:
+            self.al_dibujar(ms)